@@ -0,0 +1,89 @@
+"""Factory for the sub-agents: tools, LLM client and compiled graph are built once and reused.
+
+Each agent module registers an async builder (`agent_factory.register("search",
+build_search_agent)`); `await agent_factory.get("search")` builds the agent on
+first use and returns the same compiled graph on every later call, so a query
+pays no setup. Concurrent first calls share one build (see singleflight.py).
+
+Agents are kept per event loop: the Gemini client binds its async connection to
+the loop it is first used in. The MCP server and the Chainlit app run a single
+loop, so each agent is built once per process there; callers that start a new
+loop per call (`asyncio.run`) get a fresh build for every loop.
+
+`invalidate()` drops built agents (e.g. after the tool bindings or the model
+configuration changed); the next call rebuilds them. A build that is still
+running while its agent is invalidated is not kept.
+"""
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from mcp_server_setup.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+Builder = Callable[[], Awaitable[Any]]
+
+
+class AgentFactory:
+    """Builds each registered agent once (per event loop) and hands out the cached instance."""
+
+    def __init__(self):
+        self._builders: Dict[str, Builder] = {}
+        self._agents: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = \
+            weakref.WeakKeyDictionary()
+        # Bumped on invalidation, so builds started before it are discarded
+        self._generations: Dict[str, int] = {}
+        self._builds = SingleFlight()
+        self.stats = {"calls": 0, "builds": 0, "invalidations": 0, "build_seconds": 0.0, "setup_seconds": 0.0}
+
+    def register(self, name: str, builder: Builder):
+        """Build the agent `name` with `await builder()` on first use."""
+        self._builders[name] = builder
+
+    async def get(self, name: str) -> Any:
+        """Return the agent `name`, building it if this event loop has none yet."""
+        start = time.perf_counter()
+        self.stats["calls"] += 1
+        agents = self._agents.setdefault(asyncio.get_running_loop(), {})
+        agent = agents.get(name)
+        if agent is None:
+            if name not in self._builders:
+                raise KeyError(f"Unknown agent: '{name}'")
+            generation = self._generations.get(name, 0)
+
+            async def build():
+                build_start = time.perf_counter()
+                built = await self._builders[name]()
+                self.stats["builds"] += 1
+                self.stats["build_seconds"] += time.perf_counter() - build_start
+                logger.info(f"Agent '{name}' built in {time.perf_counter() - build_start:.3f}s.")
+                if self._generations.get(name, 0) == generation:
+                    agents[name] = built
+                return built
+
+            agent = await self._builds.do((name, generation), build)
+        self.stats["setup_seconds"] += time.perf_counter() - start
+        return agent
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop the built agent `name` (all agents if None) in every event loop."""
+        names = [name] if name is not None else list(self._builders)
+        for agent_name in names:
+            self._generations[agent_name] = self._generations.get(agent_name, 0) + 1
+        for agents in list(self._agents.values()):
+            for agent_name in names:
+                agents.pop(agent_name, None)
+        self.stats["invalidations"] += 1
+
+
+agent_factory = AgentFactory()
+
+
+def get_agent_factory_stats() -> dict:
+    """Return the call and build counters of the agent factory, with the mean setup time per call."""
+    stats = dict(agent_factory.stats)
+    stats["mean_setup_ms"] = stats["setup_seconds"] / stats["calls"] * 1000 if stats["calls"] else 0.0
+    return stats
@@ -0,0 +1,237 @@
+"""
+Deterministic fast path in front of the orchestrator: trivial math is answered without any LLM call.
+
+A query is matched, as a whole, against a small set of patterns:
+- statistics of a number list:  "What is the sum of 145, 232, 378, and 591?"
+- arithmetic:                   "What is 3 + 4 * (2 - 1)?", "12 divided by 4"
+                                (not "What is 9/11?" or "7-11": those may be dates or names)
+- unit conversions:             "Convert 100 miles to kilometers", "How many feet are in 3 meters?"
+- date differences:             "How many days are between 2020-01-01 and 2021-03-15?"
+- age:                          "If I'm born on January 15, 1990, how old am I today?"
+- equations in one unknown:     "Solve the equation 3x + 7 = 22"
+
+and answered directly with the functions in calculate.py (equations through the
+solver pool, so sympy never runs in the caller's event loop). Anything that does
+not match completely, or whose calculation fails, returns None and takes the
+LLM path: the fast path only answers what it can answer exactly.
+
+Configuration (environment variables):
+    FAST_PATH_ENABLED   answer matching queries without the LLM (default true)
+"""
+import os
+import re
+from datetime import date, datetime
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from mcp_server_setup import calculate
+from mcp_server_setup.solver_pool import solver_pool
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() not in ("0", "false", "no")
+
+fast_path_stats = {"queries": 0, "hits": 0}
+
+NUMBER = r"-?\d+(?:\.\d+)?"
+_NUMBER_RE = re.compile(NUMBER)
+# List items are separated by ", ", " and " or ", and " ("1,000" is not a list)
+_LIST_SEPARATOR_RE = re.compile(r",\s+(?:and\s+)?|\s+and\s+")
+_UNIT = r"[a-zA-Z][a-zA-Z ]{0,30}?"
+_DATE = r".{6,40}?"
+_YEAR_RE = re.compile(r"\b\d{4}\b")
+
+# Leading phrases and trailing punctuation that do not change the question
+_PREFIX_RE = re.compile(r"^(?:please\s+)?(?:(?:what|how much)\s+is|what's|calculate|compute|evaluate)\s+", re.IGNORECASE)
+_SUFFIX_RE = re.compile(r"[\s?.!=]+$")
+
+_OPERATOR_WORDS = [
+    (re.compile(r"\bto the power of\b", re.IGNORECASE), "**"),
+    (re.compile(r"\b(?:multiplied by|times)\b", re.IGNORECASE), "*"),
+    (re.compile(r"\bdivided by\b", re.IGNORECASE), "/"),
+    (re.compile(r"\bplus\b", re.IGNORECASE), "+"),
+    (re.compile(r"\bminus\b", re.IGNORECASE), "-"),
+]
+_ARITHMETIC_RE = re.compile(r"[\d.\s+\-*/()]+")
+_HAS_OPERATION_RE = re.compile(r"\d\s*[)]*\s*(?:\*\*|[+\-*/])\s*[(]*\s*-?\d")
+_OPERATOR_RE = re.compile(r"\*\*|[+\-*/]")
+_SPACED_OPERATOR_RE = re.compile(r"\s(?:\*\*|[+\-*/])\s")
+# Numbers joined by "/" or "-" only are more likely dates or names ("9/11", "24/7", "7-11", "12/25/2020")
+_JOINED_NUMBERS_RE = re.compile(r"\d+(?:[/-]\d+)+")
+
+LIST_OPERATIONS = {
+    "sum": ("sum", calculate.add),
+    "total": ("total", calculate.add),
+    "product": ("product", calculate.multiply),
+    "average": ("average", calculate.calculate_mean),
+    "mean": ("mean", calculate.calculate_mean),
+    "median": ("median", calculate.calculate_median),
+}
+_LIST_RE = re.compile(rf"^the\s+({'|'.join(LIST_OPERATIONS)})\s+of\s+(?:the\s+numbers\s+)?(.+)$", re.IGNORECASE)
+_CONVERT_RE = re.compile(rf"^(?:convert\s+)?({NUMBER})\s*({_UNIT})\s+(?:to|into|in)\s+({_UNIT})$", re.IGNORECASE)
+_HOW_MANY_UNITS_RE = re.compile(rf"^how\s+many\s+({_UNIT})\s+(?:are|is)\s+(?:there\s+)?in\s+({NUMBER})\s*({_UNIT})$",
+                                re.IGNORECASE)
+_DATE_DIFF_RE = re.compile(rf"^how\s+many\s+(days|years)\s+(?:are\s+there\s+|are\s+|have\s+passed\s+)?"
+                           rf"between\s+({_DATE})\s+and\s+({_DATE})$", re.IGNORECASE)
+_AGE_RES = [
+    re.compile(rf"^if\s+i(?:'m|\s+am|\s+was)\s+born\s+on\s+({_DATE}),?\s+how\s+old\s+am\s+i(?:\s+today|\s+now)?$",
+               re.IGNORECASE),
+    re.compile(rf"^how\s+old\s+am\s+i(?:\s+today|\s+now)?,?\s+if\s+i(?:'m|\s+am|\s+was)\s+born\s+on\s+({_DATE})$",
+               re.IGNORECASE),
+]
+_EQUATION_RE = re.compile(r"^solve\s+(?:the\s+equation\s+)?([\w\s.+\-*/()]+=[\w\s.+\-*/()]+?)(?:\s+for\s+([a-z]))?$",
+                          re.IGNORECASE)
+_EQUATION_CHARS_RE = re.compile(r"[\d\sa-z.+\-*/()=]+")
+_IMPLICIT_PRODUCT_RE = re.compile(r"(\d|\))\s*([a-z(])")
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    if isinstance(value, float):
+        return f"{value:.10g}"
+    return str(value)
+
+
+def _parse_number_list(text: str) -> Optional[List[float]]:
+    items = _LIST_SEPARATOR_RE.split(text.strip())
+    if len(items) < 2 or not all(_NUMBER_RE.fullmatch(item) for item in items):
+        return None
+    return [float(item) for item in items]
+
+
+async def _list_statistic(query: str) -> Optional[str]:
+    match = _LIST_RE.match(query)
+    if not match:
+        return None
+    numbers = _parse_number_list(match.group(2))
+    if numbers is None:
+        return None
+    name, operation = LIST_OPERATIONS[match.group(1).lower()]
+    return f"The {name} of {match.group(2)} is {_format_number(operation(numbers))}."
+
+
+async def _arithmetic(query: str) -> Optional[str]:
+    expression, explicit = query, False
+    for pattern, operator in _OPERATOR_WORDS:
+        expression, count = pattern.subn(operator, expression)
+        explicit = explicit or count > 0
+    explicit = explicit or "×" in expression or "÷" in expression
+    expression = expression.replace("^", "**").replace("×", "*").replace("÷", "/")
+    if not _ARITHMETIC_RE.fullmatch(expression) or not _HAS_OPERATION_RE.search(expression):
+        return None
+    # Only unambiguous expressions: an operator word or sign, spaces around an operator, or several operators
+    if not explicit:
+        if _JOINED_NUMBERS_RE.fullmatch(expression.strip()):
+            return None
+        if not _SPACED_OPERATOR_RE.search(expression) and len(_OPERATOR_RE.findall(expression)) < 2:
+            return None
+    result = calculate.evaluate_expression(expression)
+    if isinstance(result, str):  # evaluation error, e.g. division by zero
+        return None
+    return f"{' '.join(expression.split())} = {_format_number(result)}"
+
+
+async def _unit_conversion(query: str) -> Optional[str]:
+    match = _CONVERT_RE.match(query)
+    if match:
+        value, from_unit, to_unit = match.groups()
+    else:
+        match = _HOW_MANY_UNITS_RE.match(query)
+        if not match:
+            return None
+        to_unit, value, from_unit = match.groups()
+    result = calculate.convert_units(float(value), from_unit.strip(), to_unit.strip())
+    if result.startswith("Conversion error"):
+        return None
+    return f"{value} {from_unit.strip()} is {result}."
+
+
+async def _date_difference(query: str) -> Optional[str]:
+    match = _DATE_DIFF_RE.match(query)
+    # Dates without a year are ambiguous (the parser would assume the current one)
+    if not match or not all(_YEAR_RE.search(date) for date in match.group(2, 3)):
+        return None
+    unit, start, end = match.group(1).lower(), match.group(2).strip(), match.group(3).strip()
+    if unit == "days":
+        result = calculate.calculate_days_between(start, end)
+    else:
+        result = calculate.calculate_years_between(start, end)
+    if isinstance(result, str):
+        return None
+    return f"There are {'about ' if unit == 'years' else ''}{result} {unit} between {start} and {end}."
+
+
+def _parse_full_date(text: str) -> Optional[date]:
+    """The date in `text`, or None unless it names day, month and year (the parser fills in missing parts)."""
+    from dateutil import parser as date_parser  # imported on first use, it is not needed at startup
+    try:
+        parsed = {date_parser.parse(text, default=default).date()
+                  for default in (datetime(2000, 1, 1), datetime(2001, 2, 2))}
+    except (ValueError, OverflowError):
+        return None
+    return parsed.pop() if len(parsed) == 1 else None
+
+
+async def _age(query: str) -> Optional[str]:
+    match = next(filter(None, (pattern.match(query) for pattern in _AGE_RES)), None)
+    if not match:
+        return None
+    birth = _parse_full_date(match.group(1).strip())
+    today = date.today()
+    if birth is None or birth > today:
+        return None
+    # Whole years: one less if this year's birthday is still to come
+    age = today.year - birth.year - ((today.month, today.day) < (birth.month, birth.day))
+    return f"You are {age} years old."
+
+
+async def _equation(query: str) -> Optional[str]:
+    match = _EQUATION_RE.match(query)
+    if not match:
+        return None
+    equation = match.group(1).lower()
+    if equation.count("=") != 1 or not _EQUATION_CHARS_RE.fullmatch(equation):
+        return None
+    names = set(re.findall(r"[a-z]+", equation))
+    target = match.group(2).lower() if match.group(2) else None
+    if len(names) != 1 or (target and names != {target}):
+        return None
+    target = names.pop()
+    # Only equations in which the unknown occurs once (and no powers) have exactly one solution
+    if len(target) != 1 or equation.count(target) != 1 or "**" in equation:
+        return None
+    equation = _IMPLICIT_PRODUCT_RE.sub(r"\1*\2", equation)
+    result = await solver_pool.solve(equation, target)
+    if not isinstance(result, str) or result.startswith(("Equation solving error", "No solution")):
+        return None
+    return f"{target} = {result}"
+
+
+ROUTES: List[Tuple[str, Callable[[str], Awaitable[Optional[str]]]]] = [
+    ("statistics", _list_statistic),
+    ("arithmetic", _arithmetic),
+    ("unit_conversion", _unit_conversion),
+    ("date_difference", _date_difference),
+    ("age", _age),
+    ("equation", _equation),
+]
+
+
+async def try_fast_path(query: str) -> Optional[str]:
+    """Answer `query` directly if it is trivial math, otherwise return None (the query takes the LLM path)."""
+    fast_path_stats["queries"] += 1
+    if not FAST_PATH_ENABLED:
+        return None
+    text = _SUFFIX_RE.sub("", _PREFIX_RE.sub("", " ".join(query.split())))
+    for kind, route in ROUTES:
+        answer = await route(text)
+        if answer is not None:
+            fast_path_stats["hits"] += 1
+            fast_path_stats[kind] = fast_path_stats.get(kind, 0) + 1
+            return answer
+    return None
+
+
+def get_fast_path_stats() -> dict:
+    """Return the query and hit counters of the fast path, with its hit rate."""
+    stats = dict(fast_path_stats)
+    stats["hit_rate"] = stats["hits"] / stats["queries"] if stats["queries"] else 0.0
+    return stats
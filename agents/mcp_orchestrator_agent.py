@@ -1,25 +1,22 @@
 """
 Orchestrator agent that coordinates between search and reasoning agents.
+
+Tools, LLM client and agent graph are created on first use, in the event loop
+of the caller (see get_orchestrator), not at import time.
 """
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.prebuilt import create_react_agent
 from mcp_server_setup.mcp_tool_loader import get_mcp_tools
-import asyncio
 
 # Load environment variables
 load_dotenv()
 
 # Define the list of tools that the orchestrator can use
-orchestrator_tools = asyncio.run(get_mcp_tools([
+ORCHESTRATOR_TOOL_NAMES = [
     "call_search_agent",
     "call_reason_agent",
     "extract_user_profile_info",
-]))
-
-# Initialize the LLM for the orchestrator
-orchestrator_llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+]
 
 # Define the prompt for the orchestrator agent
 orchestrator_system_prompt = """\\
@@ -34,16 +31,18 @@ Your process should be:
 1.  **Analyze**: Carefully analyze the user's query provided in the latest human message.
 2.  **Decompose (if needed)**: If the query is complex or requires multiple steps (e.g., "Find X and then calculate Y based on X"), break it down into a sequence of smaller, manageable sub-queries.
 3.  **Delegate**: For each sub-query, decide which specialist agent (`call_search_agent` or `call_reason_agent`) is the most appropriate. Formulate a precise question for that agent.
-4.  **Execute**: Use the chosen tool to call the specialist agent with the formulated sub-query.
+4.  **Execute**: Use the chosen tool to call the specialist agent with the formulated sub-query. If several sub-queries do not depend on each other's results (e.g. two independent lookups, or a lookup and an unrelated calculation), request all of these calls in the same turn; they run at the same time.
 5.  **Iterate**: Review the result from the specialist agent. If more information is needed or another step is required (e.g., the first part of a multi-step query is done, now do the second part), go back to step 3. You may need to call multiple agents sequentially, using the output of one as input or context for the next.
 6.  **Synthesize**: Once all necessary information has been gathered from the specialist agents and all parts of the user's query have been addressed, combine and synthesize these pieces of information into a single, coherent, and comprehensive final answer to the original user query.
 7.  **Respond**: Provide this final synthesized answer directly as your response. Do NOT call any more tools once you are ready to give the final answer. Your last message should be the complete answer.
 
 IMPORTANT:
 - When you call a specialist agent, the query you provide to it should be self-contained and clear. The query provided to the search_agent MUST be the exact same as the original user query, ONLY under absolutely necessary circumstances are you allowed to slightly adjust it.
+- Do not repeat a call with the same arguments; use the result you already have.
 - Pay attention to the conversation history (available in `messages`) to keep track of previous interactions and results from specialist agents. This is crucial for multi-step queries.
 - If the user's query is simple and can be handled by a single call to a specialist agent, do so and then present its result (or a slightly rephrased version if needed) as the final answer.
 - Your final output to the user must be the answer itself, not a message saying you are about to answer or a call to another tool.
+- Results may reference stored content as "[[content:<handle>]]". Keep these references exactly as they are in your final answer; the referenced text is inserted when the answer is shown to the user.
 
 USER PROFILE HANDLING:
 - If the user's message includes personal information (e.g., their name, what they study, how old they are, their gender, or what they like), then call `extract_profile_updates` with the full user message.
@@ -60,9 +59,34 @@ orchestrator_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-# Create Orchestrator Agent
-orchestrator_agent_executor = create_react_agent(
-    model=orchestrator_llm,
-    tools=orchestrator_tools,
-    prompt=orchestrator_prompt,
-)
\ No newline at end of file
+_orchestrator = None
+
+
+async def get_orchestrator_tools():
+    """The orchestrator's tools (tool definitions are listed once per process, see mcp_tool_loader.py)."""
+    return await get_mcp_tools(ORCHESTRATOR_TOOL_NAMES)
+
+
+async def get_orchestrator(tools=None):
+    """Create the orchestrator on first use and return it.
+
+    The orchestrator makes one model turn per call: it answers, or it requests
+    one or more sub-agent calls. The workflow executes these calls (concurrently,
+    see parallel_dispatch.py) and calls the orchestrator again with the results.
+
+    Args:
+        tools: The orchestrator's tools, if the caller has loaded them already
+
+    Returns:
+        A runnable mapping {"messages": [...]} to the orchestrator's next AIMessage
+    """
+    global _orchestrator
+    if _orchestrator is None:
+        # Imported here: langchain_google_genai alone takes seconds to import
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        if tools is None:
+            tools = await get_orchestrator_tools()
+        orchestrator_llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+        _orchestrator = orchestrator_prompt | orchestrator_llm.bind_tools(tools)
+    return _orchestrator
\ No newline at end of file
@@ -1,59 +1,44 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.messages import HumanMessage
-from langgraph.prebuilt import create_react_agent
 import os
 import sys
 
-from langchain.tools import StructuredTool
-
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from agents.agent_factory import agent_factory
 from mcp_server_setup.mcp_tool_loader import get_mcp_tools
 import asyncio
 
 load_dotenv()
 
-tools = None
-agent_executor = None
+REASON_TOOL_NAMES = [
+    "add_tool", "subtract_tool", "multiply_tool", "divide_tool",
+    "convert_units_tool", "convert_units_many_tool", "kg_to_lb_tool", "lb_to_kg_tool", "miles_to_km_tool", "km_to_miles_tool",
+    "calculate_mean_tool", "calculate_median_tool", "calculate_std_dev_tool", "calculate_range_tool",
+    "describe_numbers_tool",
+    "calculate_years_between_tool", "calculate_days_between_tool", "calculate_age_tool",
+    "count_word_occurrences_tool", "estimate_reading_time_tool",
+    "evaluate_expression_tool", "solve_equation_tool"
+]
 
-async def initialize_reason_agent():
-    """Initialisiere Tools und Agent nur einmal."""
-    global agent_executor
-    if agent_executor is None:
-        tools_to_load = [
-            "add_tool", "subtract_tool", "multiply_tool", "divide_tool",
-            "convert_units_tool", "kg_to_lb_tool", "lb_to_kg_tool", "miles_to_km_tool", "km_to_miles_tool",
-            "calculate_mean_tool", "calculate_median_tool", "calculate_std_dev_tool", "calculate_range_tool",
-            "calculate_years_between_tool", "calculate_days_between_tool", "calculate_age_tool",
-            "count_word_occurrences_tool", "estimate_reading_time_tool",
-            "evaluate_expression_tool", "solve_equation_tool"
-        ]
-    
-        mcp_tools = await get_mcp_tools(tools_to_load)
+async def build_reason_agent():
+    """Build tools, LLM client and graph of the reason agent (once, see agent_factory.py)."""
+    # Imported here: langchain_google_genai alone takes seconds to import
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.prebuilt import create_react_agent
 
-        def make_tool_func(tool_coroutine):
-            def func(**kwargs):
-                print(f"Calling tool with kwargs: {kwargs}")
-                return asyncio.run(tool_coroutine(**kwargs))
-            return func
+    # The tools are used with their coroutines: the agent's ToolNode awaits them in its own
+    # event loop, and the tool calls of one model turn run concurrently (asyncio.gather)
+    tools = await get_mcp_tools(REASON_TOOL_NAMES)
 
-        tools = [
-            StructuredTool(
-                name=t.name,
-                description=t.description,
-                func=make_tool_func(t.coroutine),
-                args_schema=t.args
-            )
-            for t in mcp_tools
-        ]
+    memory = MemorySaver()
+    model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0, memory=memory)
+    return create_react_agent(model, tools)
 
-        memory = MemorySaver()
-        model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0, memory=memory)
-        agent_executor = create_react_agent(model, tools)
+agent_factory.register("reason", build_reason_agent)
 
 async def run_reason_agent(user_query: str, context: dict = {}, verbose: bool = True) -> str:
     """
@@ -69,7 +54,7 @@ async def run_reason_agent(user_query: str, context: dict = {}, verbose: bool =
     Returns:
         A string containing the agent's response with reasoning and results
     """
-    await initialize_reason_agent()
+    agent_executor = await agent_factory.get("reason")
     prompt_text = f"""
     You are a reasoning assistant capable of performing a wide range of calculations and analytical tasks.
     
@@ -80,13 +65,14 @@ async def run_reason_agent(user_query: str, context: dict = {}, verbose: bool =
     1. Understand what the question is asking for
     2. Determine which tools would be most appropriate to solve this problem
     3. Break down complex problems into simpler steps
-    4. Use the appropriate calculation tools to solve each step
+    4. Use the appropriate calculation tools to solve each step; request independent calculations together in one step, they run at the same time
     5. Provide a clear explanation of your reasoning process
     6. Present the final answer in a concise and understandable format
     
     Available tools include:
     - Mathematical operations (addition, subtraction, multiplication, division)
-    - Statistical calculations (mean, median, standard deviation, range)
+    - Statistical calculations (mean, median, standard deviation, range); use describe_numbers_tool when
+      several statistics of the same numbers are needed, it computes all of them in one call
     - Unit conversions (imperial to metric, currency, etc.)
     - Date calculations (years between dates, age calculation)
     - Text analysis (word count, reading time estimation)
@@ -1,8 +1,5 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.messages import HumanMessage
-from langgraph.prebuilt import create_react_agent
 import os
 import sys
 import asyncio
@@ -11,10 +8,40 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from agents.agent_factory import agent_factory
 from mcp_server_setup.mcp_tool_loader import get_mcp_tools
 
 load_dotenv()
 
+SEARCH_TOOL_NAMES = [
+    "search_wikipedia_tool",
+    "get_wikipedia_content_tool",
+    "get_page_sections_tool",
+    "get_section_content_tool",
+    "get_multiple_sections_content_tool",
+    "rank_sections_tool",
+    "wiki_lookup_tool",
+    "get_content_handle_tool",
+    "read_content_tool"
+]
+
+async def build_search_agent():
+    """Build tools, LLM client and graph of the search agent (once, see agent_factory.py)."""
+    # Imported here: langchain_google_genai alone takes seconds to import
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langgraph.prebuilt import create_react_agent
+
+    # Load MCP tools - this should return tools that work directly with LangGraph
+    tools = await get_mcp_tools(SEARCH_TOOL_NAMES)
+
+    # Initialize model WITHOUT memory parameter to avoid conflicts
+    model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+
+    # Create agent with tools - let LangGraph handle memory internally
+    return create_react_agent(model, tools)
+
+agent_factory.register("search", build_search_agent)
+
 async def run_search_agent(user_query: str, context: dict = {}, verbose: bool = True) -> str:
     """
     Sub-agent responsible for retrieving and returning information via Gemini.
@@ -29,52 +56,48 @@ async def run_search_agent(user_query: str, context: dict = {}, verbose: bool =
         A string containing the cleaned content from the selected Wikipedia page
     """
     
-    # Load tools directly without global state
-    tools_to_load = [
-        "search_wikipedia_tool",
-        "get_wikipedia_content_tool", 
-        "get_page_sections_tool",
-        "get_section_content_tool",
-        "get_multiple_sections_content_tool"
-    ]
-    
     try:
-        # Load MCP tools - this should return tools that work directly with LangGraph
-        tools = await get_mcp_tools(tools_to_load)
-        
-        # Initialize model WITHOUT memory parameter to avoid conflicts
-        model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
-        
-        # Create agent with tools - let LangGraph handle memory internally
-        agent_executor = create_react_agent(model, tools)
+        # Compiled once per process and reused (see agent_factory.py)
+        agent_executor = await agent_factory.get("search")
         
         prompt_text = f"""
         You are a research assistant that can search for information on Wikipedia.
         
         TASK: 
-        1. Search Wikipedia for information about: "{user_query}", use keywords.
+        Find information on Wikipedia about: "{user_query}"
+        
+        First call wiki_lookup_tool once with a keyword query. It searches Wikipedia, reads the top articles and returns
+        their most relevant sections. If these contain the answer, formulate a comprehensive answer to the user's query
+        right away.
+        
+        Only if they do not, research step by step:
+        1. Search Wikipedia for information about the query, use keywords.
         2. Review the search results and select the MOST relevant article by its page ID
-        3. Use the get_page_sections_tool with the selected page ID to identify relevant sections of the article
-        4. Identify the most relevant sections for answering the query (always include section '0' which is the introduction)
-        5. Use get_multiple_sections_content_tool to retrieve all relevant sections in a single call by passing the page ID and a list of section indices
-        6. Based on the retrieved section contents, formulate a comprehensive answer to the user's query
+        3. Use the rank_sections_tool with the selected page ID and the query to retrieve the most relevant sections of the article in a single call
+        4. Based on the retrieved section contents, formulate a comprehensive answer to the user's query
         
-        Use the tools available to you in this sequence. Make your decision about which article and sections 
-        to select by evaluating their relevance to the query. Be selective and strategic about which sections you retrieve
-        to get the most pertinent information. Using get_multiple_sections_content_tool is more efficient than calling 
+        Make your decision about which article to select by evaluating its relevance to the query. Only if the ranked
+        sections do not contain the answer, use get_page_sections_tool to look at all sections and
+        get_multiple_sections_content_tool to retrieve the ones you need (always include section '0' which is the
+        introduction). Using get_multiple_sections_content_tool is more efficient than calling 
         get_section_content_tool multiple times.
         
         Available tools:
+        - `wiki_lookup_tool`: Search Wikipedia and get the most relevant sections of the top articles in one call
         - `search_wikipedia_tool`: Search Wikipedia for articles related to the query
-        - `get_wikipedia_content_tool`: Retrieve the full content of a Wikipedia page by its ID
+        - `get_wikipedia_content_tool`: Retrieve the content of a Wikipedia page by its ID, part by part (pass the cursor given at the end of a part to get the next one)
         - `get_page_sections_tool`: Get the sections of a Wikipedia page by its ID
         - `get_section_content_tool`: Get the content of a specific section of a Wikipedia page
         - `get_multiple_sections_content_tool`: Get the content of multiple sections of a Wikipedia page by its ID and section indices
+        - `rank_sections_tool`: Get the content of the sections of a Wikipedia page that are most relevant to a query
+        - `get_content_handle_tool`: Get a handle and a short preview of a Wikipedia page or section instead of its content
+        - `read_content_tool`: Read (part of) the content behind a handle
 
         - Hint:
         -- If a query is about a specific date or event, try to narrow down the topic based on location or time and then go through the content of the most relevant section within that page.
         For example if the query is about a specific event in Berlin, you might want to focus on the 'History' section of the Berlin Wikipedia page. Use this logic for other query topics as well. Take your time to reason.
         -- If the query asks for a section of a Wikipedia page, retrieve the section content directly using the `get_section_content_tool` or `get_multiple_sections_content_tool` with the appropriate section index. Return the text content as it is written on wikipedia.
+        -- If the query asks for the exact text of a whole section or page, do not copy it: call `get_content_handle_tool` with the page ID and section index and write "[[content:<handle>]]" in your answer where the text belongs (for example "[[content:wiki:3354/7]]"). The text is inserted when the answer is shown to the user.
 
         Additional context: {context}
         """
@@ -0,0 +1,110 @@
+"""
+Concurrent execution of the tool calls of one orchestrator turn.
+
+When the orchestrator asks for several sub-agents in one turn (e.g. a search
+and a calculation, or two independent lookups), the calls run concurrently, at
+most ORCHESTRATOR_MAX_CONCURRENCY at a time. Their results are returned in the
+order of the tool calls, however the calls finish, so the conversation the
+orchestrator sees next is deterministic.
+
+Recursion protection is based on the call, not the tool: a call is identified
+by its tool name and its arguments (call_signature). Calling the same agent
+again with a different question is fine; a call identical to one made before
+in the same request is not executed again. The orchestrator gets a note to use
+the earlier result instead. Identical calls within one turn run once.
+
+Configuration (environment variables):
+    ORCHESTRATOR_MAX_CONCURRENCY   sub-agent calls running at once (default 3)
+"""
+import asyncio
+import json
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+from langchain_core.messages import ToolMessage
+
+MAX_CONCURRENCY = int(os.getenv("ORCHESTRATOR_MAX_CONCURRENCY", "3"))
+
+dispatch_stats = {"turns": 0, "calls": 0, "executed": 0, "repeated": 0, "failed": 0}
+
+
+def call_signature(tool_call: dict) -> str:
+    """Identity of a tool call: tool name and arguments (key order does not matter)."""
+    return f"{tool_call['name']}:{json.dumps(tool_call.get('args', {}), sort_keys=True, default=str)}"
+
+
+def all_repeated(tool_calls: Iterable[dict], seen: Iterable[str]) -> bool:
+    """Whether every call of a turn has been made before (with the same arguments)."""
+    seen = set(seen)
+    return all(call_signature(tool_call) in seen for tool_call in tool_calls)
+
+
+async def _execute(tool_call: dict, tools_by_name: Dict, semaphore: asyncio.Semaphore) -> ToolMessage:
+    tool = tools_by_name.get(tool_call["name"])
+    if tool is None:
+        dispatch_stats["failed"] += 1
+        return ToolMessage(content=f"Error: unknown tool '{tool_call['name']}'.", name=tool_call["name"],
+                           tool_call_id=tool_call["id"], status="error")
+    async with semaphore:
+        try:
+            result = await tool.ainvoke({**tool_call, "type": "tool_call"})
+        except Exception as e:
+            dispatch_stats["failed"] += 1
+            return ToolMessage(content=f"Error: {e!r}\n Please fix your mistakes.", name=tool_call["name"],
+                               tool_call_id=tool_call["id"], status="error")
+    dispatch_stats["executed"] += 1
+    if isinstance(result, ToolMessage):
+        return result
+    return ToolMessage(content=str(result), name=tool_call["name"], tool_call_id=tool_call["id"])
+
+
+async def dispatch_tool_calls(tool_calls: List[dict], tools_by_name: Dict, seen: Set[str],
+                              max_concurrency: int = MAX_CONCURRENCY) -> Tuple[List[ToolMessage], List[str]]:
+    """Run the tool calls of one turn concurrently.
+
+    Args:
+        tool_calls: The tool calls of the orchestrator's message
+        tools_by_name: The orchestrator's tools
+        seen: Signatures of the calls made before in this request
+        max_concurrency: Calls running at once
+
+    Returns:
+        One ToolMessage per tool call, in the order of the calls, and the signatures of the calls executed
+    """
+    dispatch_stats["turns"] += 1
+    dispatch_stats["calls"] += len(tool_calls)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    # One task per distinct new call; repeated calls are answered without running them
+    tasks: Dict[str, asyncio.Task] = {}
+    for tool_call in tool_calls:
+        signature = call_signature(tool_call)
+        if signature not in seen and signature not in tasks:
+            tasks[signature] = asyncio.ensure_future(_execute(tool_call, tools_by_name, semaphore))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    messages = []
+    for tool_call in tool_calls:
+        signature = call_signature(tool_call)
+        if signature in tasks:
+            result = tasks[signature].result()
+            # Identical calls in one turn share the result, each under its own call id
+            messages.append(result.model_copy(update={"tool_call_id": tool_call["id"]}))
+        else:
+            dispatch_stats["repeated"] += 1
+            messages.append(ToolMessage(
+                content=f"Not executed: `{tool_call['name']}` was already called with the same arguments. "
+                        "Use its earlier result.",
+                name=tool_call["name"], tool_call_id=tool_call["id"],
+            ))
+    return messages, list(tasks)
+
+
+def get_dispatch_stats() -> dict:
+    """Return the turn, call and repeat counters of the tool dispatch."""
+    return dict(dispatch_stats)
@@ -0,0 +1,68 @@
+"""Benchmark: per-call setup of the sub-agents, rebuilt per query (before) vs. agent factory (after)
+- before: every query loads the tools, creates the Gemini client and compiles the agent graph
+- after: agent_factory.get returns the agent built on first use
+
+Also checks that concurrent first calls share one build and that invalidate()
+leads to a rebuild. No model calls are made (a dummy GOOGLE_API_KEY is set if
+none is present); the search agent's tool definitions are listed once from the
+MCP server, as in the running system.
+
+Usage (from the project root):
+    python -m benchmarks.bench_agent_setup
+    python -m benchmarks.bench_agent_setup --calls 200
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from agents.agent_factory import AgentFactory, agent_factory, get_agent_factory_stats
+from agents.mcp_sub_agent_reason import build_reason_agent
+from agents.mcp_sub_agent_search import build_search_agent
+
+BUILDERS = {"search": build_search_agent, "reason": build_reason_agent}
+
+
+async def mean_ms(calls: int, fn) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await fn()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+async def check_concurrent_first_use():
+    factory = AgentFactory()
+    factory.register("reason", build_reason_agent)
+    agents = await asyncio.gather(*(factory.get("reason") for _ in range(10)))
+    if factory.stats["builds"] != 1 or any(agent is not agents[0] for agent in agents):
+        raise AssertionError(f"10 concurrent first calls built {factory.stats['builds']} agents")
+    factory.invalidate("reason")
+    if await factory.get("reason") is agents[0] or factory.stats["builds"] != 2:
+        raise AssertionError("invalidate() did not lead to a rebuild")
+    print("concurrent first use: 10 calls, 1 build; invalidate: rebuilt\n")
+
+
+async def main(args):
+    await check_concurrent_first_use()
+    # Warm-up: imports and the one-time listing of the MCP tool definitions
+    for builder in BUILDERS.values():
+        await builder()
+
+    print(f"{'agent':>8} | {'first build (ms)':>16} | {'before (ms/call)':>16} | {'after (ms/call)':>15}")
+    print("-" * 65)
+    for name, builder in BUILDERS.items():
+        start = time.perf_counter()
+        await agent_factory.get(name)
+        first_ms = (time.perf_counter() - start) * 1000
+        before = await mean_ms(args.calls, builder)
+        after = await mean_ms(args.calls, lambda: agent_factory.get(name))
+        print(f"{name:>8} | {first_ms:>16.2f} | {before:>16.2f} | {after:>15.4f}")
+    print(f"\nfactory stats: {get_agent_factory_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50, help="Setups timed per agent and method")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+"""Benchmark: unit conversion, eager pint registry and per-call parsing (before) vs. lazy registry and cached factors
+- startup: time to import calculate.py, and what the first conversion costs with and without pint's disk cache
+  (each measured in a fresh process; "before" built the registry at import time)
+- per conversion: parse and convert every call (before) vs. convert_units with a cached factor
+  vs. convert_units_many for all values at once
+
+Usage (from the project root):
+    python -m benchmarks.bench_convert_units
+    python -m benchmarks.bench_convert_units --n 100000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp_server_setup.calculate import convert_units, convert_units_many, get_unit_registry
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Timed snippets, each run in a fresh interpreter; they print their time in seconds
+STARTUP = [
+    ("import calculate.py (before: + registry)",
+     "import mcp_server_setup.calculate\nfrom pint import UnitRegistry\nUnitRegistry()", {}),
+    ("import calculate.py (after)",
+     "import mcp_server_setup.calculate", {}),
+    ("first conversion, disk cache",
+     "from mcp_server_setup.calculate import convert_units\nconvert_units(1, 'mile', 'km')", {}),
+    ("first conversion, no disk cache",
+     "from mcp_server_setup.calculate import convert_units\nconvert_units(1, 'mile', 'km')", {"PINT_CACHE_FOLDER": ""}),
+]
+
+
+def time_in_fresh_process(code: str, env: dict) -> float:
+    script = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, env={**os.environ, **env},
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def legacy_convert_units(ureg, value, from_unit, to_unit):
+    """convert_units before the cached conversion factors."""
+    try:
+        converted = (value * ureg(from_unit)).to(to_unit)
+        return f"{converted.magnitude:.4g} {converted.units}"
+    except Exception as e:
+        return f"Conversion error: {str(e)}"
+
+
+def main(args):
+    # Fill pint's disk cache once, so "disk cache" measures a warm cache
+    time_in_fresh_process(STARTUP[2][1], STARTUP[2][2])
+    print(f"{'startup':>40} | {'median (s)':>10}")
+    print("-" * 55)
+    for name, code, env in STARTUP:
+        median = statistics.median(time_in_fresh_process(code, env) for _ in range(args.runs))
+        print(f"{name:>40} | {median:>10.3f}")
+
+    ureg = get_unit_registry()
+    values = [float(i) for i in range(args.n)]
+    legacy = [legacy_convert_units(ureg, value, "mile", "km") for value in values[:100]]
+    if legacy != [convert_units(value, "mile", "km") for value in values[:100]]:
+        raise AssertionError("convert_units results differ")
+
+    print(f"\n{'per conversion':>40} | {'us/value':>10}")
+    print("-" * 55)
+    for name, run in [
+        ("parse and convert (before)", lambda: [legacy_convert_units(ureg, v, "mile", "km") for v in values]),
+        ("convert_units, cached factor", lambda: [convert_units(v, "mile", "km") for v in values]),
+        ("convert_units_many", lambda: convert_units_many(values, "mile", "km")),
+    ]:
+        start = time.perf_counter()
+        run()
+        print(f"{name:>40} | {(time.perf_counter() - start) / args.n * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20000, help="Values converted per method")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes per startup measurement")
+    main(parser.parse_args())
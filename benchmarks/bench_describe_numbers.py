@@ -0,0 +1,81 @@
+"""Benchmark: descriptive statistics of one dataset
+- per-statistic tools: calculate_mean/median/std_dev/range_tool, one call each
+- describe_numbers_tool: all statistics (and quartiles) in one call
+- describe_numbers: the same without the tool layer (LangChain stringifies large tool inputs for its callbacks)
+- describe_number_stream: one pass over chunks, constant memory (no median or percentiles)
+
+The tools are invoked in-process, as the agents call them (argument validation
+included). Every run checks that the results agree.
+
+Usage (from the project root):
+    python -m benchmarks.bench_describe_numbers                      # 10^3 .. 10^7 values
+    python -m benchmarks.bench_describe_numbers --sizes 3 4 5 --baseline-max 5
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from mcp_server_setup.calculate import describe_numbers, describe_number_stream
+from mcp_server_setup.tool_registry import registry
+
+PER_STATISTIC_TOOLS = {
+    "mean": "calculate_mean_tool",
+    "median": "calculate_median_tool",
+    "std": "calculate_std_dev_tool",
+    "range": "calculate_range_tool",
+}
+CHUNK_SIZE = 100_000
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def per_statistic(numbers):
+    return {key: registry.langchain_tool(name).invoke({"numbers": numbers}) for key, name in PER_STATISTIC_TOOLS.items()}
+
+
+def check(expected, actual, keys):
+    for key in keys:
+        if not math.isclose(expected[key], actual[key], rel_tol=1e-9, abs_tol=1e-9):
+            raise AssertionError(f"{key}: {expected[key]} != {actual[key]}")
+
+
+def main(args):
+    describe_tool = registry.langchain_tool("describe_numbers_tool")
+    rng = np.random.default_rng(0)
+
+    print(f"{'values':>10} | {'4 tools (s)':>11} | {'describe (s)':>12} | {'speedup':>7} | "
+          f"{'engine (s)':>10} | {'stream (s)':>10}")
+    print("-" * 77)
+    for exponent in args.sizes:
+        data = rng.normal(1000.0, 50.0, 10 ** exponent)
+        numbers = data.tolist()
+
+        described, describe_s = timed(lambda: describe_tool.invoke({"numbers": numbers}))
+        engine, engine_s = timed(lambda: describe_numbers(numbers))
+        check(described, engine, ["mean", "median", "std", "range"])
+        streamed, stream_s = timed(lambda: describe_number_stream(
+            data[i:i + CHUNK_SIZE] for i in range(0, data.size, CHUNK_SIZE)))
+        check(described, streamed, ["mean", "std", "range"])
+
+        if exponent <= args.baseline_max:
+            baseline, baseline_s = timed(lambda: per_statistic(numbers))
+            check(baseline, described, PER_STATISTIC_TOOLS)
+            baseline_col, speedup_col = f"{baseline_s:>11.3f}", f"{baseline_s / describe_s:>6.0f}x"
+        else:
+            baseline_col, speedup_col = f"{'skipped':>11}", f"{'':>7}"
+        print(f"{10 ** exponent:>10} | {baseline_col} | {describe_s:>12.3f} | {speedup_col} | {engine_s:>10.3f} | {stream_s:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 4, 5, 6, 7],
+                        help="Dataset sizes as powers of ten")
+    parser.add_argument("--baseline-max", type=int, default=7,
+                        help="Largest power of ten run with the per-statistic tools (slow on large inputs)")
+    main(parser.parse_args())
@@ -0,0 +1,101 @@
+"""Benchmark: evaluate_expression, regex + eval (before) vs. the compiled, cached evaluator (safe_eval.py)
+- repeated:   the same expression again and again
+- templated:  one expression with changing numbers (before: numbers formatted into the text; after: variables)
+- vectorized: the templated expression for N bindings in one call (after: list-valued variables)
+- rejected:   time to refuse 9**9**9 (eval would not finish)
+
+Before the timing, the whitelisted functions are checked against math and the
+builtins (n-ary min/max, log with a base, rejected calls with too many arguments).
+
+Usage (from the project root):
+    python -m benchmarks.bench_evaluate_expression
+    python -m benchmarks.bench_evaluate_expression --n 100000
+"""
+import argparse
+import random
+import re
+import time
+
+from mcp_server_setup.calculate import evaluate_expression
+from mcp_server_setup.safe_eval import get_cache_stats
+
+EXPRESSION = "3 + 4 * (2 - 1.5) / 7"
+TEMPLATE = "{a} * 2.5 + {b} / 4 - ({a} - {b}) * 3"
+VARIABLE_EXPRESSION = "a * 2.5 + b / 4 - (a - b) * 3"
+FUNCTION_CASES = [
+    ("max(1, 2, 3)", 3),
+    ("min(4, 2, 3, 5)", 2),
+    ("log(8, 2)", 3.0),
+    ("log(100, 10)", 2.0),
+    ("log(e)", 1.0),
+    ("round(2.567, 2)", 2.57),
+    ("max(1, 2) + min(3, 4)", 5),
+]
+REJECTED_CALLS = ["sqrt(4, 5)", "log(1, 2, 3)", "round(1, 2, 3)", "max()"]
+
+
+def legacy_evaluate_expression(expr):
+    """evaluate_expression before the compiled evaluator."""
+    try:
+        expr_clean = re.sub(r"[^0-9\+\-\*/\(\)\. ]", "", expr)
+        return eval(expr_clean)
+    except Exception as e:
+        return f"Evaluation error: {str(e)}"
+
+
+def throughput(fn, n):
+    start = time.perf_counter()
+    results = fn()
+    return n / (time.perf_counter() - start), results
+
+
+def check_functions():
+    for expression, expected in FUNCTION_CASES:
+        result = evaluate_expression(expression)
+        if isinstance(result, str) or abs(result - expected) > 1e-9:
+            raise AssertionError(f"{expression}: expected {expected}, got {result}")
+    for expression in REJECTED_CALLS:
+        result = evaluate_expression(expression)
+        if not (isinstance(result, str) and "argument" in result):
+            raise AssertionError(f"{expression}: expected an argument count error, got {result}")
+    print(f"function checks passed ({len(FUNCTION_CASES)} evaluated, {len(REJECTED_CALLS)} rejected)\n")
+
+
+def main(args):
+    check_functions()
+    rng = random.Random(0)
+    a = [rng.randint(1, 1000) for _ in range(args.n)]
+    b = [rng.randint(1, 1000) for _ in range(args.n)]
+    texts = [TEMPLATE.format(a=x, b=y) for x, y in zip(a, b)]
+
+    workloads = [
+        ("repeated",
+         lambda: [legacy_evaluate_expression(EXPRESSION) for _ in range(args.n)],
+         lambda: [evaluate_expression(EXPRESSION) for _ in range(args.n)]),
+        ("templated",
+         lambda: [legacy_evaluate_expression(text) for text in texts],
+         lambda: [evaluate_expression(VARIABLE_EXPRESSION, {"a": x, "b": y}) for x, y in zip(a, b)]),
+        ("vectorized",
+         lambda: [legacy_evaluate_expression(text) for text in texts],
+         lambda: evaluate_expression(VARIABLE_EXPRESSION, {"a": a, "b": b})),
+    ]
+
+    print(f"{'workload':>10} | {'before (evals/s)':>16} | {'after (evals/s)':>15} | {'speedup':>7}")
+    print("-" * 60)
+    for name, before, after in workloads:
+        before_rate, expected = throughput(before, args.n)
+        after_rate, actual = throughput(after, args.n)
+        if any(abs(x - y) > 1e-9 * max(1.0, abs(x)) for x, y in zip(expected, actual)):
+            raise AssertionError(f"{name}: results differ")
+        print(f"{name:>10} | {before_rate:>16,.0f} | {after_rate:>15,.0f} | {after_rate / before_rate:>6.1f}x")
+
+    start = time.perf_counter()
+    result = evaluate_expression("9**9**9")
+    print(f"\n9**9**9 rejected in {(time.perf_counter() - start) * 1000:.2f} ms: {result}")
+    print(f"compiled-expression cache: {get_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20000, help="Evaluations per workload")
+    main(parser.parse_args())
@@ -0,0 +1,64 @@
+"""Benchmark: fast-path router, latency per query and hit rate
+- the test queries of mcp_sub_agent_reason.py and further trivial math: answered without an LLM call
+- queries that need the agents (or are ambiguous): fall through to the orchestrator
+
+Before, every query took three Gemini round trips (orchestrator, reason agent,
+orchestrator). The first run of a query kind includes one-time setup (pint
+registry, solver worker start); the table shows the warm latency.
+
+Usage (from the project root):
+    python -m benchmarks.bench_fast_path
+"""
+import argparse
+import asyncio
+import time
+
+from agents.fast_path_router import get_fast_path_stats, try_fast_path
+from mcp_server_setup.solver_pool import solver_pool
+
+QUERIES = [
+    # Test queries of mcp_sub_agent_reason.py
+    "Convert 100 miles to kilometers",
+    "What is the sum of 145, 232, 378, and 591?",
+    "If I'm born on January 15, 1990, how old am I today?",
+    "Solve the equation 3x + 7 = 22",
+    "Calculate the mean and median of the following values: 5, 8, 12, 14, 15, 22, 35",
+    # Further trivial math
+    "What is 3 + 4 * (2 - 1)?",
+    "12 divided by 4",
+    "How many feet are in 3 meters?",
+    "How many days are between 2020-01-01 and 2021-03-15?",
+    "What is the average of 1, 2 and 3?",
+    # Ambiguous or not math: LLM path
+    "How many days between March 1 and March 5?",
+    "Solve x**2 = 4",
+    "What is 1,000 + 2?",
+    "What is 9/11?",
+    "What is 7-11?",
+    "What is the capital of France?",
+    "Summarize the Economy section of the Berlin Wikipedia page.",
+]
+
+
+async def main(args):
+    for query in QUERIES:  # warm-up
+        await try_fast_path(query)
+
+    print(f"{'query':>60} | {'ms':>6} | answer")
+    print("-" * 100)
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            answer = await try_fast_path(query)
+        elapsed_ms = (time.perf_counter() - start) / args.runs * 1000
+        print(f"{query[:60]:>60} | {elapsed_ms:>6.2f} | {answer if answer is not None else '-> LLM path'}")
+
+    stats = get_fast_path_stats()
+    print(f"\nhit rate: {stats['hit_rate']:.0%} of {stats['queries']} queries ({stats})")
+    solver_pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per query")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,114 @@
+"""Benchmark: HTML cleaning engines (lxml vs. BeautifulSoup)
+- checks that both engines produce identical output for every page
+- pages per second and MB per second of HTML
+- peak memory while cleaning (RSS increase in a fresh process)
+
+Usage (from the project root):
+    python -m benchmarks.bench_html_clean                        # synthetic articles
+    python -m benchmarks.bench_html_clean --corpus saved_pages/  # saved pages (*.html or action=parse *.json)
+
+Save a page for the corpus with e.g.
+    curl -o saved_pages/berlin.json "https://en.wikipedia.org/w/api.php?action=parse&pageid=3354&prop=text&format=json"
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.wiki_mock import article_html
+from mcp_server_setup.wiki_html import content_blocks, LXML_AVAILABLE
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENGINES = ["bs4", "lxml"] if LXML_AVAILABLE else ["bs4"]
+
+
+def load_corpus(args) -> list:
+    if not args.corpus:
+        return [article_html(pageid, num_sections=sections) for pageid, sections in enumerate(args.sizes * args.pages)]
+    pages = []
+    for path in sorted(Path(args.corpus).iterdir()):
+        if path.suffix == ".html":
+            pages.append(path.read_text(encoding="utf-8"))
+        elif path.suffix == ".json":
+            pages.append(json.loads(path.read_text(encoding="utf-8"))["parse"]["text"]["*"])
+    return pages
+
+
+def check_identical(pages) -> int:
+    """Return the number of pages on which the engines disagree."""
+    mismatches = 0
+    for i, html in enumerate(pages):
+        for with_anchors in (False, True):
+            results = {engine: content_blocks(html, with_anchors, engine) for engine in ENGINES}
+            if len({json.dumps(blocks) for blocks in results.values()}) > 1:
+                mismatches += 1
+                print(f"  page {i}: engines disagree (with_anchors={with_anchors})")
+    return mismatches
+
+
+def pages_per_second(pages, engine: str, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for html in pages:
+            content_blocks(html, True, engine)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best
+
+
+def _peak_memory_mb(args, engine: str) -> float:
+    """Peak memory increase while cleaning all pages (runs in a fresh process)."""
+    pages = load_corpus(args)
+    content_blocks(pages[0], True, engine)  # import and warm up the parser
+    if resource is None:
+        tracemalloc.start()
+        for html in pages:
+            content_blocks(html, True, engine)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    unit = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in bytes on macOS, KiB on Linux
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for html in pages:
+        content_blocks(html, True, engine)
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * unit / 2 ** 20
+
+
+def peak_memory_mb(args, engine: str) -> float:
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_peak_memory_mb, (args, engine))
+
+
+def main(args):
+    # The peak RSS of a child process starts at its parent's, so measure memory while this process is still small
+    memory = {engine: peak_memory_mb(args, engine) for engine in ENGINES}
+    pages = load_corpus(args)
+    total_mb = sum(len(html.encode("utf-8")) for html in pages) / 2 ** 20
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB of HTML")
+    if not LXML_AVAILABLE:
+        print("lxml is not installed, only the BeautifulSoup engine is measured.")
+
+    mismatches = check_identical(pages)
+    print(f"Identical output: {len(pages) * 2 - mismatches}/{len(pages) * 2} cleanings\n")
+
+    memory_label = "peak RSS (MB)" if resource else "peak heap (MB)"
+    print(f"{'engine':>6} | {'pages/s':>9} | {'MB/s':>7} | {memory_label:>14}")
+    print("-" * 46)
+    for engine in ENGINES:
+        rate = pages_per_second(pages, engine, args.repeats)
+        print(f"{engine:>6} | {rate:>9.1f} | {rate * total_mb / len(pages):>7.2f} | {memory[engine]:>14.1f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of saved pages (*.html or action=parse *.json)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 12, 40], help="Sections per synthetic article")
+    parser.add_argument("--pages", type=int, default=10, help="Synthetic articles per size")
+    parser.add_argument("--repeats", type=int, default=3)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,66 @@
+"""Benchmark: sub-agent calls of one orchestrator turn, one after the other (before) vs. concurrent dispatch (after)
+- before: the workflow handled one tool call per turn, so N sub-agent calls ran in sequence
+- after: dispatch_tool_calls runs them concurrently, at most --limit at a time
+
+Sub-agents are simulated with a fixed latency per call (--latency), so the
+results are deterministic and no model is called. Every run checks that the
+results come back in the order of the tool calls.
+
+Usage (from the project root):
+    python -m benchmarks.bench_parallel_dispatch
+    python -m benchmarks.bench_parallel_dispatch --calls 2 4 8 --latency 0.5 --limit 3
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from langchain_core.tools import StructuredTool
+
+from agents.parallel_dispatch import dispatch_tool_calls
+
+
+def simulated_agent(name: str, latency: float) -> StructuredTool:
+    async def call_agent(query: str) -> str:
+        # Jitter, so calls finish out of order
+        await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+        return f"{name}: {query}"
+    return StructuredTool.from_function(coroutine=call_agent, name=name, description=f"Simulated {name}")
+
+
+def turn(calls: int) -> list:
+    names = ["call_search_agent", "call_reason_agent"]
+    return [{"name": names[i % 2], "args": {"query": f"sub-query {i}"}, "id": f"call_{i}"} for i in range(calls)]
+
+
+async def main(args):
+    random.seed(0)
+    tools = {name: simulated_agent(name, args.latency) for name in ("call_search_agent", "call_reason_agent")}
+
+    print(f"{'calls':>5} | {'sequential (s)':>14} | {f'limit {args.limit} (s)':>12} | {'speedup':>7}")
+    print("-" * 48)
+    for calls in args.calls:
+        tool_calls = turn(calls)
+        start = time.perf_counter()
+        sequential = []
+        for tool_call in tool_calls:
+            messages, _ = await dispatch_tool_calls([tool_call], tools, set())
+            sequential += messages
+        sequential_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent, _ = await dispatch_tool_calls(tool_calls, tools, set(), max_concurrency=args.limit)
+        concurrent_s = time.perf_counter() - start
+
+        expected = [f"{call['name']}: {call['args']['query']}" for call in tool_calls]
+        if [m.content for m in concurrent] != expected or [m.content for m in sequential] != expected:
+            raise AssertionError("Results are not in the order of the tool calls")
+        print(f"{calls:>5} | {sequential_s:>14.2f} | {concurrent_s:>12.2f} | {sequential_s / concurrent_s:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 2, 3, 6], help="Sub-agent calls per turn")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean seconds per simulated sub-agent call")
+    parser.add_argument("--limit", type=int, default=3, help="Concurrency limit of the dispatch")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+"""Benchmark: tool-call overhead in the reason agent, asyncio.run wrappers (before) vs. native coroutines (after)
+- before: every tool is a sync StructuredTool whose func runs the tool's coroutine with asyncio.run,
+  i.e. one executor thread and one new event loop per call
+- after: the agent's ToolNode awaits the tools' coroutines directly
+
+Model turns with 1, 4 and 16 tool calls (add_tool, multiply_tool, ...) are run
+through the ToolNode of the agent, as after an LLM response; no model calls
+are made. The benchmark checks that both variants return the same results.
+
+Usage (from the project root):
+    python -m benchmarks.bench_reason_tools
+    python -m benchmarks.bench_reason_tools --turns 500 --calls 1 8 32
+"""
+import argparse
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import ToolNode
+
+from mcp_server_setup.mcp_tool_loader import get_mcp_tools
+
+TOOL_CALLS = [
+    ("add_tool", {"numbers": [145, 232, 378, 591]}),
+    ("multiply_tool", {"numbers": [3.5, 12]}),
+    ("subtract_tool", {"minuend": 100, "subtrahend": 58}),
+    ("calculate_mean_tool", {"numbers": [5, 8, 12, 14, 15, 22, 35]}),
+]
+
+
+def legacy_tools(tools):
+    """The tool wrappers of the reason agent before, without the debug print."""
+    def make_tool_func(tool_coroutine):
+        def func(**kwargs):
+            return asyncio.run(tool_coroutine(**kwargs))
+        return func
+
+    return [
+        StructuredTool(name=t.name, description=t.description, func=make_tool_func(t.coroutine), args_schema=t.args)
+        for t in tools
+    ]
+
+
+def model_turn(calls: int) -> AIMessage:
+    tool_calls = []
+    for i in range(calls):
+        name, args = TOOL_CALLS[i % len(TOOL_CALLS)]
+        tool_calls.append({"name": name, "args": args, "id": f"call_{i}", "type": "tool_call"})
+    return AIMessage(content="", tool_calls=tool_calls)
+
+
+async def run_turns(node: ToolNode, message: AIMessage, turns: int):
+    start = time.perf_counter()
+    for _ in range(turns):
+        result = await node.ainvoke({"messages": [message]})
+    return [m.content for m in result["messages"]], time.perf_counter() - start
+
+
+async def main(args):
+    tools = await get_mcp_tools(sorted({name for name, _ in TOOL_CALLS}))
+    before_node, after_node = ToolNode(legacy_tools(tools)), ToolNode(tools)
+
+    print(f"{'calls/turn':>10} | {'before (us/call)':>16} | {'after (us/call)':>15} | {'speedup':>7}")
+    print("-" * 58)
+    for calls in args.calls:
+        message = model_turn(calls)
+        await run_turns(before_node, message, 1)  # warm-up
+        before, before_s = await run_turns(before_node, message, args.turns)
+        after, after_s = await run_turns(after_node, message, args.turns)
+        # The legacy wrappers passed the JSON schema on, so integer inputs stayed integers
+        if [float(value) for value in before] != [float(value) for value in after]:
+            raise AssertionError(f"Results differ: {before} != {after}")
+        per_call = args.turns * calls / 1e6
+        print(f"{calls:>10} | {before_s / per_call:>16.1f} | {after_s / per_call:>15.1f} | {before_s / after_s:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200, help="Model turns per measurement")
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 4, 16], help="Tool calls per model turn")
+    asyncio.run(main(parser.parse_args()))
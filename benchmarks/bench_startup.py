@@ -0,0 +1,78 @@
+"""Benchmark: import time of each entry point, checked against a startup budget
+- mcp_tools_server: the MCP server process (started by every MCP client session)
+- chainlit_mcp_main: the Chainlit app
+- the orchestrator and sub-agent modules
+
+Each import is timed in a fresh interpreter (median of --runs); heavy dependencies
+(LLM clients, sympy, bs4, the vertexai tokenizer) and tool discovery have to be
+deferred to first use. The benchmark exits with status 1 if an entry point is
+slower than its budget, so it can run as a check after dependency or import
+changes. Entry points whose dependencies are not installed are skipped.
+
+Usage (from the project root):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 5 --budget-scale 1.5    # slower machine
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> import time budget in seconds (measured times plus headroom)
+BUDGETS = {
+    "mcp_server_setup.mcp_tools_server": 2.5,
+    "chainlit_mcp_main": 5.0,
+    "agents.mcp_orchestrator_agent": 3.5,
+    "agents.mcp_sub_agent_search": 3.5,
+    "agents.mcp_sub_agent_reason": 3.5,
+}
+
+
+def time_import(module: str, env: dict) -> float:
+    """Import time of `module` in a fresh interpreter, in seconds (ModuleNotFoundError if a dependency is missing)."""
+    script = (f"import time\nstart = time.perf_counter()\nimport {module}\n"
+              f"print(time.perf_counter() - start)")
+    # Run outside the project directory, so the entry points do not write their logs into the tree
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run([sys.executable, "-c", script], cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        last_line = (result.stderr.strip().splitlines() or ["import failed"])[-1]
+        if last_line.startswith("ModuleNotFoundError"):
+            raise ModuleNotFoundError(last_line)
+        raise RuntimeError(f"Importing {module} failed: {last_line}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(args) -> int:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [PROJECT_ROOT, os.getenv("PYTHONPATH")]))}
+    # The LLM clients are created lazily, but a key has to be present for the modules that read it
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    failures = 0
+    print(f"{'entry point':>36} | {'median (s)':>10} | {'budget (s)':>10} | result")
+    print("-" * 73)
+    for module, budget in BUDGETS.items():
+        budget *= args.budget_scale
+        try:
+            median = statistics.median(time_import(module, env) for _ in range(args.runs))
+        except ModuleNotFoundError as e:
+            print(f"{module:>36} | {'':>10} | {budget:>10.2f} | skipped ({e})")
+            continue
+        passed = median <= budget
+        failures += not passed
+        print(f"{module:>36} | {median:>10.3f} | {budget:>10.2f} | {'ok' if passed else 'OVER BUDGET'}")
+
+    if failures:
+        print(f"\n{failures} entry point(s) over budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes per entry point")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply all budgets (e.g. on slower machines)")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""Benchmark: end-to-end latency of a search-agent run, by tool strategy
+- step by step: search -> get_page_sections -> get_multiple_sections_content (an LLM turn before each tool call)
+- ranked:       search -> rank_sections
+- wiki_lookup:  one wiki_lookup call
+
+Every LLM turn (including the final answer) is simulated with a fixed delay,
+the Wikipedia API with the mock in benchmarks/wiki_mock.py.
+
+Usage (from the project root):
+    python -m benchmarks.bench_wiki_lookup                       # 1.5 s per LLM turn, 100 ms per API request
+    python -m benchmarks.bench_wiki_lookup --llm-latency 0.8 --latency 0.25
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.wiki_mock import MockWikipedia
+from mcp_server_setup import wiki_search
+from mcp_server_setup.wiki_rate_limit import RateLimiter, TokenBucket
+
+QUERY = "Berlin economy section 7"
+
+
+async def step_by_step(llm):
+    await llm()
+    results = await wiki_search.search_wikipedia(QUERY)
+    await llm()
+    await wiki_search.get_page_sections(results[0]["pageid"])
+    await llm()
+    await wiki_search.get_multiple_sections_content(results[0]["pageid"], ["0", "7", "8"])
+    await llm()
+    return 3
+
+
+async def ranked(llm):
+    await llm()
+    results = await wiki_search.search_wikipedia(QUERY)
+    await llm()
+    await wiki_search.rank_sections(results[0]["pageid"], QUERY, 3)
+    await llm()
+    return 2
+
+
+async def lookup(llm):
+    await llm()
+    await wiki_search.wiki_lookup(QUERY)
+    await llm()
+    return 1
+
+
+STRATEGIES = [("step by step", step_by_step), ("ranked", ranked), ("wiki_lookup", lookup)]
+
+
+async def main(args):
+    # Cold runs: no disk cache, page models, prefetch or client-side rate limit
+    wiki_search.wiki_cache = None
+    wiki_search.rate_limiter = RateLimiter(TokenBucket(rate=0))
+    mock = MockWikipedia(latency=args.latency)
+    mock.install()
+
+    llm_calls = 0
+
+    async def llm():
+        nonlocal llm_calls
+        llm_calls += 1
+        await asyncio.sleep(args.llm_latency)
+
+    print(f"{'strategy':>12} | {'LLM turns':>9} | {'tool calls':>10} | {'API requests':>12} | {'latency (s)':>11} | {'reduction':>9}")
+    print("-" * 80)
+    baseline = None
+    for name, strategy in STRATEGIES:
+        wiki_search._page_models.clear()
+        llm_calls, requests_before = 0, mock.requests
+        start = time.perf_counter()
+        tool_calls = await strategy(llm)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{name:>12} | {llm_calls:>9} | {tool_calls:>10} | {mock.requests - requests_before:>12} | "
+              f"{elapsed:>11.2f} | {1 - elapsed / baseline:>8.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="Simulated seconds per LLM turn")
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated seconds per API request")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,59 @@
+"""Benchmark: fetching N sections of a page
+- one request per section, sequentially
+- one request per section, concurrently
+- from the page model (get_multiple_sections_content: one request and one HTML parse per page)
+
+Usage (from the project root):
+    python -m benchmarks.bench_wiki_sections                  # simulated API, 100 ms per request
+    python -m benchmarks.bench_wiki_sections --latency 0.25
+    python -m benchmarks.bench_wiki_sections --live --page-id 3354   # real Wikipedia (Berlin)
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.wiki_mock import MockWikipedia
+from mcp_server_setup import wiki_search
+from mcp_server_setup.wiki_rate_limit import RateLimiter, TokenBucket
+from mcp_server_setup.wiki_search import get_multiple_sections_content, SECTION_CONCURRENCY
+
+
+async def _time_call(fetch, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        wiki_search._page_models.clear()
+        start = time.perf_counter()
+        await fetch()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def main(args):
+    # Measure the network path, not the on-disk cache or the client-side rate limit
+    wiki_search.wiki_cache = None
+    wiki_search.rate_limiter = RateLimiter(TokenBucket(rate=0))
+    if not args.live:
+        MockWikipedia(latency=args.latency).install()
+
+    print(f"{'sections':>8} | {'sequential (s)':>14} | {'concurrent (s)':>14} | {'page model (s)':>14} | {'speedup':>7}")
+    print("-" * 70)
+    for n in args.sections:
+        indices = [str(i) for i in range(n)]
+        sequential = await _time_call(lambda: wiki_search._fetch_sections(args.page_id, indices, 1), args.repeats)
+        concurrent = await _time_call(
+            lambda: wiki_search._fetch_sections(args.page_id, indices, args.concurrency), args.repeats
+        )
+        page_model = await _time_call(lambda: get_multiple_sections_content(args.page_id, indices), args.repeats)
+        speedup = sequential / min(concurrent, page_model)
+        print(f"{n:>8} | {sequential:>14.3f} | {concurrent:>14.3f} | {page_model:>14.3f} | {speedup:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--concurrency", type=int, default=SECTION_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated seconds per API request")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="Query the real Wikipedia API")
+    parser.add_argument("--page-id", type=int, default=3354)
+    asyncio.run(main(parser.parse_args()))
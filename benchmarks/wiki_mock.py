@@ -0,0 +1,160 @@
+"""Simulated MediaWiki API for offline, deterministic benchmarks.
+
+Serves `action=query&list=search`, `action=parse` (full page, single section
+or section list) and `action=query&prop=info` for synthetic pages with a fixed
+per-request latency, through an `httpx.MockTransport` installed as the shared
+client of `mcp_server_setup.wiki_search`.
+"""
+import asyncio
+import httpx
+
+from mcp_server_setup import wiki_search
+
+NUM_SECTIONS = 24
+PARAGRAPHS_PER_SECTION = 4
+
+
+def _section_line(index: int) -> str:
+    return f"Section {index}"
+
+
+def _section_html(pageid: int, index: int) -> str:
+    paragraphs = "".join(
+        f"<p>Paragraph {p} of section {index} on page {pageid}. "
+        f"Berlin economy population history culture <b>fact {p}</b>.<sup>[{p}]</sup></p>"
+        for p in range(PARAGRAPHS_PER_SECTION)
+    )
+    heading = "" if index == 0 else (
+        f'<div class="mw-heading mw-heading2"><h2 id="s{index}">{_section_line(index)}</h2></div>'
+    )
+    return heading + paragraphs + "<ul><li>List item</li></ul><table><tr><td>Infobox</td></tr></table>"
+
+
+def page_html(pageid: int) -> str:
+    body = "".join(_section_html(pageid, i) for i in range(NUM_SECTIONS + 1))
+    return f'<div class="mw-content-ltr mw-parser-output">{body}</div>'
+
+
+def _sections(pageid: int) -> list:
+    return [
+        {"toclevel": 1, "level": "2", "line": _section_line(i), "number": str(i), "index": str(i), "anchor": f"s{i}"}
+        for i in range(1, NUM_SECTIONS + 1)
+    ]
+
+
+class MockWikipedia:
+    """MediaWiki API stand-in that counts requests and sleeps `latency` seconds per request."""
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self.requests = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        params = dict(request.url.params)
+        action = params.get("action")
+        if action == "query" and params.get("list") == "search":
+            results = [
+                {"title": f"Page {pageid}", "pageid": pageid, "snippet": f'<span class="searchmatch">{params["srsearch"]}</span> snippet'}
+                for pageid in range(1000, 1000 + int(params.get("srlimit", 10)))
+            ]
+            return httpx.Response(200, json={"query": {"search": results}})
+        if action == "query" and params.get("prop") == "info":
+            pages = {pid: {"pageid": int(pid), "lastrevid": 1} for pid in params.get("pageids", "").split("|")}
+            return httpx.Response(200, json={"query": {"pages": pages}})
+        if action == "parse":
+            pageid = int(params["pageid"])
+            parse = {"title": f"Page {pageid}", "pageid": pageid, "revid": 1}
+            if "section" in params:
+                index = int(params["section"])
+                if index > NUM_SECTIONS:
+                    return httpx.Response(200, json={"error": {"code": "nosuchsection"}})
+                parse["text"] = {"*": _section_html(pageid, index)}
+            if "sections" in params.get("prop", ""):
+                parse["sections"] = _sections(pageid)
+            if "text" in params.get("prop", "") and "section" not in params:
+                parse["text"] = {"*": page_html(pageid)}
+            return httpx.Response(200, json={"parse": parse})
+        return httpx.Response(400, json={"error": {"code": "badrequest"}})
+
+    def install(self):
+        """Make the running event loop's wiki HTTP client use this mock (call inside the loop)."""
+        loop = asyncio.get_running_loop()
+        wiki_search._clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+
+def article_html(pageid: int, num_sections: int = 12) -> str:
+    """Synthetic article in the markup of real MediaWiki parser output.
+
+    Contains the elements the cleaner has to deal with: infobox, hatnotes,
+    old and new heading styles, edit links, references, nested lists,
+    figures, math, comments, character references, navboxes and reflists.
+    """
+    parts = [
+        '<div class="mw-content-ltr mw-parser-output" lang="en" dir="ltr">',
+        '<div class="shortdescription nomobile noexcerpt noprint searchaux" style="display:none">Synthetic article</div>',
+        '<div role="note" class="hatnote navigation-not-searchable">For other uses, see '
+        f'<a href="/wiki/Page_{pageid}_(disambiguation)">Page {pageid} (disambiguation)</a>.</div>',
+        '<table class="infobox ib-settlement vcard"><tbody><tr><th colspan="2" class="infobox-above">'
+        f'<div class="fn org">Page {pageid}</div></th></tr><tr><th scope="row" class="infobox-label">Population</th>'
+        '<td class="infobox-data">3,878,100</td></tr></tbody></table>',
+        '<style data-mw-deduplicate="TemplateStyles:r1">.mw-parser-output .hatnote{font-style:italic}</style>',
+        f'<p class="mw-empty-elt">\n</p><p><b>Page {pageid}</b> is the capital and largest city of '
+        '<a href="/wiki/Germany" title="Germany">Germany</a>, by both area and population.'
+        '<sup id="cite_ref-1" class="reference"><a href="#cite_note-1"><span class="cite-bracket">[</span>1'
+        '<span class="cite-bracket">]</span></a></sup> Its 3.85&#160;million inhabitants make it the '
+        '<a href="/wiki/Largest_cities_of_the_European_Union">most populous city</a> of the EU &amp; more.\n</p>',
+        '<meta property="mw:PageProp/toc" />',
+    ]
+    for s in range(1, num_sections + 1):
+        if s % 3 == 0:
+            # Pre-2024 heading markup
+            parts.append(
+                f'<h2><span class="mw-headline" id="Section_{s}">Section {s}</span><span class="mw-editsection">'
+                '<span class="mw-editsection-bracket">[</span><a href="/w/index.php?action=edit">edit</a>'
+                '<span class="mw-editsection-bracket">]</span></span></h2>'
+            )
+        else:
+            parts.append(
+                f'<div class="mw-heading mw-heading2"><h2 id="Section_{s}">Section {s}</h2><span class="mw-editsection">'
+                '<span class="mw-editsection-bracket">[</span><a href="/w/index.php?action=edit">edit</a>'
+                '<span class="mw-editsection-bracket">]</span></span></div>'
+            )
+        parts.append(
+            '<figure class="mw-default-size" typeof="mw:File/Thumb"><a href="/wiki/File:Image.jpg" class="mw-file-description">'
+            '<img src="//upload.wikimedia.org/image.jpg" decoding="async" width="250" height="167" class="mw-file-element" /></a>'
+            f'<figcaption>Figure of section {s}</figcaption></figure>'
+        )
+        for p in range(5):
+            parts.append(
+                f'<p>In {1200 + 37 * s + p}, the <a href="/wiki/Margraviate">margraviate</a> grew&#8212;'
+                f'after the &#8220;treaty&#8221; of section&nbsp;{s}&#x2014;into a <i>major</i> '
+                f'<a href="/wiki/Trade">trading</a> centre.<sup id="cite_ref-{s}_{p}" class="reference">'
+                f'<a href="#cite_note-{s}_{p}">[{s * 10 + p}]</a></sup> The area is '
+                f'<span class="nowrap">891.3&#160;km<sup>2</sup></span> '
+                '<span class="mwe-math-element"><span class="mwe-math-mathml-inline" style="display: none;">'
+                '<math xmlns="http://www.w3.org/1998/Math/MathML"><mi>x</mi><mo>=</mo><mn>2</mn></math></span>'
+                '<img src="math.svg" class="mwe-math-fallback-image-inline" alt="x=2" /></span> large.<!-- editor note -->\n</p>'
+            )
+        parts.append(
+            '<div class="mw-heading mw-heading3">'
+            f'<h3 id="Subsection_{s}">Subsection {s} &amp; more</h3></div>'
+            '<ul><li><a href="/wiki/A">Item A</a> &#8211; first<ul><li>Nested item</li></ul></li>'
+            '<li>Item B<sup class="reference">[n]</sup></li></ul>'
+            '<blockquote><p>A quotation in section ' + str(s) + '.</p></blockquote>'
+            '<dl><dt>Term</dt><dd>Definition</dd></dl>'
+        )
+    parts.append(
+        '<div class="mw-heading mw-heading2"><h2 id="References">References</h2></div>'
+        '<div class="reflist reflist-columns references-column-width"><ol class="references">'
+        + "".join(f'<li id="cite_note-{i}"><span class="mw-cite-backlink"><a href="#cite_ref-{i}">^</a></span> '
+                  f'<span class="reference-text">Reference {i}.</span></li>' for i in range(num_sections * 5))
+        + '</ol></div>'
+        '<div role="navigation" class="navbox" aria-labelledby="Nav"><table class="nowraplinks"><tbody>'
+        '<tr><th>Navigation</th></tr><tr><td><ul><li><a href="/wiki/X">X</a></li></ul></td></tr></tbody></table></div>'
+        '<!-- NewPP limit report\nParsed by mw-web\n-->'
+        '<script>(RLQ=window.RLQ||[]).push(function(){mw.config.set({"wgBackendResponseTime":"</p>"});});</script>'
+        '</div>'
+    )
+    return "".join(parts)
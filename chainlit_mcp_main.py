@@ -1,15 +1,18 @@
 import sys
 import os
+import logging
 from typing import TypedDict, Annotated, List
 from langchain_core.messages import HumanMessage, BaseMessage, AIMessage, SystemMessage
 import operator
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 import chainlit as cl
-from agents.mcp_orchestrator_agent import orchestrator_agent_executor
-from mcp_server_setup.mcp_tool_loader import get_mcp_tools
-from vertexai.preview.tokenization import get_tokenizer_for_model
+from agents.mcp_orchestrator_agent import get_orchestrator, get_orchestrator_tools
+from agents.parallel_dispatch import all_repeated, dispatch_tool_calls, get_dispatch_stats
+from agents.fast_path_router import try_fast_path, get_fast_path_stats
+from mcp_server_setup.mcp_tool_loader import get_mcp_tools, get_session_pool_metrics
+from mcp_server_setup.mcp_session_pool import track_session_spawns
+from mcp_server_setup.content_store import expand_content_refs
 
 #mcp imports
 import asyncio
@@ -25,22 +28,41 @@ if project_root not in sys.path:
 # Load environment variables (e.g., GOOGLE_API_KEY)
 load_dotenv()
 
-orchestrator_tools = asyncio.run(get_mcp_tools([
-    "call_search_agent",
-    "call_reason_agent",
-    "extract_user_profile_info",
-]))
+# Per-request metrics (MCP session spawns, fast path, sub-agent dispatch) are logged at DEBUG level.
+# CHAINLIT_MCP_LOG_LEVEL=DEBUG shows them in the terminal.
+logger = logging.getLogger("chainlit_mcp_main")
+LOG_LEVEL = os.getenv("CHAINLIT_MCP_LOG_LEVEL")
+if LOG_LEVEL and not logger.handlers:
+    logger.setLevel(LOG_LEVEL.upper())
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logger.addHandler(_log_handler)
 
 print("🔍 MCP debug log is being written to:")
 print("    → ./mcp_debug.log")
 print("📂 (Located in the root directory where you started this script.)")
 
+async def read_content(handle: str) -> str:
+    """Full text behind a content handle, read with read_content_tool."""
+    read_content_tool, = await get_mcp_tools(["read_content_tool"])
+    return await read_content_tool.ainvoke({"handle": handle, "max_chars": 0})
+
 # --- Define State ---
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     tool_stack: Annotated[List[str], operator.add]
 
 # --- Token-based Context Selection ---
+_tokenizer = None
+
+def get_tokenizer():
+    """Official Gemini tokenizer, loaded on first use (importing vertexai is slow)."""
+    global _tokenizer
+    if _tokenizer is None:
+        from vertexai.preview.tokenization import get_tokenizer_for_model
+        _tokenizer = get_tokenizer_for_model("gemini-1.5-flash-002")
+    return _tokenizer
+
 def select_messages_by_tokens(
     conversation_memory: List[dict], 
     current_query: str, 
@@ -60,8 +82,8 @@ def select_messages_by_tokens(
         List of BaseMessage objects within token limit
     """
     try:
-        # Initialize official Gemini tokenizer
-        tokenizer = get_tokenizer_for_model("gemini-1.5-flash-002")
+        # Official Gemini tokenizer
+        tokenizer = get_tokenizer()
         
         # Always include the current query first
         current_query_tokens = tokenizer.count_tokens(current_query).total_tokens
@@ -106,71 +128,113 @@ def select_messages_by_tokens(
 # --- Define Graph ---
 
 # Same workflow as main.py 
-def delay_node_before_tools(state: AgentState) -> AgentState:
-    return state
-
-def delay_node_before_orchestrator_reentry(state: AgentState) -> AgentState:
-    if "tool_stack" in state and len(state["tool_stack"]) > 5:
-        state["tool_stack"] = state["tool_stack"][-5:]
-    return state
+# (nodes return state updates: returning the whole state would append messages and tool_stack again)
+def delay_node_before_tools(state: AgentState) -> dict:
+    return {}
 
-workflow = StateGraph(AgentState)
+def delay_node_before_orchestrator_reentry(state: AgentState) -> dict:
+    return {}
 
-# Add the orchestrator agent node
-workflow.add_node("orchestrator", orchestrator_agent_executor)
-
-# Add the tool node for executing sub-agent calls
-tool_node = ToolNode(orchestrator_tools)
-workflow.add_node("tools", tool_node)
-
-# Add delay nodes (no actual delay in Chainlit version for better UX)
-workflow.add_node("delay_before_tools", delay_node_before_tools)
-workflow.add_node("delay_before_orchestrator", delay_node_before_orchestrator_reentry)
-
-# Set the entry point
-workflow.set_entry_point("orchestrator")
+# Trivial math is answered before the orchestrator, without any LLM call (see fast_path_router.py)
+async def fast_path_node(state: AgentState) -> dict:
+    last_message = state["messages"][-1]
+    if isinstance(last_message, HumanMessage):
+        answer = await try_fast_path(last_message.content)
+        if answer is not None:
+            return {"messages": [AIMessage(content=answer, name="fast_path")]}
+    return {}
 
-# Define a function to extract tool name from AIMessage
-def extract_tool_name(message: BaseMessage) -> str | None:
-    if isinstance(message, AIMessage) and hasattr(message, "tool_calls") and message.tool_calls:
-        return message.tool_calls[0].get("name")
-    return None
+def route_after_fast_path(state: AgentState) -> str:
+    return END if isinstance(state["messages"][-1], AIMessage) else "orchestrator"
 
 # Define conditional edges
 def should_continue(state: AgentState) -> str:
     last_message = state["messages"][-1]
-    last_tool = extract_tool_name(last_message)
+    tool_calls = last_message.tool_calls if isinstance(last_message, AIMessage) else []
 
-    if last_tool:
-        stack = state.get("tool_stack", [])
-        
-        # Rekursion verhindern: gleiches Tool wie zuletzt
-        if stack and stack[-1] == last_tool:
-            print(f"[RECURSION BLOCKED] Tool '{last_tool}' was just used. Preventing immediate repeat.")
+    if tool_calls:
+        # Rekursion verhindern: tool_stack holds the signatures (tool and arguments) of the calls made so far
+        if all_repeated(tool_calls, state.get("tool_stack", [])):
+            names = ", ".join(tool_call["name"] for tool_call in tool_calls)
+            print(f"[RECURSION BLOCKED] '{names}' already called with the same arguments. Preventing repeat.")
             return END
-        
-        # Tool auf Stack legen
-        state["tool_stack"] = stack + [last_tool]
         return "delay_before_tools"
     
     return END
 
-workflow.add_conditional_edges(
-    "orchestrator",
-    should_continue,
-    {
-        "delay_before_tools": "delay_before_tools",
-        END: END,
-    },
-)
+def make_orchestrator_node(orchestrator):
+    async def orchestrator_node(state: AgentState) -> dict:
+        return {"messages": [await orchestrator.ainvoke({"messages": state["messages"]})]}
+    return orchestrator_node
+
+def make_tools_node(orchestrator_tools):
+    tools_by_name = {tool.name: tool for tool in orchestrator_tools}
+
+    # Runs all sub-agent calls of the orchestrator's turn concurrently, results in call order
+    async def tools_node(state: AgentState) -> dict:
+        tool_messages, executed = await dispatch_tool_calls(
+            state["messages"][-1].tool_calls, tools_by_name, set(state.get("tool_stack", [])))
+        return {"messages": tool_messages, "tool_stack": executed}
+    return tools_node
+
+def build_workflow(orchestrator_tools, orchestrator):
+    """Build and compile the orchestrator workflow graph."""
+    workflow = StateGraph(AgentState)
+
+    # Add the fast path that answers trivial math directly
+    workflow.add_node("fast_path", fast_path_node)
+
+    # Add the orchestrator node (one model turn)
+    workflow.add_node("orchestrator", make_orchestrator_node(orchestrator))
+
+    # Add the tool node for executing sub-agent calls
+    workflow.add_node("tools", make_tools_node(orchestrator_tools))
+
+    # Add delay nodes (no actual delay in Chainlit version for better UX)
+    workflow.add_node("delay_before_tools", delay_node_before_tools)
+    workflow.add_node("delay_before_orchestrator", delay_node_before_orchestrator_reentry)
+
+    # Set the entry point: the fast path, which hands everything it cannot answer to the orchestrator
+    workflow.set_entry_point("fast_path")
+    workflow.add_conditional_edges(
+        "fast_path",
+        route_after_fast_path,
+        {
+            "orchestrator": "orchestrator",
+            END: END,
+        },
+    )
+
+    workflow.add_conditional_edges(
+        "orchestrator",
+        should_continue,
+        {
+            "delay_before_tools": "delay_before_tools",
+            END: END,
+        },
+    )
+
+    # Add edges for the flow
+    workflow.add_edge("delay_before_tools", "tools")
+    workflow.add_edge("tools", "delay_before_orchestrator")
+    workflow.add_edge("delay_before_orchestrator", "orchestrator")
 
-# Add edges for the flow
-workflow.add_edge("delay_before_tools", "tools")
-workflow.add_edge("tools", "delay_before_orchestrator")
-workflow.add_edge("delay_before_orchestrator", "orchestrator")
+    # Compile the workflow
+    return workflow.compile()
 
-# Compile the workflow
-app = workflow.compile()
+# The workflow is built on first use, in Chainlit's event loop: tool discovery
+# then runs once, on the pooled MCP sessions that serve the requests
+_app = None
+_app_lock = asyncio.Lock()
+
+async def get_app():
+    global _app
+    async with _app_lock:
+        if _app is None:
+            orchestrator_tools = await get_orchestrator_tools()
+            orchestrator = await get_orchestrator(orchestrator_tools)
+            _app = build_workflow(orchestrator_tools, orchestrator)
+    return _app
 
 @cl.on_chat_start
 async def start():
@@ -178,6 +242,9 @@ async def start():
     # Initialize session memory
     cl.user_session.set("conversation_memory", [])
     cl.user_session.set("message_count", 0)
+
+    # Build the workflow (and discover the orchestrator tools) once, before the first message
+    await get_app()
     
     user_id = "user_001"
     profile = get_user_profile(user_id)
@@ -244,36 +311,53 @@ async def main(message: cl.Message):
             step_count = 0
             current_event = None
             
-            # Stream through workflow execution
-            async for event in app.astream(initial_input, stream_mode="values"):
-                step_count += 1
-                current_event = event
-                # Log the event for debugging in terminal (further debugging available in mcp_debug.log), comment out if not needed
-                # print("🧪 ToolNode executed:", event)
+            # Stream through workflow execution (counting MCP sessions spawned for this request)
+            app = await get_app()
+            with track_session_spawns() as session_spawns:
+                async for event in app.astream(initial_input, stream_mode="values"):
+                    step_count += 1
+                    current_event = event
+                    # Log the event for debugging in terminal (further debugging available in mcp_debug.log), comment out if not needed
+                    # print("🧪 ToolNode executed:", event)
                 
-                if "messages" in event and event["messages"]:
-                    last_message = event["messages"][-1]
+                    if "messages" in event and event["messages"]:
+                        last_message = event["messages"][-1]
                     
-                    # Show different types of steps
-                    if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-                        # Tool call step
-                        tool_names = [tc['name'] for tc in last_message.tool_calls]
-                        async with cl.Step(name=f"🔧 Tool Execution: {', '.join(tool_names)}", type="tool") as tool_step:
-                            tool_step.input = f"Executing tools: {tool_names}"
-                            tool_step.output = "Tools executed successfully"
+                        # Show different types of steps
+                        if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
+                            # Tool call step
+                            tool_names = [tc['name'] for tc in last_message.tool_calls]
+                            async with cl.Step(name=f"🔧 Tool Execution: {', '.join(tool_names)}", type="tool") as tool_step:
+                                tool_step.input = f"Executing tools: {tool_names}"
+                                tool_step.output = "Tools executed successfully"
                     
-                    elif last_message.type == "ai" and last_message.content:
-                        # AI reasoning step
-                        if not (hasattr(last_message, 'tool_calls') and last_message.tool_calls):
-                            async with cl.Step(name="🧠 Orchestrator Response", type="llm") as ai_step:
-                                ai_step.input = "Generating response"
-                                ai_step.output = last_message.content[:200] + ("..." if len(last_message.content) > 200 else "")
+                        elif last_message.type == "ai" and getattr(last_message, "name", None) == "fast_path":
+                            # Answered by the fast path, without the orchestrator
+                            async with cl.Step(name="⚡ Fast Path Answer", type="tool") as fast_step:
+                                fast_step.input = user_query
+                                fast_step.output = last_message.content
+
+                        elif last_message.type == "ai" and last_message.content:
+                            # AI reasoning step
+                            if not (hasattr(last_message, 'tool_calls') and last_message.tool_calls):
+                                async with cl.Step(name="🧠 Orchestrator Response", type="llm") as ai_step:
+                                    ai_step.input = "Generating response"
+                                    ai_step.output = last_message.content[:200] + ("..." if len(last_message.content) > 200 else "")
                     
-                    elif last_message.type == "tool":
-                        # Tool result step
-                        async with cl.Step(name="📊 Tool Result", type="tool") as result_step:
-                            result_step.input = f"Tool: {getattr(last_message, 'name', 'Unknown')}"
-                            result_step.output = last_message.content[:200] + ("..." if len(last_message.content) > 200 else "")
+                        elif last_message.type == "tool":
+                            # Tool result steps, one per sub-agent call of the turn (in call order)
+                            tool_messages = []
+                            for tool_message in reversed(event["messages"]):
+                                if tool_message.type != "tool":
+                                    break
+                                tool_messages.insert(0, tool_message)
+                            for tool_message in tool_messages:
+                                async with cl.Step(name="📊 Tool Result", type="tool") as result_step:
+                                    result_step.input = f"Tool: {getattr(tool_message, 'name', 'Unknown')}"
+                                    result_step.output = tool_message.content[:200] + ("..." if len(tool_message.content) > 200 else "")
+            logger.debug(f"MCP sessions spawned for this request: {session_spawns.spawned} (pool: {get_session_pool_metrics()})")
+            logger.debug(f"Fast path: {get_fast_path_stats()}")
+            logger.debug(f"Sub-agent dispatch: {get_dispatch_stats()}")
             
             # Extract final answer after workflow completes 
             final_answer = "No answer found or an error occurred."
@@ -285,6 +369,8 @@ async def main(message: cl.Message):
                         final_answer = message.content
                         break
             
+            # Content passed by handle is inserted only now, once
+            final_answer = await expand_content_refs(final_answer, read_content)
             workflow_step.output = f"Workflow completed in {step_count} steps"
         
         # Send final answer
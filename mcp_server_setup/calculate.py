@@ -2,13 +2,12 @@
 Modular calculation functions for use in a multi-agent system (e.g., Langchain MCP agents)
 This toolkit is intended to be used by agents parsing raw text from sources like Wikipedia.
 """
-from dateutil import parser as date_parser
 from datetime import datetime
-from pint import UnitRegistry
+import numpy as np
 import statistics
-import sympy as sp
 import re
-from typing import List, Union, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple, Union, Optional
 import sys
 import os
 
@@ -16,30 +15,69 @@ import os
 # This allows importing from siblings of mcp_server_setup directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-ureg = UnitRegistry()
+from mcp_server_setup.safe_eval import compile_expression
+
+# pint's parsed unit definitions are cached on disk (":auto:" = the user cache directory, "" disables)
+UNIT_CACHE_FOLDER = os.getenv("PINT_CACHE_FOLDER", ":auto:")
+
+_ureg = None
 
 # === UNIT CONVERSION ===
+def get_unit_registry():
+    """The unit registry, created on first use (loading pint and its definitions takes about a second)."""
+    global _ureg
+    if _ureg is None:
+        from pint import UnitRegistry
+        try:
+            _ureg = UnitRegistry(cache_folder=UNIT_CACHE_FOLDER or None)
+        except Exception:  # e.g. unwritable cache folder
+            _ureg = UnitRegistry()
+    return _ureg
+
+@lru_cache(maxsize=256)
+def _conversion(from_unit: str, to_unit: str) -> Tuple[float, float, str]:
+    """(factor, offset, target unit name) with `value from_unit == value * factor + offset to_unit`.
+
+    The offset is non-zero only for units with a different zero point (e.g. degC to degF).
+    """
+    ureg = get_unit_registry()
+    source = ureg(from_unit)  # may carry a magnitude, e.g. "1000 m"
+    zero = ureg.Quantity(0, source.units).to(to_unit)
+    one = ureg.Quantity(1, source.units).to(to_unit)
+    return (one.magnitude - zero.magnitude) * source.magnitude, zero.magnitude, str(one.units)
+
 def convert_units(value: float, from_unit: str, to_unit: str) -> str:
     try:
-        quantity = value * ureg(from_unit)
-        converted = quantity.to(to_unit)
-        return f"{converted.magnitude:.4g} {converted.units}"
+        factor, offset, unit = _conversion(from_unit, to_unit)
+        return f"{value * factor + offset:.4g} {unit}"
     except Exception as e:
         return f"Conversion error: {str(e)}"
 
+def convert_units_many(values: List[float], from_unit: str, to_unit: str) -> Dict[str, Union[List[float], str]]:
+    """Convert many values between the same two units with one (cached) conversion factor."""
+    try:
+        factor, offset, unit = _conversion(from_unit, to_unit)
+    except Exception as e:
+        return {"error": f"Conversion error: {str(e)}"}
+    return {"values": (np.asarray(values, dtype=np.float64) * factor + offset).tolist(), "unit": unit}
+
 # === TIME DELTA CALCULATIONS ===
+def _parse_date(date_str: str) -> datetime:
+    from dateutil import parser as date_parser  # imported on first use, it is not needed at startup
+    return date_parser.parse(date_str)
+
 def calculate_years_between(start_date_str: str, end_date_str: str) -> Union[int, str]:
     try:
-        start = date_parser.parse(start_date_str)
-        end = date_parser.parse(end_date_str)
+        start = _parse_date(start_date_str)
+        end = _parse_date(end_date_str)
         return round((end - start).days / 365.25)
     except Exception as e:
         return f"Date parsing error: {str(e)}"
 
 def calculate_days_between(start_date_str: str, end_date_str: str) -> Union[int, str]:
     try:
-        start = date_parser.parse(start_date_str)
-        end = date_parser.parse(end_date_str)
+        start = _parse_date(start_date_str)
+        end = _parse_date(end_date_str)
         return (end - start).days
     except Exception as e:
         return f"Date parsing error: {str(e)}"
@@ -57,18 +95,123 @@ def calculate_std_dev(values: List[float]) -> float:
 def calculate_range(values: List[float]) -> float:
     return max(values) - min(values)
 
+# === DESCRIPTIVE STATISTICS (one call, one pass) ===
+DEFAULT_PERCENTILES = (25.0, 50.0, 75.0)
+
+class RunningStats:
+    """Count, mean, variance, min and max over data arriving in chunks, in one pass.
+
+    Each chunk is reduced with numpy and merged into the running moments with the
+    parallel form of Welford's algorithm (Chan et al.), which stays numerically
+    stable for long streams and large offsets. Memory does not grow with the data.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sum = 0.0
+
+    def update(self, chunk: Union[float, Sequence[float], np.ndarray]):
+        """Add a number or a chunk of numbers."""
+        values = np.atleast_1d(np.asarray(chunk, dtype=np.float64)).ravel()
+        n = values.size
+        if n == 0:
+            return
+        chunk_sum = float(values.sum())
+        chunk_mean = chunk_sum / n
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.sum += chunk_sum
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def result(self) -> Dict[str, Optional[float]]:
+        """The statistics so far; variance and std are sample statistics (None below two values)."""
+        variance = self.m2 / (self.count - 1) if self.count > 1 else None
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "variance": variance,
+            "std": variance ** 0.5 if variance is not None else None,
+            "min": self.min,
+            "max": self.max,
+            "range": self.max - self.min,
+        }
+
+def _percentile_key(q: float) -> str:
+    return f"p{q:g}"
+
+def describe_numbers(values: List[float], percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> dict:
+    """Count, sum, mean, median, sample variance and std, min, max, range and percentiles in one call.
+
+    The data is converted to a numpy array once and every statistic is computed
+    vectorized; percentiles use linear interpolation (like statistics.median).
+    """
+    data = np.asarray(values, dtype=np.float64).ravel()
+    if data.size == 0:
+        return {"error": "No numbers provided."}
+    if any(not 0 <= q <= 100 for q in percentiles):
+        return {"error": "Percentiles must be between 0 and 100."}
+
+    quantiles = np.percentile(data, [50.0, *percentiles])
+    minimum, maximum = float(data.min()), float(data.max())
+    variance = float(data.var(ddof=1)) if data.size > 1 else None
+    return {
+        "count": int(data.size),
+        "sum": float(data.sum()),
+        "mean": float(data.mean()),
+        "median": float(quantiles[0]),
+        "variance": variance,
+        "std": variance ** 0.5 if variance is not None else None,
+        "min": minimum,
+        "max": maximum,
+        "range": maximum - minimum,
+        "percentiles": {_percentile_key(q): float(v) for q, v in zip(percentiles, quantiles[1:])},
+    }
+
+def describe_number_stream(chunks: Iterable[Union[float, Sequence[float], np.ndarray]]) -> dict:
+    """Statistics of streamed or chunked data in one pass with constant memory (see RunningStats).
+
+    Median and percentiles need all values and are not part of the result.
+    """
+    stats = RunningStats()
+    for chunk in chunks:
+        stats.update(chunk)
+    if stats.count == 0:
+        return {"error": "No numbers provided."}
+    return stats.result()
+
 # === BASIC ARITHMETIC EXPRESSION EVALUATOR ===
-def evaluate_expression(expr: str) -> Union[float, str]:
-    """Evaluate simple math expressions from text like '3 + 4 * (2 - 1)'"""
+def evaluate_expression(expr: str, variables: Optional[Dict[str, Union[float, List[float]]]] = None
+                        ) -> Union[float, List[float], str]:
+    """Evaluate math expressions from text like '3 + 4 * (2 - 1)' or 'a * x**2' (see safe_eval.py).
+
+    Variables bound to lists are evaluated element-wise in one call. Text around
+    a plain arithmetic expression (e.g. 'What is 3 + 4?') is stripped.
+    """
     try:
-        expr_clean = re.sub(r"[^0-9\+\-\*/\(\)\. ]", "", expr)
-        result = eval(expr_clean)
-        return result
+        try:
+            compiled = compile_expression(expr)
+        except SyntaxError:
+            if variables:
+                raise
+            compiled = compile_expression(re.sub(r"[^0-9\+\-\*/\(\)\. ]", "", expr))
+        return compiled.evaluate(variables)
     except Exception as e:
         return f"Evaluation error: {str(e)}"
 
 # === SYMBOLIC SOLVER (e.g., physics equations) ===
 def solve_equation(equation_str: str, target_var: str) -> Union[str, float]:
+    import sympy as sp  # only needed in the solver workers (see solver_pool.py)
     try:
         lhs, rhs = equation_str.split("=")
         lhs_expr = sp.sympify(lhs)
@@ -78,10 +221,21 @@ def solve_equation(equation_str: str, target_var: str) -> Union[str, float]:
     except Exception as e:
         return f"Equation solving error: {str(e)}"
 
+def canonical_equation(equation_str: str, target_var: str) -> Optional[str]:
+    """Canonical form of an equation and target variable, equal for equations that only differ in how
+    the terms are written or on which side they stand (e.g. 'x + 1 = 3' and '3 = 1 + x'); None if unparsable."""
+    import sympy as sp
+    try:
+        lhs, rhs = equation_str.split("=")
+        difference = sp.expand(sp.sympify(lhs) - sp.sympify(rhs))
+        return f"{min(sp.srepr(difference), sp.srepr(-difference))}|{target_var}"
+    except Exception:
+        return None
+
 # === HUMAN AGE CALCULATOR ===
 def calculate_age(birth_date_str: str) -> Union[int, str]:
     try:
-        birth = date_parser.parse(birth_date_str)
+        birth = _parse_date(birth_date_str)
         today = datetime.now()
         return round((today - birth).days / 365.25)
     except Exception as e:
@@ -0,0 +1,118 @@
+"""Store of large tool results that are passed around by handle instead of by value.
+
+A handle is a short string such as "wiki:9752/7" (section 7 of page 9752)
+that tools return together with a short preview. Agents pass the handle on
+and read (a slice of) the content only where they need it; an answer can
+reference content as "[[content:<handle>]]", which is expanded once, right
+before it is shown to the user.
+
+Handles name their content ("<scheme>:<reference>"), so every process can
+resolve them: a handle whose content is not in this process's store is handed
+to the resolver registered for its scheme (e.g. the Wikipedia page model, which
+is backed by the on-disk cache). Resolved content is kept in an LRU bounded
+by its total length.
+
+Configuration (environment variables):
+    CONTENT_STORE_MAX_CHARS   total length of the content kept in memory (default 5000000)
+    CONTENT_PREVIEW_CHARS     length of the preview returned with a handle (default 300)
+"""
+import logging
+import os
+import re
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+MAX_CHARS = int(os.getenv("CONTENT_STORE_MAX_CHARS", "5000000"))
+PREVIEW_CHARS = int(os.getenv("CONTENT_PREVIEW_CHARS", "300"))
+
+# Reference to stored content inside an answer text
+CONTENT_REF_RE = re.compile(r"\[\[content:([a-z]+:[^\]\s]+)\]\]")
+
+Resolver = Callable[[str], Awaitable[Optional[str]]]
+
+logger = logging.getLogger(__name__)
+
+
+def preview(text: str, max_chars: int = PREVIEW_CHARS) -> str:
+    """Beginning of `text`, cut at a word boundary and marked with "..." if shortened."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip() + " ..."
+
+
+class ContentStore:
+    """LRU of content by handle, with per-scheme resolvers for handles it does not hold."""
+
+    def __init__(self, max_chars: int = MAX_CHARS):
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._resolvers: Dict[str, Resolver] = {}
+        self.stats = {"handles": 0, "hits": 0, "resolved": 0, "unresolved": 0, "evictions": 0, "chars_read": 0}
+
+    def register_resolver(self, scheme: str, resolver: Resolver):
+        """Resolve handles "<scheme>:..." that are not in the store with `resolver(handle)`."""
+        self._resolvers[scheme] = resolver
+
+    def put(self, handle: str, text: str) -> str:
+        """Keep `text` under `handle` (the string is referenced, not copied) and return the handle."""
+        old = self._entries.pop(handle, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[handle] = text
+        self._size += len(text)
+        self.stats["handles"] += 1
+        # The newest entry stays even if it alone exceeds the limit
+        while self._size > self.max_chars and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.stats["evictions"] += 1
+        return handle
+
+    async def get(self, handle: str) -> Optional[str]:
+        """Return the content of `handle`, resolving (and storing) it if needed; None if unknown."""
+        text = self._entries.get(handle)
+        if text is not None:
+            self._entries.move_to_end(handle)
+            self.stats["hits"] += 1
+            return text
+        resolver = self._resolvers.get(handle.partition(":")[0])
+        text = await resolver(handle) if resolver is not None else None
+        if text is None:
+            self.stats["unresolved"] += 1
+            return None
+        self.stats["resolved"] += 1
+        self.put(handle, text)
+        return text
+
+    async def describe(self, handle: str) -> Optional[dict]:
+        """Handle, length and preview of the content of `handle`, or None if unknown."""
+        text = await self.get(handle)
+        if text is None:
+            return None
+        return {"handle": handle, "chars": len(text), "preview": preview(text)}
+
+    @property
+    def size(self) -> int:
+        """Total length of the content held in memory."""
+        return self._size
+
+
+async def expand_content_refs(text: str, read: Callable[[str], Awaitable[str]]) -> str:
+    """Replace every "[[content:<handle>]]" in `text` with `await read(handle)`.
+
+    A handle that cannot be read (e.g. expired, or the read failed) is replaced
+    by a short note; the rest of the text is still expanded.
+    """
+    handles = list(dict.fromkeys(CONTENT_REF_RE.findall(text)))
+    if not handles:
+        return text
+    contents = {}
+    for handle in handles:
+        try:
+            contents[handle] = await read(handle)
+        except Exception as e:
+            logger.warning(f"Could not expand content handle {handle}: {e!r}")
+            contents[handle] = f"[content {handle} could not be retrieved]"
+    return CONTENT_REF_RE.sub(lambda match: contents[match.group(1)], text)
@@ -1,12 +1,46 @@
+import os
 from pathlib import Path
+from dotenv import load_dotenv
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
+load_dotenv()
+
 mcp_path = Path(__file__).parent / "mcp_tools_server.py"
 
+SERVER_NAME = "MCP-Server-Tools"
+
+# "stdio" starts a private server subprocess; "streamable_http" and "sse" connect
+# to a shared, long-running server (python mcp_tools_server.py --transport streamable-http)
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio").replace("-", "_")
+
+DEFAULT_SERVER_URLS = {
+    "streamable_http": "http://localhost:8050/mcp/",
+    "sse": "http://localhost:8050/sse",
+}
+
+def build_connection(transport: str = MCP_TRANSPORT) -> dict:
+    """
+    Build the connection config of the tool server for the given transport.
+
+    Args:
+        transport: "stdio", "streamable_http" or "sse"
+
+    Returns:
+        Connection dictionary for MultiServerMCPClient
+    """
+    if transport == "stdio":
+        return {
+            "command": "python",
+            "args": [str(mcp_path)],
+            "transport": "stdio",
+        }
+    if transport in DEFAULT_SERVER_URLS:
+        return {
+            "url": os.getenv("MCP_SERVER_URL", DEFAULT_SERVER_URLS[transport]),
+            "transport": transport,
+        }
+    raise ValueError(f"Unknown MCP transport '{transport}', expected one of {['stdio', *DEFAULT_SERVER_URLS]}")
+
 client = MultiServerMCPClient({
-    "MCP-Server-Tools": {
-        "command": "python",
-        "args": [str(mcp_path)],
-        "transport": "stdio",
-    }
+    SERVER_NAME: build_connection(),
 })
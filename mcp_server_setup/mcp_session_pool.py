@@ -0,0 +1,223 @@
+"""Long-lived, pooled MCP client sessions.
+
+Every session is a running MCP server connection (for stdio: one subprocess).
+Sessions are started on demand, kept open, health-checked with a ping when
+they have been idle for a while and reused across tool calls, so steady-state
+tool calls do not spawn any new server process.
+
+Pool sizing is configured through environment variables:
+    MCP_POOL_MAX_SESSIONS         maximum number of concurrent sessions (default 4)
+    MCP_POOL_HEALTHCHECK_INTERVAL idle seconds before a session is pinged again (default 30)
+    MCP_POOL_HEALTHCHECK_TIMEOUT  seconds to wait for a ping response (default 5)
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp import ClientSession
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSIONS = int(os.getenv("MCP_POOL_MAX_SESSIONS", "4"))
+HEALTHCHECK_INTERVAL = float(os.getenv("MCP_POOL_HEALTHCHECK_INTERVAL", "30"))
+HEALTHCHECK_TIMEOUT = float(os.getenv("MCP_POOL_HEALTHCHECK_TIMEOUT", "5"))
+
+# Per-request spawn counter, set by `track_session_spawns`
+_request_spawns: contextvars.ContextVar["SpawnCounter | None"] = contextvars.ContextVar(
+    "mcp_request_spawns", default=None
+)
+
+
+@dataclass
+class SpawnCounter:
+    """Number of MCP sessions spawned while handling one request."""
+    spawned: int = 0
+
+
+@contextmanager
+def track_session_spawns():
+    """Count the MCP sessions spawned within this context (and its child tasks).
+
+    Example:
+        with track_session_spawns() as counter:
+            await app.ainvoke(...)
+        print(counter.spawned)  # 0 in steady state
+    """
+    counter = SpawnCounter()
+    token = _request_spawns.set(counter)
+    try:
+        yield counter
+    finally:
+        _request_spawns.reset(token)
+
+
+class _PooledSession:
+    """A session kept open by a background task until `close` is called."""
+
+    def __init__(self, session: ClientSession, task: asyncio.Task, stop: asyncio.Event):
+        self.session = session
+        self.task = task
+        self.stop = stop
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return not self.task.done()
+
+    async def close(self):
+        self.stop.set()
+        try:
+            await self.task
+        except BaseException as e:  # the transport may already be gone
+            logger.debug(f"MCP session closed with error: {e!r}")
+
+
+class MCPSessionPool:
+    """Pool of initialized MCP sessions for one server, bound to one event loop."""
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str, max_sessions: int = MAX_SESSIONS):
+        self._client = client
+        self._server_name = server_name
+        self._max_sessions = max(1, max_sessions)
+        self._slots = asyncio.Semaphore(self._max_sessions)
+        self._idle: list[_PooledSession] = []
+        self._open: set[_PooledSession] = set()
+        self.metrics = {"spawned": 0, "reused": 0, "health_check_failures": 0, "discarded": 0}
+
+    @property
+    def size(self) -> int:
+        """Number of currently open sessions."""
+        return len(self._open)
+
+    async def _spawn(self) -> _PooledSession:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        stop = asyncio.Event()
+
+        async def hold_session():
+            # The session context must be entered and exited by the same task
+            try:
+                async with self._client.session(self._server_name) as session:
+                    ready.set_result(session)
+                    await stop.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    logger.info(f"MCP session for '{self._server_name}' terminated: {e!r}")
+
+        task = loop.create_task(hold_session())
+        # Wait for the session or for the end of the holder task, whichever comes first: a holder
+        # that is cancelled (or dies) before the session is ready never resolves `ready`
+        try:
+            await asyncio.wait({ready, task}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            task.cancel()
+            raise
+        if not ready.done():
+            ready.cancel()
+            error = None if task.cancelled() else task.exception()
+            raise error or RuntimeError(f"MCP session for '{self._server_name}' was cancelled during startup")
+        session = ready.result()
+        pooled = _PooledSession(session, task, stop)
+        self._open.add(pooled)
+
+        self.metrics["spawned"] += 1
+        counter = _request_spawns.get()
+        if counter is not None:
+            counter.spawned += 1
+        logger.info(f"Spawned MCP session for '{self._server_name}' ({self.size}/{self._max_sessions} open).")
+        return pooled
+
+    async def _is_healthy(self, pooled: _PooledSession) -> bool:
+        if not pooled.alive:
+            return False
+        if time.monotonic() - pooled.last_used < HEALTHCHECK_INTERVAL:
+            return True
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), timeout=HEALTHCHECK_TIMEOUT)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP session health check failed: {e!r}")
+            self.metrics["health_check_failures"] += 1
+            return False
+
+    async def _discard(self, pooled: _PooledSession):
+        self._open.discard(pooled)
+        self.metrics["discarded"] += 1
+        await pooled.close()
+
+    async def _checkout(self) -> _PooledSession:
+        while self._idle:
+            # LIFO: the most recently used session is the least likely to be stale
+            pooled = self._idle.pop()
+            if await self._is_healthy(pooled):
+                self.metrics["reused"] += 1
+                return pooled
+            await self._discard(pooled)
+        return await self._spawn()
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow an initialized `ClientSession` from the pool.
+
+        Blocks while `max_sessions` sessions are in use. Sessions whose
+        transport died while borrowed are discarded instead of returned.
+        """
+        async with self._slots:
+            pooled = await self._checkout()
+            try:
+                yield pooled.session
+            finally:
+                pooled.last_used = time.monotonic()
+                if pooled.alive:
+                    self._idle.append(pooled)
+                else:
+                    await self._discard(pooled)
+
+    async def warm_up(self, n: int = 1):
+        """Start sessions ahead of time so the first request does not pay for it."""
+        while len(self._idle) < min(n, self._max_sessions) and self.size < self._max_sessions:
+            self._idle.append(await self._spawn())
+
+    async def close(self):
+        """Close every session in the pool."""
+        self._idle.clear()
+        open_sessions, self._open = list(self._open), set()
+        await asyncio.gather(*(pooled.close() for pooled in open_sessions))
+
+
+# One pool per (event loop, server): sessions cannot be shared across loops. A pool references its
+# loop (through its tasks), so the entry cannot be a weak one; it is removed, and its sessions are
+# closed, when the loop shuts down (see _close_pools_at_shutdown).
+_pools: "dict[asyncio.AbstractEventLoop, dict[str, MCPSessionPool]]" = {}
+_shutdown_guards: "set[asyncio.Task]" = set()
+
+
+async def _close_pools_at_shutdown(loop: asyncio.AbstractEventLoop):
+    """Wait until cancelled, which asyncio.run (and Chainlit/uvicorn) does to all tasks at loop shutdown."""
+    try:
+        await loop.create_future()
+    finally:
+        loop_pools = _pools.pop(loop, {})
+        await asyncio.gather(*(pool.close() for pool in loop_pools.values()), return_exceptions=True)
+        logger.debug(f"Closed {len(loop_pools)} MCP session pool(s) of a finished event loop.")
+
+
+def get_session_pool(client: MultiServerMCPClient, server_name: str) -> MCPSessionPool:
+    """Return the session pool of `server_name` for the running event loop."""
+    loop = asyncio.get_running_loop()
+    loop_pools = _pools.get(loop)
+    if loop_pools is None:
+        loop_pools = _pools[loop] = {}
+        guard = loop.create_task(_close_pools_at_shutdown(loop))
+        _shutdown_guards.add(guard)
+        guard.add_done_callback(_shutdown_guards.discard)
+    if server_name not in loop_pools:
+        loop_pools[server_name] = MCPSessionPool(client, server_name)
+    return loop_pools[server_name]
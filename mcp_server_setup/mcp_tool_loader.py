@@ -1,20 +1,64 @@
-# from mcp_server_setup.mcp_client import client
-from mcp_server_setup.mcp_client import client
+import logging
+
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp_server_setup.mcp_client import client, SERVER_NAME
+from mcp_server_setup.mcp_session_pool import get_session_pool
+from mcp_server_setup.tool_registry import registry
+
+logger = logging.getLogger(__name__)
+
+# Tool definitions are plain data and only listed once per process
+_tool_definitions = None
+
+
+class _PooledSessionProxy:
+    """Stands in for a `ClientSession`: every tool call borrows a pooled session."""
+
+    async def call_tool(self, name, arguments):
+        async with get_session_pool(client, SERVER_NAME).acquire() as session:
+            return await session.call_tool(name, arguments)
+
+
+_session_proxy = _PooledSessionProxy()
+
+
+async def _list_tool_definitions():
+    global _tool_definitions
+    if _tool_definitions is None:
+        async with get_session_pool(client, SERVER_NAME).acquire() as session:
+            _tool_definitions = (await session.list_tools()).tools
+    return _tool_definitions
+
 
 # asynchroneous function to get (subset of )MCP tools
 async def get_mcp_tools(allowed_tool_names: list[str]):
     """
-    Get a subset of MCP tools from the MCP server based on allowed tool names.
+    Get a subset of MCP tools based on allowed tool names.
+    Tools with a "local" binding in the tool registry are called in-process;
+    all others run on pooled, long-lived MCP sessions.
 
     Args:
         allowed_tool_names: List of tool names (str) to include.
 
     Returns:
-        List of MCP tools matching the given names.
+        List of tools matching the given names.
     """
-    all_tools = await client.get_tools()
+    local_tools = [registry.langchain_tool(name) for name in allowed_tool_names if registry.is_local(name)]
+    remote_names = [name for name in allowed_tool_names if not registry.is_local(name)]
+
+    remote_tools = []
+    if remote_names:
+        all_tools = await _list_tool_definitions()
+        remote_tools = [
+            convert_mcp_tool_to_langchain_tool(_session_proxy, tool)
+            for tool in all_tools if tool.name in remote_names
+        ]
+
+    logger.debug(f"Tools loaded: {len(local_tools)} in-process, {len(remote_tools)} via MCP.")
+    return local_tools + remote_tools
+
 
-    filtered_tools = [tool for tool in all_tools if tool.name in allowed_tool_names]
-    
-    # print(f"MCP Tools loaded. Returning {len(filtered_tools)} of {len(all_tools)} tools.")
-    return filtered_tools
\ No newline at end of file
+def get_session_pool_metrics() -> dict:
+    """Return the session pool counters (spawned, reused, ...) of the running event loop."""
+    pool = get_session_pool(client, SERVER_NAME)
+    return {**pool.metrics, "open_sessions": pool.size}
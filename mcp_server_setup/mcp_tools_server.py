@@ -1,27 +1,19 @@
 """Tool wrappers for MCP integration with proper type hints."""
 from mcp.server.fastmcp import FastMCP
-from typing import List, Dict, Union, Tuple, Optional
+from typing import Optional
+import sys
+import os
 
-"""Calculate tools imports"""
-# Use relative import to refer to the local calculate.py file
-from calculate import (
-    convert_units, add, subtract, multiply, divide,
-    calculate_years_between, calculate_days_between, calculate_mean,
-    calculate_median, calculate_std_dev, calculate_range,
-    evaluate_expression, solve_equation, calculate_age,
-    count_word_occurrences, estimate_reading_time,
-    kg_to_lb, lb_to_kg, miles_to_km, km_to_miles
-)
+# Make the project root importable when started as a script (python mcp_tools_server.py)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-"""Wiki-search tool imports"""
-from wiki_search import (
-    search_wikipedia, get_wikipedia_content, clean_page_html,
-    get_page_sections, get_section_content, get_multiple_sections_content
-)
+"""Calculate and Wiki-search tools (shared with the in-process agents)"""
+from mcp_server_setup.tool_registry import registry
 
 import logging
-import os
-from langchain_google_genai import ChatGoogleGenerativeAI
+from pathlib import Path
 from dotenv import load_dotenv
 import re
 import json
@@ -30,12 +22,20 @@ from update_user_profile import update_user_profile
 # Load environment variables
 load_dotenv()
 
-# Setup Gemini 2.0 Flash Lite Model (ensure GOOGLE_API_KEY is in your .env)
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash-lite",
-    timeout=30.0,
-    temperature=0.0,
-)
+# Gemini 2.0 Flash Lite Model (ensure GOOGLE_API_KEY is in your .env), created on first use:
+# langchain_google_genai takes seconds to import and is only needed for the profile extraction
+_llm = None
+
+def get_llm():
+    global _llm
+    if _llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        _llm = ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash-lite",
+            timeout=30.0,
+            temperature=0.0,
+        )
+    return _llm
 
 # Set up logging
 log_file_path = os.path.join(os.getcwd(), "mcp_debug.log")
@@ -51,171 +51,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.info("Logging initialized.")
 # Create a MCP server instance
+# (host/port are only used by the network transports "sse" and "streamable-http")
 mcp = FastMCP(
     name = "MCP-Tool-Server",
     description = "A server for various tools.",
-    host = "0.0.0.0",
-    port = 8050,
+    host = os.getenv("MCP_SERVER_HOST", "0.0.0.0"),
+    port = int(os.getenv("MCP_SERVER_PORT", "8050")),
 )
 
 # ==============================================================================
-#                               Calculate Tools
+#                       Calculate and Wiki-Search Tools
 # ==============================================================================
-@mcp.tool()
-async def add_tool(numbers: list[float]) -> float:
-    """Add a list of numbers together.
-    
-    Args:
-        numbers: List of numbers to add
-    
-    Returns:
-        Sum of all numbers
-    """
-    return add(numbers)
-
-@mcp.tool()
-async def subtract_tool(minuend: float, subtrahend: float) -> float:
-    """Subtract one number from another.
-    
-    Args:
-        minuend: Number to subtract from
-        subtrahend: Number to subtract
-    
-    Returns:
-        Result of subtraction
-    """
-    return subtract(minuend, subtrahend)
-
-@mcp.tool()
-async def multiply_tool(numbers: list[float]) -> float:
-    """Multiply a list of numbers together.
-    
-    Args:
-        numbers: List of numbers to multiply
-    
-    Returns:
-        Product of all numbers
-    """
-    return multiply(numbers)
-
-@mcp.tool()
-async def divide_tool(dividend: float, divisor: float) -> float:
-    """Divide one number by another."""
-    return divide(dividend, divisor)
-
-# Unit conversion tools
-@mcp.tool()
-async def convert_units_tool(value: float, from_unit: str, to_unit: str) -> float:
-    """Convert between different units of measurement."""
-    return convert_units(value, from_unit, to_unit)
-
-@mcp.tool()
-async def kg_to_lb_tool(kg: float) -> float:
-    """Convert kilograms to pounds."""
-    return kg_to_lb(kg)
-
-@mcp.tool()
-async def lb_to_kg_tool(lb: float) -> float:
-    """Convert pounds to kilograms."""
-    return lb_to_kg(lb)
-
-@mcp.tool()
-async def miles_to_km_tool(miles: float) -> float:
-    """Convert miles to kilometers."""
-    return miles_to_km(miles)
-
-@mcp.tool()
-async def km_to_miles_tool(km: float) -> float:
-    """Convert kilometers to miles."""
-    return km_to_miles(km)
-
-# Statistical tools
-@mcp.tool()
-async def calculate_mean_tool(numbers: List[float]) -> float:
-    """Calculate the arithmetic mean of a list of numbers.
-    
-    Args:
-        numbers: List of numbers to calculate mean from
-    
-    Returns:
-        The arithmetic mean
-    """
-    return calculate_mean(numbers)
-
-@mcp.tool()
-async def calculate_median_tool(numbers: List[float]) -> float:
-    """Calculate the median of a list of numbers.
-    
-    Args:
-        numbers: List of numbers to calculate median from
-    
-    Returns:
-        The median value
-    """
-    return calculate_median(numbers)
-
-@mcp.tool()
-async def calculate_std_dev_tool(numbers: List[float]) -> float:
-    """Calculate the standard deviation of a list of numbers.
-    
-    Args:
-        numbers: List of numbers to calculate standard deviation from
-    
-    Returns:
-        The standard deviation
-    """
-    return calculate_std_dev(numbers)
-
-@mcp.tool()
-async def calculate_range_tool(numbers: List[float]) -> float:
-    """Calculate the range (max - min) of a list of numbers.
-    
-    Args:
-        numbers: List of numbers to calculate range from
-    
-    Returns:
-        The range value
-    """
-    return calculate_range(numbers)
-
-# Date and time tools
-@mcp.tool()
-async def calculate_years_between_tool(start_date_str: str, end_date_str: str) -> int:
-    """Calculate the number of years between two dates."""
-    return calculate_years_between(start_date_str, end_date_str)
-
-@mcp.tool()
-async def calculate_days_between_tool(start_date_str: str, end_date_str: str) -> int:
-    """Calculate the number of days between two dates."""
-    return calculate_days_between(start_date_str, end_date_str)
-
-@mcp.tool()
-async def calculate_age_tool(birth_date_str: str) -> int:
-    """Calculate age based on birth date."""
-    return calculate_age(birth_date_str)
-
-# Text analysis tools
-@mcp.tool()
-async def count_word_occurrences_tool(text: str, word: str) -> int:
-    """Count occurrences of a word in text."""
-    return count_word_occurrences(text, word)
-
-@mcp.tool()
-async def estimate_reading_time_tool(text: str, wpm: int = 200) -> float:
-    """Estimate reading time for text in minutes."""
-    return estimate_reading_time(text, wpm)
-
-# Math expression tools
-@mcp.tool()
-async def evaluate_expression_tool(expression: str) -> float:
-    """Evaluate a mathematical expression."""
-    return evaluate_expression(expression)
-
-@mcp.tool()
-async def solve_equation_tool(equation_str: str, target_var: str) -> str:
-    """Solve a symbolic equation for a target variable."""
-    return solve_equation(equation_str, target_var)
+registry.register_mcp(mcp)
 
+# ==============================================================================
+#                               Sub-Agent Tools
+# ==============================================================================
 @mcp.tool()
 async def call_reason_agent(query: str, context: Optional[dict] = None) -> str:
     """
@@ -238,83 +89,6 @@ async def call_reason_agent(query: str, context: Optional[dict] = None) -> str:
     logger.info(f"Orchestrator: MCP-Reason Agent returned: '{result}'")
     return result
 
-# ==============================================================================
-#                               Wiki-Search Tools
-# ==============================================================================
-@mcp.tool()
-async def search_wikipedia_tool(query: str) -> List[Dict[str, Union[str, int]]]:
-    """Search Wikipedia for a query and return relevant article titles and snippets.
-    
-    Args:
-        query: Search query string
-    
-    Returns:
-        List of dictionaries with article info (title, pageid, snippet)
-    """
-    return search_wikipedia(query)
-
-@mcp.tool()
-async def get_wikipedia_content_tool(page_id: int) -> str:
-    """Retrieve the full content of a Wikipedia article by page ID.
-    
-    Args:
-        page_id: Wikipedia page ID
-    
-    Returns:
-        Article content as cleaned text
-    """
-    return get_wikipedia_content(page_id)
-
-@mcp.tool()
-async def get_page_sections_tool(page_id: int) -> Tuple[List[str], Dict[str, str]]:
-    """Get the list of section titles and their indices for a Wikipedia page.
-    
-    Args:
-        page_id: Wikipedia page ID
-    
-    Returns:
-        Tuple of (section titles list, section index dictionary)
-    """
-    return get_page_sections(page_id)
-
-@mcp.tool()
-async def get_section_content_tool(page_id: int, section_index: str) -> str:
-    """Get the content of a specific section from a Wikipedia page.
-    
-    Args:
-        page_id: Wikipedia page ID
-        section_index: Section index string
-    
-    Returns:
-        Section content as cleaned text
-    """
-    return get_section_content(page_id, section_index)
-
-@mcp.tool()
-async def clean_page_html_tool(html_content: str) -> str:
-    """Clean Wikipedia HTML content to extract readable text.
-    
-    Args:
-        html_content: HTML content to clean
-    
-    Returns:
-        Cleaned text content
-    """
-    return clean_page_html(html_content)
-
-@mcp.tool()
-async def get_multiple_sections_content_tool(page_id: int, section_indices: List[str]) -> Dict[str, str]:
-    """Get content from multiple sections of a Wikipedia page in a single call.
-    
-    Args:
-        page_id: Wikipedia page ID
-        section_indices: List of section indices to retrieve
-        
-    Returns:
-        Dictionary mapping section indices to their content
-    """
-    return get_multiple_sections_content(page_id, section_indices)
-
 @mcp.tool()
 async def call_search_agent(query: str, context: Optional[dict] = None) -> str:
     """
@@ -393,7 +167,7 @@ def extract_user_profile_info(message: str, user_id: str = "user_001") -> dict:
 
     prompt = system_prompt.replace("{user_message}", message)
     logger.info(f"Prompting LLM with: {prompt}")
-    response = llm.invoke(prompt)
+    response = get_llm().invoke(prompt)
     logger.info(f"Extracted user profile info: {response}")
     
     cleaned = re.sub(r"```(?:json)?\s*([\s\S]+?)\s*```", r"\1", response.content.strip())
@@ -410,8 +184,58 @@ def extract_user_profile_info(message: str, user_id: str = "user_001") -> dict:
             "raw_response": response.content
         }
 
+# ==============================================================================
+#                               Server Entry Point
+# ==============================================================================
+TRANSPORTS = ["stdio", "sse", "streamable-http"]
+
+def create_http_app():
+    """ASGI app factory for the streamable HTTP transport, imported by every uvicorn worker.
+
+    The server runs stateless so that any worker can answer any request;
+    no MCP session state has to stick to a single worker process.
+    """
+    mcp.settings.stateless_http = True
+    return mcp.streamable_http_app()
+
+def main():
+    """Run the tool server with the transport and worker count from the CLI or environment."""
+    import argparse
+    parser = argparse.ArgumentParser(description="MCP tool server")
+    parser.add_argument("--transport", default=os.getenv("MCP_TRANSPORT", "stdio"),
+                        help="One of: " + ", ".join(TRANSPORTS))
+    parser.add_argument("--host", default=mcp.settings.host)
+    parser.add_argument("--port", type=int, default=mcp.settings.port)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MCP_SERVER_WORKERS", "1")),
+                        help="Number of worker processes (streamable-http only)")
+    args = parser.parse_args()
+
+    # Accept the client-side spelling "streamable_http" as well
+    transport = args.transport.replace("_", "-")
+    if transport not in TRANSPORTS:
+        parser.error(f"Unknown transport '{args.transport}', expected one of {TRANSPORTS}")
+    if args.workers > 1 and transport != "streamable-http":
+        parser.error("Multiple workers are only supported with the 'streamable-http' transport")
+
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    logger.info(f"Starting MCP server (transport={transport}, host={args.host}, port={args.port}, workers={args.workers})")
+
+    if transport == "streamable-http" and args.workers > 1:
+        import uvicorn
+        uvicorn.run(
+            f"{Path(__file__).stem}:create_http_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level=mcp.settings.log_level.lower(),
+        )
+    else:
+        mcp.run(transport=transport)
+
 # to run the server --> mcp dev mcp_tools_server.py (inside of mcp_server_setup folder)
-# or python mcp_tools_server.py
-# run the server (do it from client code for prototype, not here)
+# or python mcp_tools_server.py [--transport streamable-http --port 8050 --workers 4]
+# with stdio, the client starts the server itself (see mcp_client.py)
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""Safe evaluation of arithmetic expressions, compiled once and cached.
+
+An expression is parsed to a Python AST and accepted only if it consists of
+numbers, variables, the constants `pi` and `e`, arithmetic operators and the
+functions in FUNCTIONS. Every operator and function call is rewritten into a
+call of a guard that enforces the limits, and the result is compiled to a code
+object. Compiled expressions are kept in an LRU cache, so evaluating the same
+(or a templated) expression again skips parsing and checking.
+
+Variables are bound per evaluation. Binding a list of numbers evaluates the
+expression for all of them at once (vectorized with numpy, lists of equal
+length are paired element-wise).
+
+Limits: expression length, integer size (e.g. `9**9**9` is rejected before it
+is computed), number of values bound to a variable and evaluation time.
+
+Configuration (environment variables):
+    EXPR_CACHE_SIZE       compiled expressions kept (default 1024)
+    EXPR_MAX_LENGTH       maximum expression length in characters (default 2000)
+    EXPR_MAX_INT_BITS     maximum size of integer results in bits (default 10000)
+    EXPR_MAX_ELEMENTS     maximum number of values bound to one variable (default 10000000)
+    EXPR_TIME_LIMIT       maximum evaluation time in seconds (default 1.0)
+"""
+import ast
+import math
+import operator
+import os
+import time
+from functools import lru_cache, reduce
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+CACHE_SIZE = int(os.getenv("EXPR_CACHE_SIZE", "1024"))
+MAX_LENGTH = int(os.getenv("EXPR_MAX_LENGTH", "2000"))
+MAX_INT_BITS = int(os.getenv("EXPR_MAX_INT_BITS", "10000"))
+MAX_ELEMENTS = int(os.getenv("EXPR_MAX_ELEMENTS", "10000000"))
+TIME_LIMIT = float(os.getenv("EXPR_TIME_LIMIT", "1.0"))
+
+Number = Union[int, float]
+Binding = Union[Number, Sequence[Number]]
+
+
+class ExpressionError(ValueError):
+    """The expression is not allowed, refers to unknown names or exceeds a limit."""
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _log(x, base=None):
+    """Natural logarithm, or the logarithm to `base` (like math.log)."""
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+
+def _minimum(*args):
+    """Element-wise minimum of any number of arguments (like the builtin min of its arguments)."""
+    return reduce(np.minimum, args)
+
+
+def _maximum(*args):
+    """Element-wise maximum of any number of arguments (like the builtin max of its arguments)."""
+    return reduce(np.maximum, args)
+
+
+FUNCTIONS = {
+    "abs": np.abs, "sqrt": np.sqrt, "exp": np.exp,
+    "log": _log, "log10": np.log10, "log2": np.log2,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "floor": np.floor, "ceil": np.ceil, "round": np.round,
+    "min": _minimum, "max": _maximum,
+}
+# Accepted number of arguments (minimum, maximum; None for any number); all other functions take one
+FUNCTION_ARITY = {"log": (1, 2), "round": (1, 2), "min": (1, None), "max": (1, None)}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+_BINARY_BY_NAME = {op.__name__: fn for op, fn in BINARY_OPERATORS.items()}
+_UNARY_BY_NAME = {op.__name__: fn for op, fn in UNARY_OPERATORS.items()}
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class _Guard:
+    """Operator and function calls of one evaluation, checked against the limits."""
+
+    __slots__ = ("deadline",)
+
+    def __init__(self, time_limit: float):
+        self.deadline = time.perf_counter() + time_limit
+
+    def _tick(self):
+        if time.perf_counter() > self.deadline:
+            raise ExpressionError("Time limit exceeded")
+
+    def binary(self, name: str, left, right):
+        self._tick()
+        if _is_int(left) and _is_int(right):
+            if name == "Pow" and right > 0 and abs(left) > 1 and right * math.log2(abs(left)) > MAX_INT_BITS:
+                raise ExpressionError(f"Result of {left}**{right} exceeds {MAX_INT_BITS} bits")
+            if name == "Mult" and left.bit_length() + right.bit_length() > MAX_INT_BITS + 1:
+                raise ExpressionError(f"Product exceeds {MAX_INT_BITS} bits")
+        return _BINARY_BY_NAME[name](left, right)
+
+    def unary(self, name: str, operand):
+        self._tick()
+        return _UNARY_BY_NAME[name](operand)
+
+    def call(self, name: str, *args):
+        self._tick()
+        return FUNCTIONS[name](*args)
+
+
+class _Compiler(ast.NodeTransformer):
+    """Checks an expression AST against the whitelist and routes every operation through the guard."""
+
+    def __init__(self):
+        self.names = set()
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+            raise ExpressionError(f"Unsupported constant: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id.startswith("_") or node.id in FUNCTIONS:
+            raise ExpressionError(f"Invalid name: {node.id}")
+        self.names.add(node.id)
+        return node
+
+    def _guard_call(self, method, name, args, node):
+        call = ast.Call(
+            func=ast.Attribute(value=ast.Name(id="_guard", ctx=ast.Load()), attr=method, ctx=ast.Load()),
+            args=[ast.Constant(value=name), *args],
+            keywords=[],
+        )
+        return ast.copy_location(call, node)
+
+    def visit_BinOp(self, node):
+        if type(node.op) not in BINARY_OPERATORS:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        return self._guard_call("binary", type(node.op).__name__, [self.visit(node.left), self.visit(node.right)], node)
+
+    def visit_UnaryOp(self, node):
+        if type(node.op) not in UNARY_OPERATORS:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        return self._guard_call("unary", type(node.op).__name__, [self.visit(node.operand)], node)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError(f"Unsupported function: {ast.unparse(node.func)}")
+        if node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+            raise ExpressionError(f"Only positional arguments are supported: {node.func.id}")
+        low, high = FUNCTION_ARITY.get(node.func.id, (1, 1))
+        if len(node.args) < low or (high is not None and len(node.args) > high):
+            expected = f"{low} or more" if high is None else str(low) if low == high else f"{low} to {high}"
+            raise ExpressionError(f"{node.func.id}() takes {expected} argument(s), got {len(node.args)}")
+        return self._guard_call("call", node.func.id, [self.visit(arg) for arg in node.args], node)
+
+
+class CompiledExpression:
+    """A checked and compiled expression; `variables` are the names that have to be bound."""
+
+    __slots__ = ("source", "code", "variables")
+
+    def __init__(self, source: str, code, variables: Tuple[str, ...]):
+        self.source = source
+        self.code = code
+        self.variables = variables
+
+    def evaluate(self, bindings: Optional[Dict[str, Binding]] = None, time_limit: float = TIME_LIMIT):
+        """Evaluate with the given variable bindings; list bindings give a list result."""
+        namespace = {"_guard": _Guard(time_limit)}
+        bindings = bindings or {}
+        for name in self.variables:
+            if name in bindings:
+                value = bindings[name]
+            elif name in CONSTANTS:
+                value = CONSTANTS[name]
+            else:
+                raise ExpressionError(f"Unknown variable: {name}")
+            if isinstance(value, (list, tuple, np.ndarray)):
+                value = np.asarray(value, dtype=np.float64)
+                if value.size > MAX_ELEMENTS:
+                    raise ExpressionError(f"Too many values for {name}: {value.size} > {MAX_ELEMENTS}")
+            elif not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ExpressionError(f"Value of {name} is not a number: {value!r}")
+            namespace[name] = value
+
+        with np.errstate(all="raise"):
+            result = eval(self.code, {"__builtins__": {}}, namespace)
+        if isinstance(result, np.ndarray):
+            return result.tolist()
+        if isinstance(result, np.generic):
+            return result.item()
+        return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Check and compile `expression` (cached); raises ExpressionError or SyntaxError."""
+    if len(expression) > MAX_LENGTH:
+        raise ExpressionError(f"Expression longer than {MAX_LENGTH} characters")
+    compiler = _Compiler()
+    tree = ast.fix_missing_locations(compiler.visit(ast.parse(expression.strip(), mode="eval")))
+    return CompiledExpression(expression, compile(tree, "<expression>", "eval"), tuple(sorted(compiler.names)))
+
+
+def evaluate(expression: str, bindings: Optional[Dict[str, Binding]] = None) -> Union[Number, List[Number]]:
+    """Evaluate `expression` with the given variable bindings (see CompiledExpression.evaluate)."""
+    return compile_expression(expression).evaluate(bindings)
+
+
+def get_cache_stats() -> dict:
+    """Hits, misses and size of the compiled-expression cache."""
+    info = compile_expression.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
@@ -0,0 +1,61 @@
+"""Coalescing of identical concurrent async calls ("singleflight").
+
+While a call for a key is in flight, further calls with the same key wait for
+its result instead of starting their own. The shared call runs as a task of
+its own: a cancelled caller does not cancel it for the others, only when every
+caller has been cancelled is the shared call cancelled as well.
+"""
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and hands its result to all concurrent callers."""
+
+    def __init__(self):
+        # In-flight calls per event loop (tasks cannot be awaited from another loop)
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, _Flight]]" = \
+            weakref.WeakKeyDictionary()
+        self.stats = {"calls": 0, "executions": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `fn()`, shared with every concurrent call for `key`."""
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        self.stats["calls"] += 1
+        flight = calls.get(key)
+        if flight is None:
+            self.stats["executions"] += 1
+            flight = calls[key] = _Flight(asyncio.ensure_future(fn()))
+
+            def done(task: asyncio.Task):
+                if key in calls and calls[key].task is task:
+                    del calls[key]
+                if not task.cancelled():
+                    task.exception()  # retrieved even if every caller was cancelled
+
+            flight.task.add_done_callback(done)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of calls that were served by another call's execution."""
+        calls = self.stats["calls"]
+        return 1 - self.stats["executions"] / calls if calls else 0.0
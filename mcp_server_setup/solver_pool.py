@@ -0,0 +1,215 @@
+"""Symbolic equation solving (sympy) in a pool of worker processes, with timeouts and a result cache.
+
+sympy can take seconds or minutes for a hard equation and holds the GIL while
+it works, so solving inline would block the event loop of the server. Each
+solve runs in a worker process instead (`python -m mcp_server_setup.solver_pool`,
+sympy imported once per worker), at most SOLVER_WORKERS at a time. A solve
+that exceeds its timeout, or whose caller is cancelled, kills its worker; a
+fresh one is started on demand.
+
+Results are cached by the canonical form of the equation (see
+calculate.canonical_equation), so repeated and equivalent equations are
+answered without solving again. Identical concurrent solves share one run.
+
+Configuration (environment variables):
+    SOLVER_WORKERS      worker processes, i.e. solves running at once (default 2)
+    SOLVER_TIMEOUT      seconds per solve before it is aborted (default 10)
+    SOLVER_CACHE_SIZE   cached results (default 512)
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+from mcp_server_setup.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKERS = int(os.getenv("SOLVER_WORKERS", "2"))
+TIMEOUT = float(os.getenv("SOLVER_TIMEOUT", "10"))
+CACHE_SIZE = int(os.getenv("SOLVER_CACHE_SIZE", "512"))
+
+
+class WorkerError(RuntimeError):
+    """A worker process died or answered with an error."""
+
+
+class _Worker:
+    """One worker process, answering one JSON request per line on stdin with one JSON line on stdout."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "mcp_server_setup.solver_pool"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=PROJECT_ROOT, text=True, bufsize=1,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def call(self, job: str, *args):
+        """Run `job(*args)` in the worker (blocking)."""
+        try:
+            self.process.stdin.write(json.dumps({"job": job, "args": args}) + "\n")
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+        except (OSError, ValueError) as e:  # pipe closed, e.g. killed after a timeout
+            raise WorkerError(f"Solver worker failed: {e}") from e
+        if not line:
+            raise WorkerError("Solver worker exited")
+        answer = json.loads(line)
+        if "error" in answer:
+            raise WorkerError(answer["error"])
+        return answer["result"]
+
+    def kill(self):
+        self.process.kill()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        self.process.wait()
+
+
+class SolverPool:
+    """Runs sympy solves in worker processes, with per-call timeouts and a cache of the results."""
+
+    def __init__(self, workers: int = WORKERS, timeout: float = TIMEOUT, cache_size: int = CACHE_SIZE):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._idle = []
+        self._lock = threading.Lock()
+        # Bound on running solves per event loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight = SingleFlight()
+        self.stats = {"calls": 0, "cache_hits": 0, "solved": 0, "timeouts": 0, "cancelled": 0, "workers_started": 0}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.workers)
+        return self._semaphores[loop]
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+        self.stats["workers_started"] += 1
+        return _Worker()
+
+    def _checkin(self, worker: _Worker):
+        with self._lock:
+            if worker.alive and len(self._idle) < self.workers:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+    async def _run(self, job: str, *args):
+        """Run a job in a worker; a cancelled (or timed out) job kills its worker."""
+        async with self._semaphore():
+            worker = self._checkout()
+            try:
+                result = await asyncio.to_thread(worker.call, job, *args)
+            except BaseException:
+                worker.kill()
+                raise
+            self._checkin(worker)
+            return result
+
+    def _cached(self, key: str) -> Optional[str]:
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _store(self, result: str, *keys: Optional[str]):
+        for key in filter(None, keys):
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _solve(self, equation_str: str, target_var: str, text_key: str) -> str:
+        canonical = await self._run("canonical_equation", equation_str, target_var)
+        result = self._cached(canonical) if canonical else None
+        if result is not None:
+            self.stats["cache_hits"] += 1
+        else:
+            async def run_solve():
+                self.stats["solved"] += 1
+                return await self._run("solve_equation", equation_str, target_var)
+
+            result = await self._inflight.do(canonical or text_key, run_solve)
+        self._store(result, text_key, canonical)
+        return result
+
+    async def solve(self, equation_str: str, target_var: str, timeout: Optional[float] = None) -> str:
+        """Solve `equation_str` for `target_var` like calculate.solve_equation, without blocking the event loop."""
+        self.stats["calls"] += 1
+        text_key = re.sub(r"\s+", "", equation_str) + "|" + target_var
+        result = self._cached(text_key)
+        if result is not None:
+            self.stats["cache_hits"] += 1
+            return result
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(self._solve(equation_str, target_var, text_key), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            logger.warning(f"Solving '{equation_str}' for {target_var} timed out after {timeout}s.")
+            return f"Equation solving error: no result within {timeout:g} seconds"
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            raise
+        except WorkerError as e:
+            return f"Equation solving error: {e}"
+
+    def close(self):
+        """Stop the idle workers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+
+solver_pool = SolverPool()
+
+
+def get_solver_stats() -> dict:
+    """Return the call, cache and timeout counters of the solver pool."""
+    return dict(solver_pool.stats)
+
+
+def _serve():
+    """Worker process: answer requests from stdin until it is closed."""
+    from mcp_server_setup import calculate
+
+    jobs = {"solve_equation": calculate.solve_equation, "canonical_equation": calculate.canonical_equation}
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            answer = {"result": jobs[request["job"]](*request["args"])}
+        except Exception as e:
+            answer = {"error": f"{type(e).__name__}: {e}"}
+        sys.stdout.write(json.dumps(answer) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    _serve()
@@ -0,0 +1,466 @@
+"""Single source of the tool wrappers shared by the MCP server and the LangChain agents.
+
+Every tool is defined once here and can be bound
+- remotely: registered on the FastMCP server and called over MCP (binding "mcp"), or
+- in-process: called directly as a LangChain tool with the identical schema (binding "local").
+
+The default binding of each tool can be overridden with the TOOL_BINDINGS
+environment variable, e.g. TOOL_BINDINGS="add_tool=mcp,search_wikipedia_tool=local".
+"""
+import asyncio
+import concurrent.futures
+import functools
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Union, Tuple
+
+if TYPE_CHECKING:
+    from langchain_core.tools import BaseTool
+
+from mcp_server_setup.calculate import (
+    convert_units, convert_units_many, add, subtract, multiply, divide,
+    calculate_years_between, calculate_days_between, calculate_mean,
+    calculate_median, calculate_std_dev, calculate_range, describe_numbers, DEFAULT_PERCENTILES,
+    evaluate_expression, calculate_age,
+    count_word_occurrences, estimate_reading_time,
+    kg_to_lb, lb_to_kg, miles_to_km, km_to_miles
+)
+from mcp_server_setup.solver_pool import solver_pool
+from mcp_server_setup.wiki_search import (
+    search_wikipedia, get_wikipedia_content, clean_page_html,
+    get_page_sections, get_section_content, get_multiple_sections_content, prefetch_pages,
+    rank_sections, wiki_lookup, get_content_handle, read_content, CONTENT_MAX_CHARS
+)
+
+BINDINGS = ("local", "mcp")
+
+
+def _sync_wrapper(coroutine_function: Callable) -> Callable:
+    """Sync entry point of an async tool, for `tool.invoke(...)` outside of an event loop."""
+    @functools.wraps(coroutine_function)
+    def func(**kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine_function(**kwargs))
+        # Called from a thread that runs an event loop: run the coroutine in a loop of its own
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine_function(**kwargs)).result()
+    return func
+
+
+@dataclass
+class ToolSpec:
+    name: str
+    func: Callable
+    binding: str  # "local" or "mcp"
+
+
+class ToolRegistry:
+    """Registry of tool definitions that can be bound in-process or over MCP."""
+
+    def __init__(self):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._local_tools: Dict[str, "BaseTool"] = {}
+
+    def tool(self, binding: str = "mcp"):
+        """Decorator registering a tool function with its default binding."""
+        if binding not in BINDINGS:
+            raise ValueError(f"Unknown binding '{binding}', expected one of {BINDINGS}")
+
+        def decorator(func: Callable) -> Callable:
+            self._specs[func.__name__] = ToolSpec(func.__name__, func, binding)
+            return func
+        return decorator
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    @property
+    def specs(self) -> List[ToolSpec]:
+        return list(self._specs.values())
+
+    def apply_overrides(self, overrides: str):
+        """Apply binding overrides of the form "tool_a=local,tool_b=mcp"."""
+        for entry in filter(None, (e.strip() for e in overrides.split(","))):
+            name, _, binding = entry.partition("=")
+            name, binding = name.strip(), binding.strip()
+            if name not in self._specs or binding not in BINDINGS:
+                raise ValueError(f"Invalid tool binding override: '{entry}'")
+            self._specs[name].binding = binding
+
+    def is_local(self, name: str) -> bool:
+        return name in self._specs and self._specs[name].binding == "local"
+
+    def register_mcp(self, mcp):
+        """Register every tool on a FastMCP server (remote binding)."""
+        for spec in self._specs.values():
+            mcp.tool()(spec.func)
+
+    def langchain_tool(self, name: str) -> "BaseTool":
+        """Return the in-process LangChain tool of `name` (same name, schema and description)."""
+        if name not in self._local_tools:
+            # LangChain is only imported by the agents, the MCP server does not need it
+            from langchain_core.tools import StructuredTool
+
+            func = self._specs[name].func
+            if asyncio.iscoroutinefunction(func):
+                self._local_tools[name] = StructuredTool.from_function(
+                    func=_sync_wrapper(func), coroutine=func, name=name)
+            else:
+                async def coroutine(**kwargs):
+                    # pure functions are called inline instead of in an executor thread
+                    return func(**kwargs)
+                self._local_tools[name] = StructuredTool.from_function(func=func, coroutine=coroutine, name=name)
+        return self._local_tools[name]
+
+    def langchain_tools(self) -> List["BaseTool"]:
+        return [self.langchain_tool(name) for name in self._specs]
+
+
+registry = ToolRegistry()
+
+# ==============================================================================
+#                               Calculate Tools
+# ==============================================================================
+@registry.tool(binding="local")
+def add_tool(numbers: list[float]) -> float:
+    """Add a list of numbers together.
+
+    Args:
+        numbers: List of numbers to add
+
+    Returns:
+        Sum of all numbers
+    """
+    return add(numbers)
+
+@registry.tool(binding="local")
+def subtract_tool(minuend: float, subtrahend: float) -> float:
+    """Subtract one number from another.
+
+    Args:
+        minuend: Number to subtract from
+        subtrahend: Number to subtract
+
+    Returns:
+        Result of subtraction
+    """
+    return subtract(minuend, subtrahend)
+
+@registry.tool(binding="local")
+def multiply_tool(numbers: list[float]) -> float:
+    """Multiply a list of numbers together.
+
+    Args:
+        numbers: List of numbers to multiply
+
+    Returns:
+        Product of all numbers
+    """
+    return multiply(numbers)
+
+@registry.tool(binding="local")
+def divide_tool(dividend: float, divisor: float) -> float:
+    """Divide one number by another."""
+    return divide(dividend, divisor)
+
+# Unit conversion tools
+@registry.tool(binding="local")
+def convert_units_tool(value: float, from_unit: str, to_unit: str) -> float:
+    """Convert between different units of measurement."""
+    return convert_units(value, from_unit, to_unit)
+
+@registry.tool(binding="local")
+def convert_units_many_tool(values: List[float], from_unit: str, to_unit: str) -> Dict[str, Union[List[float], str]]:
+    """Convert many values between the same two units in one call.
+
+    Args:
+        values: Values in from_unit
+        from_unit: Unit of the values, e.g. "mile"
+        to_unit: Unit to convert to, e.g. "km"
+
+    Returns:
+        Dictionary with the converted values and the name of the target unit
+    """
+    return convert_units_many(values, from_unit, to_unit)
+
+@registry.tool(binding="local")
+def kg_to_lb_tool(kg: float) -> float:
+    """Convert kilograms to pounds."""
+    return kg_to_lb(kg)
+
+@registry.tool(binding="local")
+def lb_to_kg_tool(lb: float) -> float:
+    """Convert pounds to kilograms."""
+    return lb_to_kg(lb)
+
+@registry.tool(binding="local")
+def miles_to_km_tool(miles: float) -> float:
+    """Convert miles to kilometers."""
+    return miles_to_km(miles)
+
+@registry.tool(binding="local")
+def km_to_miles_tool(km: float) -> float:
+    """Convert kilometers to miles."""
+    return km_to_miles(km)
+
+# Statistical tools
+@registry.tool(binding="local")
+def calculate_mean_tool(numbers: List[float]) -> float:
+    """Calculate the arithmetic mean of a list of numbers.
+
+    Args:
+        numbers: List of numbers to calculate mean from
+
+    Returns:
+        The arithmetic mean
+    """
+    return calculate_mean(numbers)
+
+@registry.tool(binding="local")
+def calculate_median_tool(numbers: List[float]) -> float:
+    """Calculate the median of a list of numbers.
+
+    Args:
+        numbers: List of numbers to calculate median from
+
+    Returns:
+        The median value
+    """
+    return calculate_median(numbers)
+
+@registry.tool(binding="local")
+def calculate_std_dev_tool(numbers: List[float]) -> float:
+    """Calculate the standard deviation of a list of numbers.
+
+    Args:
+        numbers: List of numbers to calculate standard deviation from
+
+    Returns:
+        The standard deviation
+    """
+    return calculate_std_dev(numbers)
+
+@registry.tool(binding="local")
+def calculate_range_tool(numbers: List[float]) -> float:
+    """Calculate the range (max - min) of a list of numbers.
+
+    Args:
+        numbers: List of numbers to calculate range from
+
+    Returns:
+        The range value
+    """
+    return calculate_range(numbers)
+
+@registry.tool(binding="local")
+def describe_numbers_tool(numbers: List[float], percentiles: Optional[List[float]] = None
+                          ) -> Dict[str, Union[int, float, Dict[str, float], None]]:
+    """Describe a list of numbers in one call: count, sum, mean, median, variance, standard deviation,
+    min, max, range and percentiles. Prefer this over several single-statistic tools.
+
+    Args:
+        numbers: List of numbers to describe
+        percentiles: Percentiles to compute, between 0 and 100 (default 25, 50 and 75)
+
+    Returns:
+        Dictionary of the statistics; variance and std are sample statistics
+    """
+    return describe_numbers(numbers, DEFAULT_PERCENTILES if percentiles is None else percentiles)
+
+# Date and time tools
+@registry.tool(binding="local")
+def calculate_years_between_tool(start_date_str: str, end_date_str: str) -> int:
+    """Calculate the number of years between two dates."""
+    return calculate_years_between(start_date_str, end_date_str)
+
+@registry.tool(binding="local")
+def calculate_days_between_tool(start_date_str: str, end_date_str: str) -> int:
+    """Calculate the number of days between two dates."""
+    return calculate_days_between(start_date_str, end_date_str)
+
+@registry.tool(binding="local")
+def calculate_age_tool(birth_date_str: str) -> int:
+    """Calculate age based on birth date."""
+    return calculate_age(birth_date_str)
+
+# Text analysis tools
+@registry.tool(binding="local")
+def count_word_occurrences_tool(text: str, word: str) -> int:
+    """Count occurrences of a word in text."""
+    return count_word_occurrences(text, word)
+
+@registry.tool(binding="local")
+def estimate_reading_time_tool(text: str, wpm: int = 200) -> float:
+    """Estimate reading time for text in minutes."""
+    return estimate_reading_time(text, wpm)
+
+# Math expression tools
+@registry.tool(binding="local")
+def evaluate_expression_tool(expression: str, variables: Optional[Dict[str, Union[float, List[float]]]] = None
+                             ) -> Union[float, List[float], str]:
+    """Evaluate a mathematical expression, e.g. "3 + 4 * (2 - 1)" or "a * x**2 + sqrt(b)".
+
+    Args:
+        expression: Arithmetic expression with numbers, variables, pi, e and functions like sqrt, log, sin, abs, round
+        variables: Values of the variables; a variable bound to a list of numbers evaluates the expression
+            for every value in one call
+
+    Returns:
+        The result (a list for list-valued variables) or an error message
+    """
+    return evaluate_expression(expression, variables)
+
+@registry.tool(binding="local")
+async def solve_equation_tool(equation_str: str, target_var: str) -> str:
+    """Solve a symbolic equation for a target variable."""
+    # sympy runs in a worker process with a timeout, the event loop stays free (see solver_pool.py)
+    return await solver_pool.solve(equation_str, target_var)
+
+# ==============================================================================
+#                               Wiki-Search Tools
+# ==============================================================================
+@registry.tool()
+async def search_wikipedia_tool(query: str) -> List[Dict[str, Union[str, int]]]:
+    """Search Wikipedia for a query and return relevant article titles and snippets.
+
+    Args:
+        query: Search query string
+
+    Returns:
+        List of dictionaries with article info (title, pageid, snippet)
+    """
+    results = await search_wikipedia(query)
+    # Load the top results' sections and intro while the agent picks a page
+    prefetch_pages([result["pageid"] for result in results])
+    return results
+
+@registry.tool()
+async def get_wikipedia_content_tool(page_id: int, max_chars: int = CONTENT_MAX_CHARS, cursor: int = 0) -> str:
+    """Retrieve the content of a Wikipedia article by page ID, one part of at most max_chars characters at a time.
+
+    Args:
+        page_id: Wikipedia page ID
+        max_chars: Maximum length of the returned part
+        cursor: Where to continue, as given at the end of the previous part (0 for the beginning)
+
+    Returns:
+        Article content as cleaned text, followed by the cursor of the next part if the article goes on
+    """
+    return await get_wikipedia_content(page_id, max_chars, cursor)
+
+@registry.tool()
+async def get_page_sections_tool(page_id: int) -> Tuple[List[str], Dict[str, str]]:
+    """Get the list of section titles and their indices for a Wikipedia page.
+
+    Args:
+        page_id: Wikipedia page ID
+
+    Returns:
+        Tuple of (section titles list, section index dictionary)
+    """
+    return await get_page_sections(page_id)
+
+@registry.tool()
+async def get_section_content_tool(page_id: int, section_index: str, max_chars: int = CONTENT_MAX_CHARS,
+                                   cursor: int = 0) -> str:
+    """Get the content of a specific section from a Wikipedia page.
+
+    Args:
+        page_id: Wikipedia page ID
+        section_index: Section index string
+        max_chars: Maximum length of the returned part
+        cursor: Where to continue, as given at the end of the previous part (0 for the beginning)
+
+    Returns:
+        Section content as cleaned text, followed by the cursor of the next part if the section goes on
+    """
+    return await get_section_content(page_id, section_index, max_chars, cursor)
+
+@registry.tool()
+def clean_page_html_tool(html_content: str) -> str:
+    """Clean Wikipedia HTML content to extract readable text.
+
+    Args:
+        html_content: HTML content to clean
+
+    Returns:
+        Cleaned text content
+    """
+    return clean_page_html(html_content)
+
+@registry.tool()
+async def get_multiple_sections_content_tool(page_id: int, section_indices: List[str]) -> Dict[str, str]:
+    """Get content from multiple sections of a Wikipedia page in a single call.
+
+    Args:
+        page_id: Wikipedia page ID
+        section_indices: List of section indices to retrieve
+
+    Returns:
+        Dictionary mapping section indices to their content
+    """
+    return await get_multiple_sections_content(page_id, section_indices)
+
+@registry.tool()
+async def rank_sections_tool(page_id: int, query: str, k: int = 3) -> List[Dict[str, Union[str, float]]]:
+    """Find the sections of a Wikipedia page that are most relevant to a query and return their content.
+
+    Args:
+        page_id: Wikipedia page ID
+        query: What the sections should be about (keywords or a question)
+        k: Number of sections to return
+
+    Returns:
+        List of the best sections (index, title, score, content), most relevant first
+    """
+    return await rank_sections(page_id, query, k)
+
+@registry.tool()
+async def wiki_lookup_tool(query: str, max_pages: int = 2, max_chars: int = 6000) -> str:
+    """Answer-ready Wikipedia context in one call: searches Wikipedia, reads the top pages and returns
+    their sections that are most relevant to the query.
+
+    Args:
+        query: Search query or question
+        max_pages: Number of top search results to read
+        max_chars: Maximum length of the returned text
+
+    Returns:
+        The most relevant sections, each headed by page title, page ID and section
+    """
+    return await wiki_lookup(query, max_pages, max_chars)
+
+
+@registry.tool()
+async def get_content_handle_tool(page_id: int, section_index: str = "") -> Dict[str, Union[str, int]]:
+    """Get a handle to the content of a Wikipedia page or section, with its length and a short preview,
+    instead of the content itself. Write "[[content:<handle>]]" in your answer to quote the whole content
+    verbatim; it is inserted when the answer is shown to the user.
+
+    Args:
+        page_id: Wikipedia page ID
+        section_index: Section index string, empty for the whole page
+
+    Returns:
+        Dictionary with handle, title, chars and preview
+    """
+    return await get_content_handle(page_id, section_index)
+
+@registry.tool()
+async def read_content_tool(handle: str, max_chars: int = CONTENT_MAX_CHARS, cursor: int = 0) -> str:
+    """Read the content behind a content handle, one part of at most max_chars characters at a time.
+
+    Args:
+        handle: Content handle, e.g. "wiki:9752/7"
+        max_chars: Maximum length of the returned part, 0 for all of it
+        cursor: Where to continue, as given at the end of the previous part (0 for the beginning)
+
+    Returns:
+        The content, followed by the cursor of the next part if it goes on
+    """
+    return await read_content(handle, max_chars, cursor)
+
+
+registry.apply_overrides(os.getenv("TOOL_BINDINGS", ""))
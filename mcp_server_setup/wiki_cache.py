@@ -0,0 +1,165 @@
+"""Persistent on-disk cache for Wikipedia API results (SQLite).
+
+Entries are keyed by (action, pageid, section) and tagged with the page
+revision (revid) they were fetched at. Within the TTL an entry is served
+without any network I/O; after the TTL it is revalidated against the page's
+current `lastrevid` and only refetched if the page changed. Values are stored
+zlib-compressed and the cache is kept below a size limit by evicting the least
+recently used entries. The total size is tracked incrementally on insert and
+delete; it is only recounted from the table when the limit seems exceeded (which
+also picks up the writes of other processes sharing the file).
+
+The methods are blocking (SQLite); async callers run them with asyncio.to_thread.
+
+Configuration (environment variables):
+    WIKI_CACHE_ENABLED  "false" disables the cache (default "true")
+    WIKI_CACHE_PATH     SQLite file (default: wiki_cache.sqlite3 in the project root)
+    WIKI_CACHE_TTL      seconds before an entry is revalidated (default 86400)
+    WIKI_CACHE_MAX_MB   maximum size of the stored values in MB (default 256)
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CACHE_ENABLED = os.getenv("WIKI_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+CACHE_PATH = os.getenv("WIKI_CACHE_PATH", os.path.join(PROJECT_ROOT, "wiki_cache.sqlite3"))
+CACHE_TTL = float(os.getenv("WIKI_CACHE_TTL", str(24 * 60 * 60)))
+CACHE_MAX_BYTES = int(float(os.getenv("WIKI_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    revid: Optional[int]
+    fresh: bool  # False once the TTL has expired and the entry needs revalidation
+
+
+class WikiCache:
+    """SQLite-backed, revision-aware LRU cache for Wikipedia results."""
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._size = 0  # total size of the stored values, as far as this process knows
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # WAL lets several server worker processes share the cache file
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    action TEXT NOT NULL,
+                    pageid TEXT NOT NULL,
+                    section TEXT NOT NULL,
+                    revid INTEGER,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (action, pageid, section)
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+            self._size = self._total_size()
+        return self._conn
+
+    @staticmethod
+    def _key(action: str, pageid, section) -> tuple:
+        return action, str(pageid if pageid is not None else ""), str(section if section is not None else "")
+
+    def get(self, action: str, pageid=None, section=None) -> Optional[CacheEntry]:
+        """Look up an entry. Returns None on a miss; check `fresh` before using it."""
+        key = self._key(action, pageid, section)
+        now = time.time()
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT revid, data, fetched_at FROM entries WHERE action=? AND pageid=? AND section=?", key
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access=? WHERE action=? AND pageid=? AND section=?", (now, *key)
+            )
+        revid, data, fetched_at = row
+        fresh = now - fetched_at < self.ttl
+        if fresh:
+            self.stats["hits"] += 1
+        return CacheEntry(json.loads(zlib.decompress(data)), revid, fresh)
+
+    def put(self, action: str, pageid, section, revid: Optional[int], value: Any):
+        """Store a value (replacing older revisions) and evict LRU entries if over the size limit."""
+        data = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = time.time()
+        key = self._key(action, pageid, section)
+        with self._lock:
+            conn = self._connect()
+            replaced = conn.execute(
+                "SELECT size FROM entries WHERE action=? AND pageid=? AND section=?", key
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, revid, data, len(data), now, now),
+            )
+            self._size += len(data) - (replaced[0] if replaced else 0)
+            if self._size > self.max_bytes:
+                self._evict(conn)
+
+    def mark_revalidated(self, pageid, revid: int):
+        """Renew the TTL of every entry of `pageid` stored at revision `revid`."""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE entries SET fetched_at=? WHERE pageid=? AND revid=?", (time.time(), str(pageid), revid)
+            )
+        self.stats["hits"] += 1
+        self.stats["revalidated"] += 1
+
+    def record_miss(self):
+        """Count a stale entry that had to be refetched."""
+        self.stats["misses"] += 1
+
+    def _total_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        # Recount: other processes may have added or evicted entries in the meantime
+        total = self._size = self._total_size()
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until 90% of the limit is reached
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        for action, pageid, section, size in conn.execute(
+            "SELECT action, pageid, section, size FROM entries ORDER BY last_access"
+        ).fetchall():
+            if freed >= target:
+                break
+            conn.execute("DELETE FROM entries WHERE action=? AND pageid=? AND section=?", (action, pageid, section))
+            freed += size
+            self.stats["evictions"] += 1
+        self._size -= freed
+        logger.info(f"Wiki cache evicted {freed} bytes.")
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._connect().execute("DELETE FROM entries")
+            self._size = 0
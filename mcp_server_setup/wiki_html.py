@@ -0,0 +1,177 @@
+"""Cleaning of Wikipedia HTML into text blocks.
+
+Two interchangeable engines produce identical output:
+- "lxml": libxml2 (C) parser and a single tree walk that skips removed
+  elements instead of deleting them; used when `lxml` is installed.
+- "bs4": the original BeautifulSoup/html.parser implementation.
+
+libxml2 repairs malformed markup differently than html.parser (e.g. implied
+end tags), so documents that are not well-formed in the relevant tags are
+handed to the BeautifulSoup engine. MediaWiki output is tidied and always
+takes the fast path.
+
+Configuration (environment variables):
+    WIKI_HTML_ENGINE    "auto" (default), "lxml" or "bs4"
+"""
+import logging
+import os
+import re
+from collections import Counter
+
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TAGS = ["p", "h1", "h2", "h3", "h4", "h5", "h6", "li"]
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+# Scripts, styles, tables (infoboxes, navboxes), references
+REMOVED_TAGS = ["script", "style", "table", "sup", "span"]
+# Navigation, references, ...
+REMOVED_DIV_CLASSES = ["reflist", "navbox", "infobox", "toc", "metadata"]
+
+HTML_ENGINE = os.getenv("WIKI_HTML_ENGINE", "auto").lower()
+if HTML_ENGINE not in ("auto", "lxml", "bs4"):
+    raise ValueError(f"Unknown WIKI_HTML_ENGINE '{HTML_ENGINE}', expected 'auto', 'lxml' or 'bs4'")
+if HTML_ENGINE == "lxml" and not LXML_AVAILABLE:
+    raise ImportError("WIKI_HTML_ENGINE=lxml requires the 'lxml' package")
+
+
+def content_blocks(html, with_anchors=False, engine=None):
+    """Clean Wikipedia HTML and return (tag name, heading anchor, text) for every content tag in order.
+
+    Args:
+        html: HTML content to clean
+        with_anchors: Resolve the anchor of every heading (its id or the id of its mw-headline span)
+        engine: "lxml" or "bs4"; defaults to WIKI_HTML_ENGINE
+
+    Returns:
+        List of (tag name, anchor or None, cleaned text) tuples
+    """
+    engine = engine or HTML_ENGINE
+    if engine != "bs4" and LXML_AVAILABLE:
+        blocks = _lxml_content_blocks(html, with_anchors)
+        if blocks is not None:
+            return blocks
+        logger.debug("Markup not well-formed, cleaning with BeautifulSoup.")
+    return _bs4_content_blocks(html, with_anchors)
+
+
+# ==============================================================================
+#                               BeautifulSoup Engine
+# ==============================================================================
+def _bs4_content_blocks(html, with_anchors=False):
+    from bs4 import BeautifulSoup  # imported on first use, it is not needed at server startup
+    soup = BeautifulSoup(html, "html.parser")
+
+    if with_anchors:
+        # Remember heading anchors before the <span class="mw-headline"> wrappers are removed
+        for heading in soup.find_all(HEADING_TAGS):
+            headline = heading.find("span", class_="mw-headline")
+            anchor = heading.get("id") or (headline.get("id") if headline else None)
+            if anchor:
+                heading["data-anchor"] = anchor
+
+    for tag in soup(REMOVED_TAGS):
+        tag.decompose()
+
+    for div in soup.find_all("div", {"class": REMOVED_DIV_CLASSES}):
+        div.decompose()
+
+    # Keep only content from <p>, <h1-h6>, <li>
+    return [
+        (tag.name, tag.get("data-anchor"), tag.get_text(separator=" ", strip=True))
+        for tag in soup.find_all(CONTENT_TAGS)
+    ]
+
+
+# ==============================================================================
+#                               lxml Engine
+# ==============================================================================
+_CONTENT = frozenset(CONTENT_TAGS)
+_HEADINGS = frozenset(HEADING_TAGS)
+_REMOVED = frozenset(REMOVED_TAGS)
+_REMOVED_DIV_CLASSES = frozenset(REMOVED_DIV_CLASSES)
+# Tags whose extent decides what is removed or extracted
+_CHECKED_TAGS = CONTENT_TAGS + REMOVED_TAGS + ["div"]
+_END_TAG_RE = re.compile(r"</(%s)\s*>" % "|".join(_CHECKED_TAGS), re.IGNORECASE)
+_REFERENCE_RE = re.compile(r"&(#[xX]?[0-9a-fA-F]+|[a-zA-Z][-.a-zA-Z0-9]*)(;?)")
+# Parser messages that do not change the tree
+_HARMLESS_ERRORS = frozenset(("HTML_UNKNOWN_TAG", "DTD_ID_REDEFINED"))
+
+
+def _is_well_formed(root, parser, html) -> bool:
+    """True if libxml2 built the same tree as html.parser would for the relevant tags."""
+    # Mismatched end tags are repaired differently by both parsers
+    if any(error.type_name not in _HARMLESS_ERRORS for error in parser.error_log):
+        return False
+    # Unknown or unterminated character references are decoded differently
+    from bs4.dammit import EntitySubstitution
+    for reference, semicolon in _REFERENCE_RE.findall(html):
+        if not semicolon or (reference[0] != "#" and reference not in EntitySubstitution.HTML_ENTITY_TO_CHARACTER):
+            return False
+    # Unclosed tags are nested by html.parser but closed implicitly by libxml2
+    end_tags = Counter(name.lower() for name in _END_TAG_RE.findall(html))
+    elements = Counter(element.tag for element in root.iter(_CHECKED_TAGS))
+    return all(end_tags[tag] >= count for tag, count in elements.items())
+
+
+def _heading_anchor(heading):
+    anchor = heading.get("id")
+    if not anchor:
+        for span in heading.iter("span"):
+            if "mw-headline" in span.get("class", "").split():
+                anchor = span.get("id")
+                break
+    return anchor or heading.get("data-anchor")
+
+
+def _lxml_content_blocks(html, with_anchors=False):
+    """Return the content blocks, or None if the document has to be cleaned with BeautifulSoup."""
+    if not html or not html.strip():
+        return []
+    if "\r" in html or "\0" in html:
+        # libxml2 normalises line breaks and drops NUL characters
+        return None
+    parser = etree.HTMLParser()
+    root = etree.fromstring(html, parser)
+    if root is None:
+        return []
+    if not _is_well_formed(root, parser, html):
+        return None
+
+    blocks = []
+
+    def add_text(text, open_blocks):
+        text = text.strip()
+        if text:
+            for pieces in open_blocks:
+                pieces.append(text)
+
+    def visit(element, open_blocks):
+        tag = element.tag
+        if not isinstance(tag, str):
+            return  # comment or processing instruction; its tail belongs to the parent
+        if tag in _REMOVED or (tag == "div" and not _REMOVED_DIV_CLASSES.isdisjoint(element.get("class", "").split())):
+            return
+        if tag in _CONTENT:
+            if with_anchors and tag in _HEADINGS:
+                anchor = _heading_anchor(element)
+            else:
+                anchor = element.get("data-anchor")
+            pieces = []
+            blocks.append((tag, anchor, pieces))
+            open_blocks = open_blocks + [pieces]
+        if element.text:
+            add_text(element.text, open_blocks)
+        for child in element:
+            visit(child, open_blocks)
+            if child.tail:
+                add_text(child.tail, open_blocks)
+
+    visit(root, [])
+    return [(tag, anchor, " ".join(pieces)) for tag, anchor, pieces in blocks]
@@ -0,0 +1,332 @@
+"""Offline Wikipedia backend: SQLite FTS5 search index and page store built from a dump.
+
+Every page is stored as its page model (cleaned text and section offsets, see
+wiki_page.py) and indexed for full-text search (BM25, title weighted). With
+WIKI_BACKEND=local, `search_wikipedia`, `get_page_sections`,
+`get_section_content` and the other page tools are answered from the index
+with the same return shapes as the MediaWiki API backend, without network I/O.
+
+Build an index from any of (or a subset of):
+- XML dumps (pages-articles*.xml, .xml.bz2, .xml.gz), wikitext is converted to text
+- Wikimedia Enterprise HTML dumps (*.ndjson, *.ndjson.gz or *.tar.gz of those)
+- saved action=parse responses (*.json, prop=text|sections|revid)
+- directories containing such files
+
+    python -m mcp_server_setup.wiki_local enwiki-latest-pages-articles1.xml.bz2 --limit 100000
+
+Configuration (environment variables):
+    WIKI_BACKEND        "api" (default) or "local"
+    WIKI_LOCAL_INDEX    SQLite file (default: wiki_index.sqlite3 in the project root)
+"""
+import argparse
+import bz2
+import gzip
+import html
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import tarfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from mcp_server_setup.wiki_page import Section, WikiPage, build_page
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WIKI_BACKEND = os.getenv("WIKI_BACKEND", "api").lower()
+LOCAL_INDEX_PATH = os.getenv("WIKI_LOCAL_INDEX", os.path.join(PROJECT_ROOT, "wiki_index.sqlite3"))
+# Number of search results, like the API's default srlimit
+SEARCH_LIMIT = 10
+
+if WIKI_BACKEND not in ("api", "local"):
+    raise ValueError(f"Unknown WIKI_BACKEND '{WIKI_BACKEND}', expected 'api' or 'local'")
+
+
+class LocalWikiIndex:
+    """Full-text search index and page store in one SQLite file."""
+
+    def __init__(self, path: str = LOCAL_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self, writable: bool = False) -> sqlite3.Connection:
+        if self._conn is None:
+            if writable:
+                if os.path.dirname(self.path):
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS pages (
+                        pageid INTEGER PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        revid INTEGER,
+                        text TEXT NOT NULL,
+                        sections TEXT NOT NULL
+                    )"""
+                )
+                self._conn.execute(
+                    """CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+                        title, text, content='pages', content_rowid='pageid',
+                        tokenize='porter unicode61 remove_diacritics 2'
+                    )"""
+                )
+            else:
+                if not os.path.exists(self.path):
+                    raise FileNotFoundError(
+                        f"Local Wikipedia index '{self.path}' not found, "
+                        "build it with: python -m mcp_server_setup.wiki_local <dump>"
+                    )
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        return self._conn
+
+    def add_page(self, page: WikiPage):
+        """Store a page (replacing an older version). Call `finish` to update the search index."""
+        sections = json.dumps([[s.index, s.line, s.level, s.start, s.end] for s in page.sections])
+        with self._lock:
+            self._connect(writable=True).execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (page.pageid, page.title, page.revid, page.text, sections),
+            )
+
+    def finish(self):
+        """Commit stored pages and (re)build the full-text index."""
+        with self._lock:
+            conn = self._connect(writable=True)
+            conn.execute("INSERT INTO pages_fts(pages_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO pages_fts(pages_fts) VALUES ('optimize')")
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[dict]:
+        """Search titles and text, best matches first (API `list=search` result shape).
+
+        All query terms have to match; if nothing does, any term may match.
+        Ties are broken by page ID, so results are deterministic.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+        quoted = [f'"{term}"' for term in terms]
+        sql = (
+            "SELECT p.title, p.pageid, snippet(pages_fts, 1, '<span class=\"searchmatch\">', '</span>', '...', 16) "
+            "FROM pages_fts JOIN pages p ON p.pageid = pages_fts.rowid "
+            "WHERE pages_fts MATCH ? ORDER BY bm25(pages_fts, 10.0, 1.0), p.pageid LIMIT ?"
+        )
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(sql, (" ".join(quoted), limit)).fetchall()
+            if not rows and len(quoted) > 1:
+                rows = conn.execute(sql, (" OR ".join(quoted), limit)).fetchall()
+        return [{"title": title, "pageid": pageid, "snippet": snippet} for title, pageid, snippet in rows]
+
+    def get_page(self, pageid: int) -> Optional[WikiPage]:
+        """Return the stored page model, or None if the page is not in the index."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT title, revid, text, sections FROM pages WHERE pageid=?", (pageid,)
+            ).fetchone()
+        if row is None:
+            return None
+        title, revid, text, sections = row
+        return WikiPage(pageid, title, revid, text, [Section(*fields) for fields in json.loads(sections)])
+
+
+# ==============================================================================
+#                               Wikitext Conversion
+# ==============================================================================
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_REMOVED_ELEMENTS_RE = re.compile(
+    r"<(ref|gallery|timeline|score|math|chem|syntaxhighlight)\b[^>]*?(?:/>|>.*?</\1\s*>)", re.S | re.I
+)
+_TEMPLATE_RE = re.compile(r"\{\{[^{}]*\}\}")
+_TABLE_RE = re.compile(r"\{\|(?:(?!\{\|).)*?\|\}", re.S)
+_LINK_RE = re.compile(r"\[\[([^\[\]]*)\]\]")
+_EXTERNAL_LINK_RE = re.compile(r"\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]")
+_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+_FORMATTING_RE = re.compile(r"'{2,}")
+_HEADING_RE = re.compile(r"^(={1,6})\s*(.+?)\s*\1$")
+# Links that are not part of the article text
+_NON_TEXT_LINKS = ("file:", "image:", "media:", "category:")
+
+
+def _sub_nested(pattern: re.Pattern, repl, text: str) -> str:
+    """Apply `pattern` until nothing matches any more (innermost constructs first)."""
+    for _ in range(20):
+        text, count = pattern.subn(repl, text)
+        if not count:
+            break
+    return text
+
+
+def _link_text(match) -> str:
+    target, _, label = match.group(1).partition("|")
+    if target.strip().lower().startswith(_NON_TEXT_LINKS):
+        return ""
+    return label or target
+
+
+def wikitext_to_html(wikitext: str) -> str:
+    """Convert wikitext to minimal HTML (headings, paragraphs, list items) with templates, tables and references removed."""
+    text = _COMMENT_RE.sub("", wikitext)
+    text = _REMOVED_ELEMENTS_RE.sub("", text)
+    text = _sub_nested(_TEMPLATE_RE, "", text)
+    text = _sub_nested(_TABLE_RE, "", text)
+    text = _sub_nested(_LINK_RE, _link_text, text)
+    text = _EXTERNAL_LINK_RE.sub(r"\1", text)
+    text = _FORMATTING_RE.sub("", _TAG_RE.sub("", text))
+    text = html.unescape(text)
+
+    parts = []
+    paragraph = []
+
+    def end_paragraph():
+        if paragraph:
+            parts.append(f"<p>{html.escape(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        heading = _HEADING_RE.match(line)
+        if heading:
+            end_paragraph()
+            level, title = len(heading.group(1)), heading.group(2)
+            anchor = html.escape(title.replace(" ", "_"))
+            parts.append(f'<h{level} id="{anchor}">{html.escape(title)}</h{level}>')
+        elif line.startswith(("*", "#")):
+            end_paragraph()
+            parts.append(f"<li>{html.escape(line.lstrip('*#:; '))}</li>")
+        elif not line or line.startswith(("__", "{", "|", "!", "}")):
+            # blank line, magic word or leftovers of unbalanced templates/tables
+            end_paragraph()
+        else:
+            paragraph.append(line.lstrip(":; "))
+    end_paragraph()
+    return "".join(parts)
+
+
+# ==============================================================================
+#                               Dump Readers
+# ==============================================================================
+# A page to ingest: (pageid, action=parse-like dict with title, revid, text and optionally sections)
+DumpPage = Tuple[int, dict]
+
+
+def _open(path: Path):
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rb")
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_xml_dump(path: Path) -> Iterator[DumpPage]:
+    """Articles (namespace 0, no redirects) of a MediaWiki XML export."""
+    with _open(path) as f:
+        root = None
+        for event, element in ElementTree.iterparse(f, events=("start", "end")):
+            if root is None:
+                root = element
+            if event != "end" or _local_name(element.tag) != "page":
+                continue
+            fields = {_local_name(child.tag): child for child in element}
+            revision = {_local_name(child.tag): child for child in fields.get("revision", [])}
+            if (fields.get("ns") is None or fields["ns"].text == "0") and "redirect" not in fields \
+                    and revision.get("text") is not None and revision["text"].text:
+                yield int(fields["id"].text), {
+                    "title": fields["title"].text,
+                    "revid": int(revision["id"].text) if "id" in revision else None,
+                    "text": {"*": wikitext_to_html(revision["text"].text)},
+                }
+            root.clear()  # pages are processed one at a time
+
+
+def _read_html_dump_lines(lines) -> Iterator[DumpPage]:
+    for line in lines:
+        if not line.strip():
+            continue
+        article = json.loads(line)
+        if article.get("namespace", {}).get("identifier", 0) != 0 or "article_body" not in article:
+            continue
+        yield article["identifier"], {
+            "title": article["name"],
+            "revid": article.get("version", {}).get("identifier"),
+            "text": {"*": article["article_body"]["html"]},
+        }
+
+
+def read_html_dump(path: Path) -> Iterator[DumpPage]:
+    """Articles of a Wikimedia Enterprise HTML dump (NDJSON, optionally in a tar archive)."""
+    if path.name.endswith((".tar.gz", ".tgz")):
+        with tarfile.open(path, "r:gz") as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith((".ndjson", ".jsonl")):
+                    yield from _read_html_dump_lines(archive.extractfile(member))
+    else:
+        with _open(path) as f:
+            yield from _read_html_dump_lines(f)
+
+
+def read_parse_response(path: Path) -> Iterator[DumpPage]:
+    """A saved action=parse response."""
+    parse = json.loads(path.read_text(encoding="utf-8"))["parse"]
+    yield parse["pageid"], parse
+
+
+def read_dump(path: Path) -> Iterator[DumpPage]:
+    """Pages of any supported dump file, or of all dump files in a directory (in name order)."""
+    name = path.name.lower()
+    if path.is_dir():
+        for child in sorted(path.iterdir()):
+            yield from read_dump(child)
+    elif name.endswith((".xml", ".xml.bz2", ".xml.gz")):
+        yield from read_xml_dump(path)
+    elif name.endswith((".ndjson", ".ndjson.gz", ".jsonl", ".jsonl.gz", ".tar.gz", ".tgz")):
+        yield from read_html_dump(path)
+    elif name.endswith(".json"):
+        yield from read_parse_response(path)
+    else:
+        logger.warning(f"Skipping {path}: unknown dump format.")
+
+
+def build_index(dumps: List[str], index_path: str = LOCAL_INDEX_PATH, limit: Optional[int] = None) -> int:
+    """Ingest dumps into the local index and return the number of pages added."""
+    index = LocalWikiIndex(index_path)
+    added = 0
+    start = time.perf_counter()
+    pages = (page for dump in dumps for page in read_dump(Path(dump)))
+    for pageid, parse in itertools.islice(pages, limit):
+        index.add_page(build_page(pageid, parse))
+        added += 1
+        if added % 10000 == 0:
+            print(f"{added} pages ({added / (time.perf_counter() - start):.0f} pages/s)")
+    index.finish()
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the offline Wikipedia index (used with WIKI_BACKEND=local).",
+        epilog=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("dumps", nargs="+", help="Dump files or directories")
+    parser.add_argument("--index", default=LOCAL_INDEX_PATH, help="SQLite file to create or extend")
+    parser.add_argument("--limit", type=int, help="Stop after this many pages")
+    args = parser.parse_args()
+    count = build_index(args.dumps, args.index, args.limit)
+    print(f"Indexed {count} pages into {args.index}")
@@ -0,0 +1,124 @@
+"""Compact in-memory model of a parsed Wikipedia page.
+
+The cleaned text of the whole page is kept in one string buffer; every section
+only stores its index, title, heading level and the character offsets of its
+content (including subsections) in that buffer. This way a page is fetched and
+parsed once and every section and content lookup is a string slice.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from mcp_server_setup.wiki_html import content_blocks, HEADING_TAGS
+
+
+class Section:
+    __slots__ = ("index", "line", "level", "start", "end")
+
+    def __init__(self, index: str, line: str, level: int, start: int = -1, end: int = -1):
+        self.index = index    # MediaWiki section index ("1", "2", ...)
+        self.line = line      # section title
+        self.level = level    # heading level (2 for <h2>, ...)
+        self.start = start    # offsets into WikiPage.text, -1 if the heading was not found
+        self.end = end
+
+    @property
+    def located(self) -> bool:
+        return self.start >= 0
+
+
+class WikiPage:
+    __slots__ = ("pageid", "title", "revid", "text", "sections", "section_index", "_by_index")
+
+    def __init__(self, pageid: int, title: str, revid: Optional[int], text: str, sections: List[Section]):
+        self.pageid = pageid
+        self.title = title
+        self.revid = revid
+        self.text = text
+        self.sections = sections
+        self.section_index = None  # BM25 index of the sections, built on first use (see wiki_rank.py)
+        self._by_index = {section.index: section for section in sections}
+
+    def section_titles(self) -> Tuple[List[str], Dict[str, str]]:
+        """Return (section titles, title -> index), the shape of get_page_sections."""
+        section_titles = [section.line for section in self.sections if section.index != "0"]
+        section_index = {section.line: section.index for section in self.sections if section.index != "0"}
+        return section_titles, section_index
+
+    def section_text(self, section_index) -> Optional[str]:
+        """Return the cleaned text of a section (with its subsections), or None if unknown."""
+        section = self._by_index.get(str(section_index))
+        if section is None or not section.located:
+            return None
+        return self.text[section.start:section.end]
+
+    def to_dict(self) -> dict:
+        return {
+            "pageid": self.pageid,
+            "title": self.title,
+            "revid": self.revid,
+            "text": self.text,
+            "sections": [[s.index, s.line, s.level, s.start, s.end] for s in self.sections],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WikiPage":
+        return cls(
+            data["pageid"], data["title"], data["revid"], data["text"],
+            [Section(*fields) for fields in data["sections"]],
+        )
+
+
+def _sections_from_headings(blocks) -> List[dict]:
+    """Section metadata for HTML without it (dumps): every heading with an anchor starts a section."""
+    sections_meta = []
+    seen = set()
+    for name, anchor, text in blocks:
+        if name in HEADING_TAGS and anchor and anchor not in seen:
+            seen.add(anchor)
+            sections_meta.append(
+                # Old-style headings keep their title in the removed <span class="mw-headline">
+                {"index": str(len(sections_meta) + 1), "line": text or anchor.replace("_", " "),
+                 "level": name[1], "anchor": anchor}
+            )
+    return sections_meta
+
+
+def build_page(pageid: int, parse: dict) -> WikiPage:
+    """Build the page model from an action=parse result with prop=text|sections|revid.
+
+    Without "sections" (e.g. pages from an HTML dump) the sections are taken from the headings.
+    """
+    blocks = content_blocks(parse["text"]["*"], with_anchors=True)
+    sections_meta = parse["sections"] if "sections" in parse else _sections_from_headings(blocks)
+    by_anchor = {meta["anchor"]: meta for meta in sections_meta if meta.get("anchor")}
+
+    # Split the cleaned lines at the headings of known sections
+    lines = []
+    offset = 0
+    intro = Section("0", "", 0, 0)
+    sections = {}
+    boundaries = [(intro, 0)]
+    for name, anchor, text in blocks:
+        if name in HEADING_TAGS and anchor in by_anchor and by_anchor[anchor]["index"] not in sections:
+            meta = by_anchor[anchor]
+            section = Section(meta["index"], meta["line"], int(meta["level"]), offset)
+            sections[section.index] = section
+            boundaries.append((section, offset))
+        if text:
+            lines.append(text)
+            offset += len(text) + 1
+    text = "\n".join(lines)
+
+    # A section ends where the next section of the same or a higher level starts
+    for i, (section, start) in enumerate(boundaries):
+        end = len(text)
+        for following, following_start in boundaries[i + 1:]:
+            if section.index == "0" or following.level <= section.level:
+                end = following_start - 1 if following_start > start else start
+                break
+        section.end = end
+
+    ordered = [intro] + [
+        sections.get(meta["index"]) or Section(meta["index"], meta["line"], int(meta.get("level") or 0))
+        for meta in sections_meta
+    ]
+    return WikiPage(pageid, parse.get("title", ""), parse.get("revid"), text, ordered)
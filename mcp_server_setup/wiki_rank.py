@@ -0,0 +1,98 @@
+"""BM25 ranking of the sections of a Wikipedia page against a query.
+
+Every section is ranked on its own text (without its subsections, which are
+ranked separately), with the section title counted twice. The inverted index
+of a page is built on first use and kept on the page model, so further
+queries on the same page only score the query terms.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from mcp_server_setup.wiki_page import WikiPage
+
+# BM25 parameters (the usual defaults)
+K1 = 1.5
+B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were which who with "
+    "what when where how why did does do about".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and with a plural "s" removed."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class SectionIndex:
+    """Inverted index over the sections of one page."""
+
+    __slots__ = ("sections", "postings", "lengths", "avg_length")
+
+    def __init__(self, page: WikiPage):
+        # (index, title, start, end) of every located section, ranked on its own text
+        located = sorted((s for s in page.sections if s.located), key=lambda s: s.start)
+        self.sections: List[Tuple[str, str, int, int]] = []
+        for i, section in enumerate(located):
+            end = section.end
+            if i + 1 < len(located):
+                end = min(end, max(section.start, located[i + 1].start - 1))
+            self.sections.append((section.index, section.line or "Introduction", section.start, end))
+
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.lengths: List[int] = []
+        for doc, (_, title, start, end) in enumerate(self.sections):
+            tokens = tokenize(page.text[start:end]) + tokenize(title)
+            self.lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                self.postings[term].append((doc, frequency))
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def rank(self, query: str, k: int) -> List[Tuple[float, int]]:
+        """Return up to `k` (score, section position) pairs with a positive score, best first."""
+        scores: Dict[int, float] = defaultdict(float)
+        n = len(self.sections)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, frequency in postings:
+                norm = K1 * (1 - B + B * self.lengths[doc] / self.avg_length)
+                scores[doc] += idf * frequency * (K1 + 1) / (frequency + norm)
+        # Ties keep page order
+        return sorted(((score, doc) for doc, score in scores.items()), key=lambda item: (-item[0], item[1]))[:k]
+
+
+def rank_page_sections(page: WikiPage, query: str, k: int = 3) -> List[dict]:
+    """Rank the sections of a page against `query` and return the best `k` with their content.
+
+    If no section contains a query term, the introduction is returned.
+    """
+    if page.section_index is None:
+        page.section_index = SectionIndex(page)
+    index = page.section_index
+    ranked = index.rank(query, max(1, k))
+    if not ranked and index.sections:
+        ranked = [(0.0, 0)]
+    results = []
+    for score, doc in ranked:
+        section_index, title, start, end = index.sections[doc]
+        results.append({
+            "index": section_index,
+            "title": title,
+            "score": round(score, 3),
+            "content": page.text[start:end],
+        })
+    return results
@@ -0,0 +1,217 @@
+"""Rate limiting and retries for Wikipedia API requests.
+
+All requests of the server process draw from one token bucket, so bursts of
+concurrent tool calls are smoothed to a steady request rate. With
+WIKI_RATE_LIMIT_FILE the bucket state lives in a file (guarded by an
+exclusive lock) and is shared by every process that uses the same file, e.g.
+the workers of a multi-worker server.
+
+Failed requests (connection errors, 429, 5xx, `maxlag` errors) are retried
+with jittered exponential backoff. A `Retry-After` header is honoured and
+pauses the whole bucket, so other callers back off as well.
+
+Configuration (environment variables):
+    WIKI_RATE_LIMIT         requests per second, 0 disables limiting (default 20)
+    WIKI_RATE_BURST         bucket size, i.e. requests allowed at once (default 20)
+    WIKI_RATE_LIMIT_FILE    state file shared by several processes (default: per process)
+    WIKI_MAX_RETRIES        retries per request (default 4)
+    WIKI_BACKOFF_BASE       first backoff in seconds, doubled per retry (default 0.5)
+    WIKI_BACKOFF_MAX        maximum backoff in seconds (default 30)
+"""
+import asyncio
+import logging
+import os
+import random
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT = float(os.getenv("WIKI_RATE_LIMIT", "20"))
+RATE_BURST = int(os.getenv("WIKI_RATE_BURST", "20"))
+RATE_LIMIT_FILE = os.getenv("WIKI_RATE_LIMIT_FILE", "")
+MAX_RETRIES = int(os.getenv("WIKI_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("WIKI_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("WIKI_BACKOFF_MAX", "30"))
+
+
+class TokenBucket:
+    """Token bucket handing out reservations: `reserve()` returns how long the caller has to wait.
+
+    Thread-safe and independent of any event loop.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: int = RATE_BURST):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._state = [float(self.burst), self._now()]  # tokens, time of the last refill
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock:
+            yield self._state
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait until it may be used."""
+        if self.rate <= 0:
+            return 0.0
+        with self._locked_state() as state:
+            now = self._now()
+            if now > state[1]:
+                state[0] = min(self.burst, state[0] + (now - state[1]) * self.rate)
+                state[1] = now
+            state[0] -= 1
+            # The refill time lies in the future while the bucket is paused
+            return max(0.0, state[1] - now) + max(0.0, -state[0] / self.rate)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds` (e.g. after a Retry-After); refilling resumes afterwards."""
+        if self.rate <= 0:
+            return
+        with self._locked_state() as state:
+            until = self._now() + seconds
+            if until > state[1]:
+                state[0] = min(state[0], 0.0)
+                state[1] = until
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state is kept in a file, shared by all processes using that file."""
+
+    _FORMAT = "dd"
+
+    def __init__(self, path: str, rate: float = RATE_LIMIT, burst: int = RATE_BURST):
+        if fcntl is None:
+            raise RuntimeError("WIKI_RATE_LIMIT_FILE requires file locking (fcntl), which is not available")
+        self.path = path
+        open(path, "ab").close()
+        super().__init__(rate, burst)
+
+    @staticmethod
+    def _now() -> float:
+        return time.time()  # comparable across processes
+
+    @contextmanager
+    def _locked_state(self):
+        size = struct.calcsize(self._FORMAT)
+        with self._lock, open(self.path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                data = f.read(size)
+                state = list(struct.unpack(self._FORMAT, data)) if len(data) == size else [float(self.burst), self._now()]
+                yield state
+                f.seek(0)
+                f.write(struct.pack(self._FORMAT, *state))
+                f.truncate()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Sends requests through a token bucket and retries transient failures."""
+
+    def __init__(self, bucket: TokenBucket, max_retries: int = MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX):
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {
+            "requests": 0, "throttled": 0, "throttle_wait_s": 0.0, "retries": 0,
+            "rate_limited": 0, "server_errors": 0, "maxlag": 0, "transport_errors": 0, "failures": 0,
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": spreads the retries of concurrent callers
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_reason(self, response: httpx.Response) -> Optional[str]:
+        if response.status_code == 429:
+            return "rate_limited"
+        if response.status_code >= 500:
+            return "server_errors"
+        if response.headers.get("MediaWiki-API-Error") in ("maxlag", "ratelimited"):
+            return "maxlag"
+        return None
+
+    async def request(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Call `send` within the rate limit, retrying transient failures.
+
+        Returns the last response once retries are exhausted; transport errors
+        of the last attempt are raised.
+        """
+        for attempt in range(self.max_retries + 1):
+            wait = self.bucket.reserve()
+            if wait > 0:
+                self.stats["throttled"] += 1
+                self.stats["throttle_wait_s"] += wait
+                await asyncio.sleep(wait)
+            self.stats["requests"] += 1
+            last_attempt = attempt == self.max_retries
+
+            try:
+                response = await send()
+            except httpx.TransportError as e:
+                self.stats["transport_errors"] += 1
+                if last_attempt:
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.info(f"Wikipedia request failed ({e!r}), retrying in {delay:.2f}s.")
+            else:
+                reason = self._retry_reason(response)
+                if reason is None:
+                    return response
+                self.stats[reason] += 1
+                if last_attempt:
+                    self.stats["failures"] += 1
+                    return response
+                delay = self._backoff(attempt)
+                retry_after = _retry_after(response)
+                if retry_after is not None:
+                    self.bucket.pause(retry_after)
+                    delay = max(delay, retry_after)
+                logger.info(f"Wikipedia request answered with {reason} ({response.status_code}), retrying in {delay:.2f}s.")
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Rate limiter configured from the environment (file-backed bucket if WIKI_RATE_LIMIT_FILE is set)."""
+    if RATE_LIMIT_FILE:
+        bucket = FileTokenBucket(RATE_LIMIT_FILE)
+    else:
+        bucket = TokenBucket()
+    return RateLimiter(bucket)
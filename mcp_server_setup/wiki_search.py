@@ -1,20 +1,219 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import logging
+import os
+import time
+import weakref
+from collections import OrderedDict
+import httpx
+from mcp_server_setup.content_store import ContentStore
+from mcp_server_setup.singleflight import SingleFlight
+from mcp_server_setup.wiki_cache import WikiCache, CACHE_ENABLED, CACHE_TTL
+from mcp_server_setup.wiki_html import content_blocks
+from mcp_server_setup.wiki_local import LocalWikiIndex, WIKI_BACKEND
+from mcp_server_setup.wiki_page import WikiPage, build_page
+from mcp_server_setup.wiki_rank import rank_page_sections
+from mcp_server_setup.wiki_rate_limit import create_rate_limiter
 
 WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
 
-def search_wikipedia(query, limit=5):
-    """Step 1: Search Wikipedia for pages related to the query."""
+# Shared HTTP client settings (keep-alive connection pool, HTTP/2 if the `h2` package is installed)
+HTTP_MAX_CONNECTIONS = int(os.getenv("WIKI_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("WIKI_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_TIMEOUT = float(os.getenv("WIKI_HTTP_TIMEOUT", "15"))
+# Maximum number of parallel section requests in get_multiple_sections_content
+SECTION_CONCURRENCY = int(os.getenv("WIKI_SECTION_CONCURRENCY", "8"))
+# Number of parsed page models kept in memory
+PAGE_MODEL_CACHE_SIZE = int(os.getenv("WIKI_PAGE_MODEL_CACHE_SIZE", "32"))
+# Pages of each search result prefetched in the background (0 disables) and how many at a time
+PREFETCH_TOP_K = int(os.getenv("WIKI_PREFETCH_TOP_K", "3"))
+PREFETCH_CONCURRENCY = int(os.getenv("WIKI_PREFETCH_CONCURRENCY", "2"))
+# Ask the API to refuse requests while its database replicas lag more than this many seconds ("" disables)
+MAXLAG = os.getenv("WIKI_MAXLAG", "5")
+# Sections per page considered by wiki_lookup, and the smallest excerpt worth adding to its context
+LOOKUP_SECTIONS_PER_PAGE = 4
+LOOKUP_MIN_CHARS = 200
+# Default output budget of the content tools (about 4 characters per token); longer texts are paginated
+CONTENT_MAX_CHARS = int(os.getenv("WIKI_CONTENT_MAX_CHARS", "8000"))
+USER_AGENT = "amt-pj-ss25-agentic-ai/1.0 (https://github.com/alexgaballa/amt-pj-ss25-agentic-ai)"
+
+# Errors of a request that failed for good (after the retries) or returned no valid JSON.
+# The tools never raise them: a failed request is answered like missing content
+# ("Content could not be retrieved.", no sections, no search results).
+REQUEST_ERRORS = (ValueError, httpx.HTTPError)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Persistent on-disk cache of search and parse results (see wiki_cache.py)
+wiki_cache = WikiCache() if CACHE_ENABLED else None
+
+# Token bucket and retries shared by all Wikipedia requests of this process (see wiki_rate_limit.py)
+rate_limiter = create_rate_limiter()
+
+# Identical concurrent fetches are coalesced into one request (see singleflight.py)
+_inflight = SingleFlight()
+
+# Offline search index and page store, used instead of the API with WIKI_BACKEND=local (see wiki_local.py)
+local_index = LocalWikiIndex() if WIKI_BACKEND == "local" else None
+
+# In-memory LRU of parsed pages: pageid -> (WikiPage, loaded at)
+_page_models = OrderedDict()
+
+# Prefetches not yet claimed: pageid -> (task, pageids prefetched for the same search)
+_prefetches = OrderedDict()
+_prefetch_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+prefetch_stats = {"started": 0, "completed": 0, "used": 0, "cancelled": 0, "failed": 0}
+
+# Large results passed by handle, "wiki:<pageid>" or "wiki:<pageid>/<section>" (see content_store.py)
+content_store = ContentStore()
+
+# One client per event loop: httpx connections cannot be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared async HTTP client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+            headers={"User-Agent": USER_AGENT},
+        )
+        _clients[loop] = client
+    return client
+
+async def _get_json(params):
+    """Send a GET request to the MediaWiki API and return the decoded JSON.
+
+    Requests are rate limited and transient failures retried; an error status
+    that persists after the retries raises `httpx.HTTPStatusError`.
+    """
+    if MAXLAG:
+        params = {**params, "maxlag": MAXLAG}
+    response = await rate_limiter.request(lambda: get_http_client().get(WIKI_API_URL, params=params))
+    response.raise_for_status()
+    return response.json()
+
+async def _get_latest_revid(pageid):
+    """Return the current revision id (lastrevid) of a page."""
     params = {
         "action": "query",
-        "list": "search",
-        "srsearch": query,
-        "format": "json",
+        "prop": "info",
+        "pageids": pageid,
+        "format": "json"
     }
-    response = requests.get(WIKI_API_URL, params=params)
-    data = response.json()
+    data = await _get_json(params)
+    return data.get("query", {}).get("pages", {}).get(str(pageid), {}).get("lastrevid")
+
+async def _cached(action, pageid, section, fetch):
+    """Serve a result from the on-disk cache, revalidating stale entries by revid.
+
+    `fetch` is called on a miss and returns (value, revid); a value of None
+    (e.g. a failed request) is not cached. Concurrent misses for the same
+    entry share one fetch (and one cleaning pass).
+    """
+    key = (action, str(pageid), str(section))
+    if wiki_cache is None:
+        value, _ = await _inflight.do(key, fetch)
+        return value
+
+    entry = await asyncio.to_thread(wiki_cache.get, action, pageid, section)
+    if entry is not None and entry.fresh:
+        return entry.value
+
+    async def refresh():
+        if entry is not None:
+            if entry.revid is not None and await _get_latest_revid(pageid) == entry.revid:
+                await asyncio.to_thread(wiki_cache.mark_revalidated, pageid, entry.revid)
+                return entry.value
+            wiki_cache.record_miss()
+
+        value, revid = await fetch()
+        if value is not None:
+            await asyncio.to_thread(wiki_cache.put, action, pageid, section, revid, value)
+        return value
+
+    return await _inflight.do(key, refresh)
+
+async def _get_parsed_text(pageid, section_index=None):
+    """Fetch a parsed page (or one section of it) as {"html": ..., "text": ...}, or None if unavailable.
+
+    A failed request is logged and returns None, like a missing page.
+    """
+    if local_index is not None:
+        # The local index only holds page models, there is no per-section HTML
+        return None
+
+    async def fetch():
+        params = {
+            "action": "parse",
+            "pageid": pageid,
+            "prop": "text|revid",
+            "format": "json"
+        }
+        if section_index is not None:
+            params["section"] = section_index
+        data = await _get_json(params)
+        try:
+            html_content = data["parse"]["text"]["*"]
+        except KeyError:
+            return None, None
+        # Clean the HTML to extract readable text
+        return {"html": html_content, "text": clean_page_html(html_content)}, data["parse"].get("revid")
+
+    try:
+        return await _cached("parse_text", pageid, section_index, fetch)
+    except REQUEST_ERRORS as e:
+        logger.warning(f"Could not fetch section {section_index} of page {pageid}: {e!r}")
+        return None
+
+def get_wiki_cache_stats():
+    """Return the hit/miss counters of the Wikipedia cache."""
+    return dict(wiki_cache.stats) if wiki_cache is not None else {}
+
+def get_coalescing_stats():
+    """Return how many fetches were requested, how many were executed and the resulting dedup ratio."""
+    return {**_inflight.stats, "dedup_ratio": _inflight.dedup_ratio}
+
+def get_rate_limit_stats():
+    """Return the request, throttling and retry counters of the Wikipedia rate limiter."""
+    return dict(rate_limiter.stats)
+
+async def search_wikipedia(query, limit=5):
+    """Step 1: Search Wikipedia for pages related to the query.
+
+    A failed request is logged and returns no results.
+    """
+    async def fetch():
+        params = {
+            "action": "query",
+            "list": "search",
+            "srsearch": query,
+            "format": "json",
+        }
+        data = await _get_json(params)
+        if "query" not in data:
+            return None, None
+        return data["query"].get("search", []), None
 
-    results = data.get("query", {}).get("search", [])
+    if local_index is not None:
+        results = local_index.search(query)
+    else:
+        try:
+            results = await _cached("search", None, query, fetch) or []
+        except REQUEST_ERRORS as e:
+            logger.warning(f"Wikipedia search for {query!r} failed: {e!r}")
+            results = []
     search_summaries = []
 
     for result in results[:limit]:
@@ -27,93 +226,325 @@ def search_wikipedia(query, limit=5):
 
     return search_summaries
 
-def get_page_sections(pageid):
-    """Fetch the sections of a Wikipedia page."""
-    params = {
-        "action": "parse",
-        "pageid": pageid,
-        "prop": "sections",
-        "format": "json"
-    }
-    response = requests.get(WIKI_API_URL, params=params)
-    data = response.json()
+async def get_wiki_page(pageid):
+    """Return the parsed page model of a Wikipedia page, or None if it could not be retrieved.
 
-    sections = data.get("parse", {}).get("sections", [])
-    section_titles = [section["line"] for section in sections]
-    section_index = {section["line"]: section["index"] for section in sections}
-    return section_titles, section_index
+    The full page is fetched and parsed once (text, sections and revid in one
+    request); the model is kept in a small in-memory LRU and in the disk cache.
+    A failed request is logged and returns None, like a missing page.
+    """
+    try:
+        pageid = int(pageid)
+    except (ValueError, TypeError):
+        return None
 
-def get_section_content(pageid, section_index):
-    """Fetch a specific section of a Wikipedia page."""
-    params = {
-        "action": "parse",
-        "pageid": pageid,
-        "section": section_index,
-        "prop": "text",
-        "format": "json"
-    }
-    response = requests.get(WIKI_API_URL, params=params)
-    data = response.json()
+    if local_index is not None:
+        return local_index.get_page(pageid)
 
-    # Extract content from HTML and clean it
+    _claim_prefetch(pageid)
     try:
-        html_content = data["parse"]["text"]["*"]
-        # Clean the HTML to extract readable text
-        cleaned_content = clean_page_html(html_content)
-        return cleaned_content
-    except KeyError:
+        return await _load_page(pageid)
+    except REQUEST_ERRORS as e:
+        logger.warning(f"Could not fetch page {pageid}: {e!r}")
+        return None
+
+async def _load_page(pageid):
+    cached = _page_models.get(pageid)
+    if cached is not None and time.monotonic() - cached[1] < CACHE_TTL:
+        _page_models.move_to_end(pageid)
+        return cached[0]
+
+    async def fetch():
+        params = {
+            "action": "parse",
+            "pageid": pageid,
+            "prop": "text|sections|revid",
+            "format": "json"
+        }
+        data = await _get_json(params)
+        try:
+            page = build_page(pageid, data["parse"])
+        except KeyError:
+            return None, None
+        return page.to_dict(), page.revid
+
+    page_data = await _cached("page", pageid, None, fetch)
+    if page_data is None:
+        return None
+    page = WikiPage.from_dict(page_data)
+    _page_models[pageid] = (page, time.monotonic())
+    while len(_page_models) > PAGE_MODEL_CACHE_SIZE:
+        _page_models.popitem(last=False)
+    return page
+
+def prefetch_pages(pageids, top_k=PREFETCH_TOP_K):
+    """Start loading the page models of the first `top_k` pages in the background.
+
+    Called with the results of a search, so that the sections and intro of the
+    page the agent picks next are already cached. At most PREFETCH_CONCURRENCY
+    pages are fetched at a time; once one of the pages is requested through
+    `get_wiki_page`, the prefetches of the other pages are cancelled.
+    """
+    if local_index is not None or top_k <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    if loop not in _prefetch_semaphores:
+        _prefetch_semaphores[loop] = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    semaphore = _prefetch_semaphores[loop]
+
+    batch = []
+    for pageid in pageids[:top_k]:
+        pageid = int(pageid)
+        if pageid not in _prefetches and pageid not in _page_models:
+            batch.append(pageid)
+
+    async def prefetch(pageid):
+        async with semaphore:
+            await _load_page(pageid)
+
+    def done(task):
+        if task.cancelled():
+            prefetch_stats["cancelled"] += 1
+        elif task.exception() is not None:
+            prefetch_stats["failed"] += 1
+        else:
+            prefetch_stats["completed"] += 1
+
+    for pageid in batch:
+        task = loop.create_task(prefetch(pageid))
+        task.add_done_callback(done)
+        _prefetches[pageid] = (task, batch)
+        prefetch_stats["started"] += 1
+    # Forget prefetches whose page was never chosen
+    while len(_prefetches) > PAGE_MODEL_CACHE_SIZE:
+        _prefetches.popitem(last=False)[1][0].cancel()
+
+def _claim_prefetch(pageid):
+    """A page was chosen: cancel the prefetches of the other pages from its search."""
+    entry = _prefetches.pop(pageid, None)
+    if entry is None:
+        return
+    prefetch_stats["used"] += 1
+    for other in entry[1]:
+        other_entry = _prefetches.pop(other, None)
+        if other_entry is not None:
+            other_entry[0].cancel()
+
+def get_prefetch_stats():
+    """Return the counters of the speculative page prefetch (started, used, cancelled, ...)."""
+    return dict(prefetch_stats)
+
+async def get_page_sections(pageid):
+    """Fetch the sections of a Wikipedia page."""
+    page = await get_wiki_page(pageid)
+    if page is None:
+        return [], {}
+    return page.section_titles()
+
+async def _section_text(pageid, section_index):
+    """Cleaned text of one section, or None if it could not be retrieved."""
+    page = await get_wiki_page(pageid)
+    content = page.section_text(section_index) if page is not None else None
+    if content is None:
+        # Section not located in the page model (e.g. transcluded sections): ask the API directly
+        parsed = await _get_parsed_text(pageid, section_index)
+        content = parsed["text"] if parsed is not None else None
+    return content
+
+async def get_section_content(pageid, section_index, max_chars=None, cursor=0):
+    """Fetch a specific section of a Wikipedia page.
+
+    With `max_chars` the text is paginated like in get_wikipedia_content.
+    """
+    content = await _section_text(pageid, section_index)
+    if content is None:
         return "Content could not be retrieved."
+    return paginate_text(content, max_chars, cursor)
 
-def get_wikipedia_content(pageid):
-    """Fetch the full content of the selected Wikipedia page and return it as cleaned text."""
-    params = {
-        "action": "parse",
-        "pageid": pageid,
-        "prop": "text",
-        "format": "json"
-    }
-    response = requests.get(WIKI_API_URL, params=params)
-    data = response.json()
+async def get_wikipedia_content(pageid, max_chars=None, cursor=0):
+    """Fetch the content of the selected Wikipedia page and return it as cleaned text.
+
+    With `max_chars` at most that many characters are returned, starting at
+    character offset `cursor`. The chunk ends at a paragraph boundary and is
+    followed by a note with the cursor of the next chunk if the page goes on.
+    """
+    page = await get_wiki_page(pageid)
+    if page is None:
+        return "Content could not be retrieved."
+    return paginate_text(page.text, max_chars, cursor)
+
+async def rank_sections(pageid, query, k=3):
+    """Rank the sections of a Wikipedia page against a query (BM25) and return the top k with their content."""
+    page = await get_wiki_page(pageid)
+    if page is None:
+        return []
+    return rank_page_sections(page, query, k)
+
+def _paragraph_end(text, start, max_chars):
+    """End of the chunk of at most `max_chars` starting at `start`: the last paragraph (line) boundary
+    in reach, else the last word boundary, else `start + max_chars`."""
+    end = start + max_chars
+    if end >= len(text):
+        return len(text)
+    for boundary in ("\n", " "):
+        cut = text.rfind(boundary, start + 1, end + 1)
+        if cut > start:
+            return cut
+    return end
+
+def _truncate_at_paragraph(text, max_chars):
+    """Cut `text` to at most `max_chars`, at the last paragraph (line) boundary if there is one."""
+    return text[:_paragraph_end(text, 0, max_chars)]
 
-    # Extract content from HTML and clean it
+def paginate_text(text, max_chars=None, cursor=0):
+    """Return the chunk of `text` of at most `max_chars` characters that starts at offset `cursor`.
+
+    Chunks end at paragraph boundaries (see _paragraph_end). If the text goes on,
+    a note with the cursor of the next chunk is appended. Cursors are offsets into
+    the cleaned text, which stays the same while the page is cached.
+    """
     try:
-        html_content = data["parse"]["text"]["*"]
-        # Clean the HTML to extract readable text
-        cleaned_content = clean_page_html(html_content)
-        return cleaned_content
-    except KeyError:
+        cursor = max(0, int(cursor or 0))
+    except (ValueError, TypeError):
+        return f"Invalid cursor: {cursor}. Must be an integer."
+    if not max_chars or max_chars <= 0:
+        return text[cursor:] if cursor else text
+    if cursor >= len(text):
+        return f"No more content (the text has {len(text)} characters)."
+
+    end = _paragraph_end(text, cursor, max_chars)
+    chunk = text[cursor:end]
+    # The next chunk starts at the following paragraph, not at the line break
+    while end < len(text) and text[end] in "\n ":
+        end += 1
+    if end >= len(text):
+        return chunk
+    return (f"{chunk}\n\n[Characters {cursor}-{end} of {len(text)}. "
+            f"The text continues, call again with cursor={end} for the next part.]")
+
+async def wiki_lookup(query, max_pages=2, max_chars=6000):
+    """Search, fetch, rank and assemble in one call: the context for answering `query`.
+
+    The top `max_pages` search results are fetched concurrently, their
+    sections ranked against the query (BM25) and the best sections of all
+    pages concatenated, most relevant first, until `max_chars` is reached.
+
+    Args:
+        query (str): Search query or question
+        max_pages (int): Number of search results to read
+        max_chars (int): Maximum length of the returned context
+
+    Returns:
+        str: Relevant sections, each headed by page title, page ID and section
+    """
+    results = (await search_wikipedia(query))[:max(1, max_pages)]
+    if not results:
+        return f"No Wikipedia results found for: {query}"
+
+    pages = await asyncio.gather(*(get_wiki_page(result["pageid"]) for result in results))
+    candidates = []
+    for position, page in enumerate(pages):
+        if page is None:
+            continue
+        for rank, section in enumerate(rank_page_sections(page, query, LOOKUP_SECTIONS_PER_PAGE)):
+            candidates.append((-section["score"], position, rank, page, section))
+    if not candidates:
         return "Content could not be retrieved."
 
+    blocks = []
+    remaining = max_chars
+    for _, _, _, page, section in sorted(candidates, key=lambda candidate: candidate[:3]):
+        header = f"[{len(blocks) + 1}] {page.title} (page {page.pageid}, section {section['index']}: {section['title']})\n"
+        if remaining - len(header) < LOOKUP_MIN_CHARS:
+            break
+        content = _truncate_at_paragraph(section["content"], remaining - len(header))
+        blocks.append(header + content)
+        remaining -= len(blocks[-1]) + 2
+    return "\n\n".join(blocks)
+
+async def _resolve_wiki_handle(handle):
+    """Content of a "wiki:<pageid>" or "wiki:<pageid>/<section>" handle, from the page model."""
+    pageid, _, section_index = handle[len("wiki:"):].partition("/")
+    try:
+        pageid = int(pageid)
+    except ValueError:
+        return None
+    if section_index:
+        return await _section_text(pageid, section_index)
+    page = await get_wiki_page(pageid)
+    return page.text if page is not None else None
+
+content_store.register_resolver("wiki", _resolve_wiki_handle)
+
+async def get_content_handle(pageid, section_index=None):
+    """Return a handle to a page (or one section) with title, length and a short preview instead of its content.
+
+    Args:
+        pageid (int): The Wikipedia page ID
+        section_index (str): Section index, None or "" for the whole page
+
+    Returns:
+        dict: handle, title, chars and preview, or error
+    """
+    try:
+        pageid = int(pageid)
+    except (ValueError, TypeError):
+        return {"error": f"Invalid page ID: {pageid}. Must be an integer."}
+    handle = f"wiki:{pageid}/{section_index}" if section_index not in (None, "") else f"wiki:{pageid}"
+    info = await content_store.describe(handle)
+    if info is None:
+        return {"error": f"Content could not be retrieved for {handle}."}
+    page = await get_wiki_page(pageid)
+    return {"handle": handle, "title": page.title if page is not None else "", **info}
+
+async def read_content(handle, max_chars=None, cursor=0):
+    """Dereference a content handle: its text, paginated like in get_wikipedia_content."""
+    text = await content_store.get(handle)
+    if text is None:
+        return f"Unknown content handle: {handle}"
+    result = paginate_text(text, max_chars, cursor)
+    content_store.stats["chars_read"] += len(result)
+    return result
+
+def get_content_store_stats():
+    """Return the handle counters of the content store and the length of the content it holds."""
+    return {**content_store.stats, "stored_chars": content_store.size}
+
 def clean_page_html(html):
-    soup = BeautifulSoup(html, "html.parser")
+    return "\n".join(text for _, _, text in content_blocks(html) if text)
 
-    # Remove scripts, styles, tables (infoboxes, navboxes), references
-    for tag in soup(["script", "style", "table", "sup", "span"]):
-        tag.decompose()
+async def _fetch_sections(pageid, section_indices, max_concurrency=SECTION_CONCURRENCY):
+    """Fetch sections with one API request each, at most `max_concurrency` in flight.
 
-    # Optional: remove elements by class or id (e.g., navigation, references)
-    for div in soup.find_all("div", {"class": ["reflist", "navbox", "infobox", "toc", "metadata"]}):
-        div.decompose()
+    A failing section does not affect the others.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch_section(section_index):
+        async with semaphore:
+            parsed = await _get_parsed_text(pageid, section_index)
+        if parsed is None:
+            return f"Content could not be retrieved for section {section_index}."
+        return parsed["text"]
 
-    # Keep only content from <p>, <h1-h6>, <li>
-    content_tags = soup.find_all(["p", "h1", "h2", "h3", "h4", "h5", "h6", "li"])
-    cleaned_text = "\n".join(tag.get_text(separator=" ", strip=True) for tag in content_tags if tag.get_text(strip=True))
+    contents = await asyncio.gather(*(fetch_section(section_index) for section_index in section_indices))
+    return dict(zip(section_indices, contents))
 
+async def get_multiple_sections_content(pageid, section_indices, max_concurrency=SECTION_CONCURRENCY):
+    """Fetch multiple sections of a Wikipedia page in one batch.
 
-    return cleaned_text
+    All sections are answered from the page model (one fetch and one HTML parse
+    per page). Sections missing from the model are requested individually and
+    concurrently (at most `max_concurrency` at a time).
 
-def get_multiple_sections_content(pageid, section_indices):
-    """Fetch multiple sections of a Wikipedia page in one batch to reduce API calls.
-    
     Args:
         pageid (int): The Wikipedia page ID
         section_indices (list[str]): List of section indices to retrieve as strings
-    
+        max_concurrency (int): Maximum number of section requests in flight
+
     Returns:
         dict: Dictionary mapping section indices to their cleaned content
     """
-    sections_content = {}
-    
     if not section_indices:
         return {"error": "No section indices provided"}
         
@@ -122,25 +553,17 @@ def get_multiple_sections_content(pageid, section_indices):
         pageid = int(pageid)
     except (ValueError, TypeError):
         return {"error": f"Invalid page ID: {pageid}. Must be an integer."}
-    
+
+    page = await get_wiki_page(pageid)
+
+    sections_content = {}
     for section_index in section_indices:
-        # We still need to make multiple API calls, but we're batching them
-        # in a single function call from the agent's perspective
-        params = {
-            "action": "parse",
-            "pageid": pageid,
-            "section": section_index,
-            "prop": "text",
-            "format": "json"
-        }
-        response = requests.get(WIKI_API_URL, params=params)
-        data = response.json()
-        
-        try:
-            html_content = data["parse"]["text"]["*"]
-            cleaned_content = clean_page_html(html_content)
-            sections_content[section_index] = cleaned_content
-        except KeyError:
-            sections_content[section_index] = f"Content could not be retrieved for section {section_index}."
-    
-    return sections_content
+        content = page.section_text(section_index) if page is not None else None
+        if content is not None:
+            sections_content[section_index] = content
+
+    missing = [section_index for section_index in section_indices if section_index not in sections_content]
+    if missing:
+        sections_content.update(await _fetch_sections(pageid, missing, max_concurrency))
+
+    return {section_index: sections_content[section_index] for section_index in section_indices}
@@ -4,21 +4,14 @@ This toolkit is intended to be used by agents parsing raw text from sources like
 """
 from dateutil import parser as date_parser
 from datetime import datetime
-from pint import UnitRegistry
 import statistics
 import sympy as sp
 import re
 from typing import List, Union
-ureg = UnitRegistry()
 
 # === UNIT CONVERSION ===
-def convert_units(value: float, from_unit: str, to_unit: str) -> str:
-    try:
-        quantity = value * ureg(from_unit)
-        converted = quantity.to(to_unit)
-        return f"{converted.magnitude:.4g} {converted.units}"
-    except Exception as e:
-        return f"Conversion error: {str(e)}"
+# Shares the lazily created unit registry and the cached conversion factors
+from mcp_server_setup.calculate import convert_units, convert_units_many
 
 # === TIME DELTA CALCULATIONS ===
 def calculate_years_between(start_date_str: str, end_date_str: str) -> Union[int, str]: